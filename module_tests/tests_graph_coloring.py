@@ -0,0 +1,270 @@
+"""Test cases for the Graph Coloring methods"""
+import csv
+import itertools
+import os
+import random
+import pytest
+from src.graph_coloring import GraphColoring
+from src.helpers.dsatur_helper import DsaturSearch, dsatur_coloring, greedy_clique, adjacency_masks
+from src.helpers.graph_decomposition_helper import Decomposition, solve_decomposed
+from src.helpers.vectorized_coloring_helper import bruteforce_coloring, counter_matrix, vectorized_coloring
+from src.helpers.chromatic_helper import chromatic_number_ie, chromatic_number_search, independent_set_counts
+from src.helpers.tabucol_helper import Tabucol, tabucol_coloring
+from src.helpers.dsatur_helper import greedy_dsatur, greedy_dsatur_lists
+from src.helpers.project_selection_enum import SubProblemSelection
+from src.helpers import dsatur_helper
+
+TEST_FILE = os.path.join(os.path.dirname(__file__), "test_data_graph_coloring.txt")
+
+
+@pytest.fixture(scope="module")
+def coloring():
+    return GraphColoring(TEST_FILE, result_file_name="test_results")
+
+
+def random_graph(n, p, seed):
+    rng = random.Random(seed)
+    return [(u, v) for u, v in itertools.combinations(range(n), 2) if rng.random() < p]
+
+
+def is_proper(n_vertices, edges, k, colors):
+    return (len(colors) == n_vertices and all(0 <= c < k for c in colors)
+            and all(colors[u] != colors[v] for u, v in edges))
+
+
+def colorable_reference(n_vertices, edges, k):
+    return any(all(colors[u] != colors[v] for u, v in edges)
+               for colors in itertools.product(range(k), repeat=n_vertices))
+
+
+def mycielski(edges, n):
+    """Mycielskian of a graph: same clique number, chromatic number one higher."""
+    new = list(edges)
+    for u, v in edges:
+        new += [(u, n + v), (v, n + u)]
+    new += [(n + u, 2 * n) for u in range(n)]
+    return new, 2 * n + 1
+
+
+def test_bestcase_on_file(coloring):
+    expected = {"1": True, "2": False, "3": True, "4": False}
+    for instance_id, k, n_vertices, edges in coloring.solution_instances:
+        ok, colors = coloring.coloring_bestcase(n_vertices, edges, k)
+        assert ok == expected[instance_id]
+        assert is_proper(n_vertices, edges, k, colors) if ok else colors == []
+
+
+def test_bestcase_matches_reference(coloring):
+    for seed in range(150):
+        rng = random.Random(seed)
+        n = rng.randint(0, 8)
+        edges = random_graph(n, rng.random(), seed)
+        for k in range(1, 5):
+            ok, colors = coloring.coloring_bestcase(n, edges, k)
+            assert ok == colorable_reference(n, edges, k)
+            if ok:
+                assert is_proper(n, edges, k, colors)
+
+
+def test_bestcase_proves_no_beyond_the_clique_bound(coloring):
+    # Groetzsch graph: triangle-free, chromatic number 4
+    edges, n = mycielski([(i, (i + 1) % 5) for i in range(5)], 5)
+    assert len(greedy_clique(adjacency_masks(n, edges))) == 2
+    assert coloring.coloring_bestcase(n, edges, 3) == (False, [])
+    ok, colors = coloring.coloring_bestcase(n, edges, 4)
+    assert ok and is_proper(n, edges, 4, colors)
+    # its Mycielskian again: 23 vertices, chromatic number 5, still triangle-free
+    edges, n = mycielski(edges, n)
+    search = DsaturSearch(n, edges, 4)
+    assert search.solve() is None and search.nodes > 0
+
+
+def test_bestcase_hundred_vertices(coloring):
+    edges = random_graph(120, 0.1, 7)
+    for k in (3, 4, 5, 6):
+        ok, colors = coloring.coloring_bestcase(120, edges, k)
+        if ok:
+            assert is_proper(120, edges, k, colors)
+    assert coloring.coloring_bestcase(120, edges, 6)[0]
+
+
+def test_decomposition_peels_and_splits():
+    # two disjoint K4s joined by a path, plus a pendant tree
+    k4 = list(itertools.combinations(range(4), 2))
+    edges = k4 + [(u + 4, v + 4) for u, v in k4] + [(3, 8), (8, 9), (9, 4), (0, 10), (10, 11)]
+    decomposition = Decomposition(12, edges, 3)
+    assert sorted(decomposition.peeled) == [8, 9, 10, 11]
+    assert decomposition.components == [[0, 1, 2, 3], [4, 5, 6, 7]]
+    n, local_edges = decomposition.subproblem([4, 5, 6, 7])
+    assert n == 4 and sorted(tuple(sorted(e)) for e in local_edges) == k4
+
+    def never_called(n_vertices, edges, k):
+        raise AssertionError("a graph that peels away needs no search")
+
+    tree = [(i, (i - 1) // 2) for i in range(1, 50)]
+    ok, colors = solve_decomposed(never_called, 50, tree, 2)
+    assert ok and is_proper(50, tree, 2, colors)
+    assert solve_decomposed(never_called, 3, [(0, 1), (1, 1)], 3) == (False, [])
+
+
+def test_decomposed_matches_whole_graph(coloring):
+    for seed in range(150):
+        rng = random.Random(seed)
+        n = rng.randint(0, 12)
+        edges = random_graph(n, rng.random() * 0.6, seed)
+        for k in range(1, 5):
+            ok, colors = coloring.solve_instance(dsatur_coloring, n, edges, k)
+            assert ok == dsatur_coloring(n, edges, k)[0]
+            if ok:
+                assert is_proper(n, edges, k, colors)
+
+
+def test_large_components_in_parallel(coloring):
+    block = random_graph(70, 0.15, 3)
+    edges = block + [(u + 70, v + 70) for u, v in block] + [(140, 0)]
+    ok, colors = solve_decomposed(dsatur_coloring, 141, edges, 5, processes=2)
+    assert ok and is_proper(141, edges, 5, colors)
+    assert solve_decomposed(dsatur_coloring, 141, edges, 3, processes=2) == (False, [])
+    assert coloring.coloring_bestcase(141, edges, 5)[0]
+
+
+def first_product_coloring(n_vertices, edges, k):
+    for colors in itertools.product(range(k), repeat=n_vertices):
+        if all(colors[u] != colors[v] for u, v in edges):
+            return list(colors)
+    return None
+
+
+def test_bruteforce_matches_product_order(coloring):
+    assert counter_matrix(3, 2).tolist() == [list(c) for c in itertools.product(range(3), repeat=2)]
+    for seed in range(150):
+        rng = random.Random(seed)
+        n = rng.randint(0, 9)
+        edges = random_graph(n, rng.random(), seed)
+        for k in range(1, 5):
+            expected = first_product_coloring(n, edges, k)
+            assert bruteforce_coloring(n, edges, k) == expected
+            assert vectorized_coloring(n, edges, k) == (expected is not None, expected or [])
+            ok, colors = coloring.coloring_bruteforce(n, edges, k)
+            assert ok == (expected is not None)
+            if ok:
+                assert is_proper(n, edges, k, colors)
+
+
+def test_bruteforce_multi_block():
+    # 3^14 colorings, several blocks, and the answer is not in the first one
+    edges, n = mycielski([(i, (i + 1) % 5) for i in range(5)], 5)
+    edges += [(11, 12), (12, 13), (11, 13)]
+    assert bruteforce_coloring(14, edges, 3) is None
+    assert is_proper(14, edges, 4, bruteforce_coloring(14, edges, 4))
+    edges = random_graph(11, 0.3, 5)
+    assert bruteforce_coloring(11, edges, 3) == first_product_coloring(11, edges, 3)
+
+
+def test_chromatic_number(coloring):
+    counts = independent_set_counts(3, adjacency_masks(3, [(0, 1)]))
+    assert counts.tolist() == [1, 2, 2, 3, 2, 4, 4, 6]
+    for seed in range(120):
+        rng = random.Random(seed)
+        n = rng.randint(0, 8)
+        edges = random_graph(n, rng.random(), seed)
+        chi = next(k for k in range(n + 1) if colorable_reference(n, edges, k))
+        assert chromatic_number_ie(n, edges) == chi
+        assert chromatic_number_search(n, edges)[0] == chi
+        found, colors = coloring.coloring_chromatic(n, edges)
+        assert found == chi and is_proper(n, edges, chi, colors)
+    for seed in range(10):
+        edges = random_graph(16, 0.4, seed)
+        assert chromatic_number_ie(16, edges) == chromatic_number_search(16, edges)[0]
+    # Mycielski graphs: chromatic number 4 by inclusion-exclusion, 5 by the search
+    edges, n = mycielski([(i, (i + 1) % 5) for i in range(5)], 5)
+    assert coloring.coloring_chromatic(n, edges)[0] == 4
+    edges, n = mycielski(edges, n)
+    chi, colors = coloring.coloring_chromatic(n, edges)
+    assert chi == 5 and is_proper(n, edges, 5, colors)
+
+
+def test_chromatic_search_reuses_bounds(monkeypatch):
+    # the clique and greedy coloring are found once, not again for every k
+    def recomputed(adj):
+        raise AssertionError("the search should be handed the bounds")
+
+    monkeypatch.setattr(dsatur_helper, "greedy_clique", recomputed)
+    monkeypatch.setattr(dsatur_helper, "greedy_dsatur", recomputed)
+    edges, n = mycielski(*mycielski([(i, (i + 1) % 5) for i in range(5)], 5))
+    chi, colors = chromatic_number_search(n, edges)
+    assert chi == 5 and is_proper(n, edges, 5, colors)
+
+
+def test_run_chromatic(tmp_path):
+    solver = GraphColoring(TEST_FILE, result_file_name="test_results", results_folder_path=str(tmp_path),
+                           chromatic=True)
+    solver.sub_problems = [SubProblemSelection.best_case]
+    solver.run()
+    with open(tmp_path / "chromatic_test_data_graph_coloring_test_results.csv", newline="") as f:
+        chromatic = list(csv.DictReader(f))
+    with open(tmp_path / "best_case_test_data_graph_coloring_test_results.csv", newline="") as f:
+        best_case = list(csv.DictReader(f))
+    assert [row["chromatic_number"] for row in chromatic] == ["3", "3", "2", "5"]
+    assert [row["chromatic_number"] for row in best_case] == ["3", "3", "2", "5"]
+    assert [row["colorable"] for row in chromatic] == [row["colorable"] for row in best_case] == \
+        ["YES", "NO", "YES", "NO"]
+
+
+def planted_graph(n, k, degree, seed):
+    rng = random.Random(seed)
+    part = [rng.randrange(k) for _ in range(n)]
+    edges = set()
+    while len(edges) < n * degree // 2:
+        u, v = rng.randrange(n), rng.randrange(n)
+        if part[u] != part[v]:
+            edges.add((min(u, v), max(u, v)))
+    return sorted(edges)
+
+
+def test_greedy_dsatur_is_proper():
+    for seed in range(30):
+        edges = random_graph(40, 0.2, seed)
+        colors = greedy_dsatur(adjacency_masks(40, edges))
+        assert is_proper(40, edges, max(colors) + 1, colors)
+    edges = planted_graph(5000, 3, 8, 1)
+    neighbours = [[] for _ in range(5000)]
+    for u, v in edges:
+        neighbours[u].append(v)
+        neighbours[v].append(u)
+    colors = greedy_dsatur_lists(neighbours)
+    assert is_proper(5000, edges, max(colors) + 1, colors)
+
+
+def test_tabucol_finds_planted_coloring(coloring):
+    edges = planted_graph(1000, 3, 10, 2)
+    search = Tabucol(1000, edges, 3)
+    colors = search.solve()
+    assert is_proper(1000, edges, 3, colors) and search.iterations > 0
+    ok, colors = coloring.coloring_simple(1000, edges, 3)
+    assert ok and is_proper(1000, edges, 3, colors)
+
+
+def test_tabucol_reports_unknown(tmp_path):
+    k5 = list(itertools.combinations(range(5), 2))
+    assert tabucol_coloring(5, k5, 4, max_iterations=200) == (None, [])
+    assert tabucol_coloring(2, [(0, 0)], 2) == (False, [])
+    # one or two colors are decided exactly, without spending the budget
+    assert tabucol_coloring(5, [(0, 1), (1, 2)], 1) == (False, [])
+    assert tabucol_coloring(3, [], 1) == (True, [0, 0, 0])
+    assert solve_decomposed(tabucol_coloring, 3, [(0, 1), (1, 2), (0, 2)], 2) == (False, [])
+    cycle = [(i, (i + 1) % 40) for i in range(40)]
+    ok, colors = tabucol_coloring(40, cycle, 2)
+    assert ok and is_proper(40, cycle, 2, colors)
+    assert tabucol_coloring(41, [(i, (i + 1) % 41) for i in range(41)], 2) == (False, [])
+    solver = GraphColoring(TEST_FILE, result_file_name="test_results", results_folder_path=str(tmp_path),
+                           tabu_iterations=200)
+    solver.sub_problems = [SubProblemSelection.simple]
+    solver.run()
+    with open(tmp_path / "simple_test_data_graph_coloring_test_results.csv", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["colorable"] for row in rows] == ["YES", "NO", "YES", "unknown"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
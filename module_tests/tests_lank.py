@@ -1,7 +1,41 @@
 """Test cases for Bin Packing Backtracking"""
 import pytest
+import ast
+import csv
+import itertools
+import math
 import os
+import random
+from collections import Counter
+from src.helpers.project_selection_enum import SubProblemSelection
 from src.bin_packing_LANK import BinPacking
+from src.helpers import large_bin_packing_LANK, subset_sum_reach_LANK
+from src.helpers.subset_sum_reach_LANK import SubsetSumReach, subset_sum_feasible
+from src.helpers.subset_count_LANK import count_subsets, iter_lex_subsets
+from src.helpers.parallel_backtracking_LANK import SubsetSearch, iter_parallel_subsets
+from src.helpers.min_bins_LANK import MinBinsSolver, best_fit_decreasing, first_fit_decreasing, lower_bound_l2
+from src.helpers.large_bin_packing_LANK import pack_large, parse_bin_packing_line
+
+TEST_FILE = os.path.join(os.path.dirname(__file__), "test_data_LANK.txt")
+
+
+def reference_subsets(bin_capacity, items):
+    """The original unpruned enumerator, as the reference answer."""
+    results = []
+    def backtrack(start, current_sum, current_bin):
+        if current_sum == bin_capacity:
+            results.append(sorted(current_bin))
+            return
+        for i in range(start, len(items)):
+            if current_sum + items[i] <= bin_capacity:
+                backtrack(i + 1, current_sum + items[i], current_bin + [items[i]])
+    backtrack(0, 0, [])
+    return results
+
+
+@pytest.fixture(scope="module")
+def packer():
+    return BinPacking(TEST_FILE, result_file_name="test_results")
 
 def test_all_data():
     """Test all data from consolidated file"""
@@ -17,6 +51,300 @@ def test_all_data():
             assert sum(sol) == instance[0]
 
 
+def test_backtracking_matches_reference(packer):
+    rng = random.Random(1)
+    instances = [(instance[0], instance[1:]) for instance in packer.solution_instances]
+    instances += [(rng.randint(0, 40), [rng.randint(1, 15) for _ in range(rng.randint(0, 14))])
+                  for _ in range(200)]
+    for bin_capacity, items in instances:
+        if len(items) > 20:
+            continue
+        result = packer.binpacking_backtracing(bin_capacity, items)
+        assert sorted(result) == sorted(reference_subsets(bin_capacity, items))
+
+
+def test_bruteforce_matches_backtracking(packer):
+    rng = random.Random(2)
+    instances = [(instance[0], instance[1:]) for instance in packer.solution_instances]
+    instances += [(rng.randint(0, 60), [rng.randint(1, 20) for _ in range(rng.randint(0, 16))])
+                  for _ in range(200)]
+    for bin_capacity, items in instances:
+        result = packer.binpacking_bruteforce(bin_capacity, items)
+        assert all(sol == sorted(sol) for sol in result)
+        assert sorted(result) == sorted(packer.binpacking_backtracing(bin_capacity, items))
+
+
+def test_bruteforce_forty_items(packer):
+    rng = random.Random(3)
+    items = [rng.randint(1, 10 ** 6) for _ in range(40)]
+    chosen = rng.sample(items, 12)
+    result = packer.binpacking_bruteforce(sum(chosen), items)
+    assert sorted(chosen) in result
+    assert all(sum(sol) == sum(chosen) for sol in result)
+
+
+def test_streams_are_lazy(packer):
+    # C(200, 100) solutions: only the first few are ever produced
+    items = [1] * 200
+    assert list(itertools.islice(packer.iter_backtracing(100, items), 3)) == [[1] * 100] * 3
+    assert len(list(itertools.islice(packer.iter_bruteforce(20, items[:40]), 5))) == 5
+
+
+def test_run_streams_rows(tmp_path):
+    streaming = BinPacking(TEST_FILE, result_file_name="test_results", results_folder_path=str(tmp_path),
+                           batch_size=3)
+    streaming.sub_problems = [SubProblemSelection.brute_force, SubProblemSelection.btracking]
+    streaming.run()
+    for sub_problem, method_name in ((SubProblemSelection.brute_force, "BruteForce"),
+                                     (SubProblemSelection.btracking, "BackTracking")):
+        with open(tmp_path / f"{sub_problem.name}_test_data_LANK_test_results.csv", newline="") as f:
+            rows = list(csv.DictReader(f))
+        for inst_id, instance in enumerate(streaming.solution_instances):
+            mine = [row for row in rows if row["instance_id"] == str(inst_id)]
+            expected = streaming.binpacking_backtracing(instance[0], instance[1:])
+            assert sorted(ast.literal_eval(row["bins_array"]) for row in mine) == sorted(expected)
+            assert all(row["method"] == method_name for row in mine)
+            assert len({row["time_taken"] for row in mine}) <= 1
+
+
+def optimal_bins(bin_capacity, items):
+    """Smallest k such that the items can be split into k bins, by exhaustive assignment."""
+    items = sorted(items, reverse=True)
+    for k in range(1, len(items) + 1):
+        def place(i, loads):
+            if i == len(items):
+                return True
+            return any(place(i + 1, loads[:b] + [loads[b] + items[i]] + loads[b + 1:])
+                       for b in range(k) if loads[b] + items[i] <= bin_capacity)
+        if place(0, [0] * k):
+            return k
+    return 0
+
+
+def test_bestcase_is_optimal(packer):
+    rng = random.Random(4)
+    for _ in range(300):
+        bin_capacity = rng.randint(10, 30)
+        items = [rng.randint(1, bin_capacity) for _ in range(rng.randint(0, 10))]
+        bins = packer.binpacking_bestcase(bin_capacity, items)
+        assert sorted(item for b in bins for item in b) == sorted(items)
+        assert all(sum(b) <= bin_capacity for b in bins)
+        assert len(bins) == optimal_bins(bin_capacity, items)
+        assert lower_bound_l2(bin_capacity, items) <= len(bins)
+    assert packer.binpacking_bestcase(10, [3, 11]) == []
+
+
+def test_bestcase_needs_search():
+    # first-fit decreasing needs 4 bins here, 3 are enough: (16) (8 4 4) (6 6 4)
+    items = [16, 8, 6, 6, 4, 4, 4]
+    assert len(first_fit_decreasing(16, items)) == 4
+    solver = MinBinsSolver(16, items)
+    assert len(solver.solve()) == 3 and solver.nodes > 0
+    rng = random.Random(5)
+    items = [rng.randint(20, 45) for _ in range(60)]
+    solver = MinBinsSolver(100, items)
+    bins = solver.solve()
+    assert sorted(item for b in bins for item in b) == sorted(items)
+    assert len(bins) == -(-sum(items) // 100) < len(first_fit_decreasing(100, items))
+
+
+def test_completions_many_distinct_sizes():
+    # 1500 distinct sizes: deeper than the recursion limit, one maximal completion
+    items = [5000] + list(range(1, 1500))
+    solver = MinBinsSolver(5000 + sum(range(1, 1500)), items)
+    solver.counts[0] -= 1
+    completions = solver._completions(0)
+    assert len(completions) == 1 and len(completions[0]) == 1500
+
+
+def test_reachability_table(packer):
+    rng = random.Random(6)
+    for _ in range(200):
+        bin_capacity = rng.randint(0, 50)
+        items = [rng.randint(1, 20) for _ in range(rng.randint(0, 12))]
+        table = SubsetSumReach(bin_capacity, items)
+        for start in range(len(items) + 1):
+            sums = {sum(c) for r in range(len(items) - start + 1)
+                    for c in itertools.combinations(items[start:], r)}
+            for remaining in range(bin_capacity + 1):
+                assert table.can_reach(start, remaining) == (remaining in sums)
+        assert packer.binpacking_feasible(bin_capacity, items) == bool(reference_subsets(bin_capacity, items))
+
+
+def test_large_capacity_skips_the_table(packer, monkeypatch):
+    # 40 items, capacity 4 * 10^8: no table, and the rolling check is only O(C) bits
+    items = [10 ** 7 * (i % 20 + 1) for i in range(40)]
+    assert not SubsetSumReach(4 * 10 ** 8, items).exact
+    assert subset_sum_feasible(4 * 10 ** 8 + 1, [2] * 3) is False
+    assert len(list(itertools.islice(packer.iter_bruteforce(4 * 10 ** 8, items), 5))) == 5
+    # every search still returns the same solutions when the table is not built
+    monkeypatch.setattr(subset_sum_reach_LANK, "REACH_MAX_BITS", 0)
+    rng = random.Random(13)
+    for _ in range(100):
+        bin_capacity = rng.randint(0, 40)
+        items = [rng.randint(1, 12) for _ in range(rng.randint(0, 12))]
+        expected = sorted(reference_subsets(bin_capacity, items))
+        assert not SubsetSumReach(bin_capacity, items).exact
+        assert sorted(packer.iter_backtracing(bin_capacity, items)) == expected
+        assert list(iter_lex_subsets(bin_capacity, items)) == expected
+        assert Counter(tuple(s) for s in packer.iter_multiset_backtracing(bin_capacity, items)) == \
+            Counter(tuple(s) for s in {tuple(s) for s in expected})
+        assert packer.binpacking_feasible(bin_capacity, items) == bool(expected)
+
+
+def test_large_capacity_memoizes_dead_states(monkeypatch):
+    # odd capacity, even items: no subset fits, and only the dead-state set
+    # keeps the search from walking all C(60, 12) bins of twelve items
+    search = SubsetSearch(120000001, [10 ** 7] * 60)
+    assert not search.table.exact
+    assert list(search.run()) == [] and search.dead
+    monkeypatch.setattr(subset_sum_reach_LANK, "REACH_MAX_BITS", 0)
+    rng = random.Random(14)
+    for _ in range(50):
+        bin_capacity = rng.randint(1, 40)
+        items = [rng.randint(1, 12) for _ in range(rng.randint(0, 16))]
+        expected = sorted(reference_subsets(bin_capacity, items))
+        assert sorted(SubsetSearch(bin_capacity, items).run()) == expected
+        search = SubsetSearch(bin_capacity, items)
+        found, pending = [], [(0, 0, ())]
+        while pending:
+            found += search.run(pending.pop(), budget=rng.randint(1, 5))
+            pending += search.leftover
+        assert sorted(found) == expected
+
+
+def test_multiset_enumeration(packer):
+    rng = random.Random(7)
+    instances = [(instance[0], instance[1:]) for instance in packer.solution_instances]
+    instances += [(rng.randint(0, 30), [rng.randint(1, 6) for _ in range(rng.randint(0, 14))])
+                  for _ in range(200)]
+    for bin_capacity, items in instances:
+        if len(items) > 20:
+            continue
+        expected = Counter(tuple(sol) for sol in reference_subsets(bin_capacity, items))
+        counted = list(packer.iter_multiset_backtracing(bin_capacity, items, with_counts=True))
+        assert {tuple(sol): n for sol, n in counted} == expected
+        assert len(counted) == len(expected)
+        assert list(packer.iter_multiset_backtracing(bin_capacity, items)) == [sol for sol, _ in counted]
+
+
+def test_multiset_enumeration_zero_sizes(packer, monkeypatch):
+    rng = random.Random(17)
+    for case in range(200):
+        if case == 100:
+            # same answers when only the suffix sums guard the search
+            monkeypatch.setattr(subset_sum_reach_LANK, "REACH_MAX_BITS", 0)
+        bin_capacity = rng.randint(0, 20)
+        items = [rng.randint(0, 6) for _ in range(rng.randint(0, 12))]
+        expected = sorted(packer.iter_backtracing(bin_capacity, items))
+        counted = list(packer.iter_multiset_backtracing(bin_capacity, items, with_counts=True))
+        assert Counter(tuple(sol) for sol in expected) == {tuple(sol): n for sol, n in counted}
+
+
+def test_budgeted_search_hands_back_the_rest():
+    rng = random.Random(8)
+    for _ in range(50):
+        items = [rng.randint(1, 12) for _ in range(rng.randint(0, 16))]
+        search = SubsetSearch(rng.randint(1, 40), items)
+        expected = sorted(search.run())
+        found, pending = [], [(0, 0, ())]
+        while pending:
+            found += search.run(pending.pop(), budget=rng.randint(1, 5))
+            pending += search.leftover
+        assert sorted(found) == expected
+
+
+def test_parallel_matches_sequential(packer):
+    rng = random.Random(9)
+    items = [rng.randint(1, 30) for _ in range(28)]
+    expected = sorted(packer.binpacking_backtracing(90, items))
+    assert len(expected) > 1000
+    assert sorted(iter_parallel_subsets(90, items, processes=2, budget=500)) == expected
+    assert sorted(iter_parallel_subsets(5, [7, 9], processes=2)) == []
+
+
+def test_count_and_top_k(packer):
+    rng = random.Random(10)
+    instances = [(instance[0], instance[1:]) for instance in packer.solution_instances]
+    instances += [(rng.randint(0, 40), [rng.randint(1, 12) for _ in range(rng.randint(0, 14))])
+                  for _ in range(200)]
+    for bin_capacity, items in instances:
+        if len(items) > 20:
+            continue
+        expected = sorted(reference_subsets(bin_capacity, items))
+        assert packer.binpacking_count(bin_capacity, items) == len(expected)
+        assert list(iter_lex_subsets(bin_capacity, items)) == expected
+    assert count_subsets(100, [1] * 200) == math.comb(200, 100)
+
+
+def test_run_count_and_top_k(tmp_path):
+    for options, method_name in (({"count_only": True}, "Count"), ({"top_k": 2}, "Top2")):
+        counting = BinPacking(TEST_FILE, result_file_name="test_results", results_folder_path=str(tmp_path),
+                              **options)
+        counting.sub_problems = [SubProblemSelection.btracking]
+        counting.run()
+        with open(tmp_path / "btracking_test_data_LANK_test_results.csv", newline="") as f:
+            rows = list(csv.DictReader(f))
+        for inst_id, instance in enumerate(counting.solution_instances):
+            mine = [row for row in rows if row["instance_id"] == str(inst_id)]
+            expected = sorted(counting.binpacking_backtracing(instance[0], instance[1:]))
+            assert all(row["method"] == method_name for row in mine)
+            if method_name == "Count":
+                assert [int(row["bins_array"]) for row in mine] == [len(expected)]
+            else:
+                assert [ast.literal_eval(row["bins_array"]) for row in mine] == expected[:2]
+
+
+def test_large_heuristics_match_per_item_packing(packer):
+    rng = random.Random(11)
+    instances = []
+    for _ in range(150):
+        bin_capacity = rng.randint(1, 200)
+        pool = [rng.randint(0, bin_capacity) for _ in range(rng.randint(1, 10))]
+        # few distinct sizes, so long runs of copies are placed in bulk
+        instances.append((bin_capacity, [rng.choice(pool) for _ in range(rng.randint(0, 1500))]))
+    for bin_capacity, items in instances:
+        for method, reference in (("ffd", first_fit_decreasing), ("bfd", best_fit_decreasing)):
+            report = packer.binpacking_large(bin_capacity, items, method)
+            assert report.bins_used == len(reference(bin_capacity, items))
+            assert report.lower_bound == -(-sum(items) // bin_capacity)
+    with pytest.raises(ValueError):
+        pack_large(5, [3, 6])
+
+
+def test_large_ffd_batches_distinct_sizes(monkeypatch):
+    # mostly distinct sizes go through the batched descents; small batches
+    # and thresholds make every batch step happen many times
+    monkeypatch.setattr(large_bin_packing_LANK, "BATCH_RUNS", 7)
+    monkeypatch.setattr(large_bin_packing_LANK, "GAP_MIN_BINS", 1)
+    monkeypatch.setattr(large_bin_packing_LANK, "RUN_MIN_COPIES", 20)
+    rng = random.Random(15)
+    for _ in range(150):
+        bin_capacity = rng.randint(1, 300)
+        low = rng.randint(0, bin_capacity)
+        items = [rng.randint(low, bin_capacity) for _ in range(rng.randint(0, 600))]
+        if rng.random() < 0.3:
+            items += [rng.randint(1, bin_capacity)] * rng.randint(1, 60)
+        assert pack_large(bin_capacity, items, "ffd").bins_used == len(first_fit_decreasing(bin_capacity, items))
+
+
+def test_run_large(tmp_path):
+    import numpy as np
+    rng = np.random.default_rng(12)
+    items = rng.integers(1, 1000, 200000)
+    large_file = tmp_path / "large.txt"
+    large_file.write_text("1000 " + " ".join(map(str, items.tolist())) + "\n10 2 5 4 7 1 3 8 6\n")
+    bin_capacity, parsed = parse_bin_packing_line(large_file.read_text().splitlines()[0])
+    assert bin_capacity == 1000 and (parsed == items).all()
+    packing = BinPacking(TEST_FILE, result_file_name="test_results", results_folder_path=str(tmp_path))
+    packing.run_large(str(large_file), "bfd")
+    with open(tmp_path / "Large_large_test_results.csv", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["n_items"] for row in rows] == ["200000", "8"]
+    assert rows[1]["bins_used"] == str(len(best_fit_decreasing(10, [2, 5, 4, 7, 1, 3, 8, 6])))
+    assert all(int(row["bins_used"]) >= int(row["lower_bound"]) for row in rows)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "-s"])
 
@@ -0,0 +1,396 @@
+"""Test cases for the SAT solver methods"""
+import ast
+import csv
+import itertools
+import os
+import random
+import pytest
+from src.sat import SatSolver
+from src.helpers.project_selection_enum import SubProblemSelection
+from src.helpers.cnf_preprocess_helper import preprocess_cnf
+from src.helpers.result_cache_helper import SatResultCache, cnf_key
+from src.helpers.incremental_sat_helper import IncrementalSatSolver, SharedPrefixSession, group_shared_prefix
+from src.helpers.bitparallel_sat_helper import bitparallel_search
+from src.helpers.clause_store import ClauseStore
+from src.helpers.cdcl_helper import CDCLSolver
+from src.helpers.dmaics_parser import parse_multi_instance_dimacs
+from src.helpers.local_search_helper import LocalSearchSolver
+from src.helpers.model_count_helper import ModelCounter
+from src.helpers.symmetry_helper import break_symmetries
+
+INPUT_FILE = os.path.join(os.path.dirname(__file__), "..", "input", "cnffile.cnf")
+
+
+def random_cnf(n_vars, n_clauses, width, seed):
+    rng = random.Random(seed)
+    clauses = []
+    for _ in range(n_clauses):
+        chosen = rng.sample(range(1, n_vars + 1), min(width, n_vars))
+        clauses.append([v if rng.random() < 0.5 else -v for v in chosen])
+    return clauses
+
+
+def exhaustive(n_vars, clauses):
+    for bits in itertools.product([False, True], repeat=n_vars):
+        if all(any(bits[abs(l) - 1] == (l > 0) for l in c) for c in clauses):
+            return True
+    return False
+
+
+def satisfies(assignment, clauses):
+    return all(any(assignment[abs(l)] == (l > 0) for l in c) for c in clauses)
+
+
+@pytest.fixture(scope="module")
+def solver():
+    return SatSolver(INPUT_FILE, result_file_name="test_results")
+
+
+def test_bestcase_matches_exhaustive(solver):
+    for seed in range(60):
+        n_vars = 4 + seed % 9
+        clauses = random_cnf(n_vars, 4 * n_vars + seed % 5, 3, seed)
+        ok, assignment = solver.sat_bestcase(n_vars, clauses)
+        assert ok == exhaustive(n_vars, clauses)
+        if ok:
+            assert set(assignment) == set(range(1, n_vars + 1))
+            assert satisfies(assignment, clauses)
+        else:
+            assert assignment == {}
+
+
+def test_bruteforce_matches_exhaustive(solver):
+    for seed in range(60):
+        n_vars = 3 + seed % 10
+        clauses = random_cnf(n_vars, 4 * n_vars + seed % 5, 3, seed)
+        ok, assignment = solver.sat_bruteforce(n_vars, clauses)
+        assert ok == exhaustive(n_vars, clauses)
+        if ok:
+            assert satisfies(assignment, clauses)
+        # force several high blocks with a tiny block size
+        assert bitparallel_search(n_vars, clauses, block_bits=2)[0] == ok
+
+
+def test_backtracking_matches_exhaustive(solver):
+    for seed in range(60):
+        n_vars = 3 + seed % 10
+        clauses = random_cnf(n_vars, 4 * n_vars + seed % 5, 2 + seed % 3, seed)
+        ok, assignment = solver.sat_backtracking(n_vars, clauses)
+        assert ok == exhaustive(n_vars, clauses)
+        if ok:
+            assert satisfies(assignment, clauses)
+        else:
+            assert assignment == {}
+
+
+def test_backtracking_deep_instance(solver):
+    # a long implication chain would overflow a recursive solver
+    n_vars = 3000
+    clauses = [[-v, v + 1] for v in range(1, n_vars)] + [[1]]
+    ok, assignment = solver.sat_backtracking(n_vars, clauses)
+    assert ok and all(assignment.values())
+
+
+def test_bestcase_pigeonhole_unsat(solver):
+    # 6 pigeons, 5 holes: var p*5 + h + 1 means pigeon p sits in hole h
+    pigeons, holes = 6, 5
+    var = lambda p, h: p * holes + h + 1
+    clauses = [[var(p, h) for h in range(holes)] for p in range(pigeons)]
+    for h in range(holes):
+        for p, q in itertools.combinations(range(pigeons), 2):
+            clauses.append([-var(p, h), -var(q, h)])
+    assert solver.sat_bestcase(pigeons * holes, clauses) == (False, {})
+
+
+def test_bestcase_input_file(solver):
+    for inst_id, n_vars, clauses in solver.solution_instances:
+        ok, assignment = solver.sat_bestcase(n_vars, clauses)
+        assert ok == exhaustive(n_vars, clauses)
+        if ok:
+            assert satisfies(assignment, clauses)
+
+
+def test_local_search_never_claims_unsat():
+    for algorithm in ("walksat", "probsat"):
+        for seed in range(40):
+            n_vars = 4 + seed % 9
+            clauses = random_cnf(n_vars, 4 * n_vars + seed % 5, 3, seed)
+            local = LocalSearchSolver(n_vars, clauses, algorithm=algorithm, max_flips=2000, seed=seed)
+            ok = local.solve()
+            if exhaustive(n_vars, clauses):
+                assert ok is True and satisfies(local.model(), clauses)
+            else:
+                assert ok is None
+            # incremental break/make counts agree with a recount
+            for var in range(1, local.n_vars + 1):
+                flipped = dict(local.model())
+                flipped[var] = not flipped[var]
+                before = [satisfies(local.model(), [c]) for c in local.clauses]
+                after = [satisfies(flipped, [c]) for c in local.clauses]
+                assert local.break_count[var] == sum(b and not a for b, a in zip(before, after))
+                assert local.make_count[var] == sum(a and not b for b, a in zip(before, after))
+
+
+def test_simple_budget_reports_unknown(solver):
+    clauses = [[1, 2], [-1, 2], [1, -2], [-1, -2]]
+    assert solver.sat_simple(2, clauses) == (None, {})
+    assert solver.sat_simple(2, clauses + [[]]) == (False, {})
+    ok, assignment = solver.sat_simple(3, [[1, -2], [2, 3], [-1, -3]])
+    assert ok and satisfies(assignment, [[1, -2], [2, 3], [-1, -3]])
+
+
+def test_compact_parse_matches_lists():
+    plain = parse_multi_instance_dimacs(INPUT_FILE)
+    compact = parse_multi_instance_dimacs(INPUT_FILE, compact=True)
+    assert len(plain) == len(compact)
+    for (id_a, n_a, clauses_a), (id_b, n_b, store) in zip(plain, compact):
+        assert (id_a, n_a) == (id_b, n_b)
+        assert store.to_lists() == clauses_a
+        assert len(store) == len(clauses_a)
+        for lit in range(-store.n_vars, store.n_vars + 1):
+            expected = [ci for ci, c in enumerate(clauses_a) for l in c if l == lit]
+            assert store.occurrences(lit).tolist() == expected
+
+
+def test_methods_accept_clause_store(solver):
+    for seed in range(20):
+        n_vars = 4 + seed % 8
+        clauses = random_cnf(n_vars, 4 * n_vars, 3, seed)
+        store = ClauseStore.from_lists(n_vars, clauses)
+        assert store.simple
+        expected = exhaustive(n_vars, clauses)
+        for method in (solver.sat_bruteforce, solver.sat_backtracking, solver.sat_bestcase):
+            ok, assignment = method(n_vars, store)
+            assert ok == expected
+            if ok:
+                assert satisfies(assignment, clauses)
+
+
+def test_preprocess_reconstructs_models():
+    rng = random.Random(7)
+    for seed in range(300):
+        n_vars = rng.randint(1, 9)
+        clauses = [[rng.choice([-1, 1]) * rng.randint(1, n_vars) for _ in range(rng.randint(1, 4))]
+                   for _ in range(rng.randint(0, 4 * n_vars))]
+        prep = preprocess_cnf(n_vars, clauses)
+        expected = exhaustive(n_vars, clauses)
+        if prep.unsat:
+            assert not expected
+            continue
+        cdcl = CDCLSolver(n_vars, prep.clauses)
+        assert cdcl.solve() == expected
+        if expected:
+            model = prep.extend_model(cdcl.model())
+            assert set(model) == set(range(1, n_vars + 1))
+            assert satisfies(model, clauses)
+
+
+def test_preprocess_input_file_redundancy():
+    for inst_id, n_vars, clauses in parse_multi_instance_dimacs(INPUT_FILE):
+        prep = preprocess_cnf(n_vars, clauses)
+        assert prep.stats["tautologies"] + prep.stats["duplicate_literals"] + prep.stats["duplicate_clauses"] > 0
+        assert prep.stats["clauses_after"] <= len(clauses)
+
+
+def test_run_writes_original_models(solver, tmp_path):
+    solver.results_folder_path = str(tmp_path)
+    solver.sub_problems = [SubProblemSelection.brute_force, SubProblemSelection.btracking,
+                           SubProblemSelection.best_case]
+    solver.run()
+    clauses_by_id = {inst_id: (n_vars, clauses) for inst_id, n_vars, clauses in solver.solution_instances}
+    for sub_problem in solver.sub_problems:
+        path = tmp_path / f"{sub_problem.name}_cnffile_test_results.csv"
+        with open(path, newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == len(clauses_by_id)
+        for row in rows:
+            n_vars, clauses = clauses_by_id[row["instance_id"]]
+            assert row["satisfiable"] == ("S" if exhaustive(n_vars, clauses) else "U")
+            assignment = ast.literal_eval(row["solution"])
+            if row["satisfiable"] == "S":
+                assert set(assignment) == set(range(1, n_vars + 1))
+                assert satisfies(assignment, clauses)
+
+
+def test_incremental_assumptions_and_core():
+    rng = random.Random(3)
+    for seed in range(40):
+        n_vars = 6 + seed % 5
+        base = random_cnf(n_vars, 2 * n_vars, 3, seed)
+        session = IncrementalSatSolver(n_vars, base)
+        for _ in range(6):
+            assumptions = [v if rng.random() < 0.5 else -v for v in rng.sample(range(1, n_vars + 1), 4)]
+            ok, assignment = session.solve(assumptions)
+            assert ok == exhaustive(n_vars, base + [[a] for a in assumptions])
+            if ok:
+                assert satisfies(assignment, base + [[a] for a in assumptions])
+            else:
+                core = session.core()
+                assert set(core) <= set(assumptions)
+                assert not exhaustive(n_vars, base + [[a] for a in core])
+            extra = random_cnf(n_vars, 1, 3, rng.random())
+            session.add_clause(extra[0])
+            base = base + extra
+
+
+def test_shared_prefix_sessions():
+    rng = random.Random(11)
+    for seed in range(20):
+        n_vars = 8
+        prefix = random_cnf(n_vars, 20, 3, seed)
+        instances = []
+        for i in range(4):
+            extra = random_cnf(n_vars, 3, rng.choice([1, 2, 3]), seed * 10 + i)
+            instances.append((str(i), n_vars, prefix + extra))
+        groups = group_shared_prefix(instances)
+        assert groups == [([0, 1, 2, 3], 20)]
+        session = SharedPrefixSession(prefix, n_vars)
+        for _, _, clauses in instances:
+            ok, assignment = session.solve(n_vars, clauses)
+            assert ok == exhaustive(n_vars, clauses)
+            if ok:
+                assert satisfies(assignment, clauses)
+
+
+def test_portfolio_race(solver):
+    solver.sub_problems = [SubProblemSelection.btracking, SubProblemSelection.best_case]
+    for seed in range(3):
+        n_vars = 12
+        clauses = random_cnf(n_vars, 50, 3, seed)
+        ok, assignment, winner, _ = solver.race_instance(n_vars, clauses, None)
+        assert ok == exhaustive(n_vars, clauses)
+        assert winner in [label for label, _, _ in solver.portfolio_entries()]
+        if ok:
+            assert satisfies(assignment, clauses)
+
+
+def test_cache_key_is_canonical():
+    assert cnf_key(3, [[1, 2], [-3, 1, 1], [2, 1]]) == cnf_key(3, [[1, -3], [1, 2]])
+    assert cnf_key(3, [[1, 2]]) != cnf_key(4, [[1, 2]])
+    assert cnf_key(3, [[1, 2]]) != cnf_key(3, [[1, -2]])
+
+
+def test_cache_lru_eviction(tmp_path):
+    cache = SatResultCache(str(tmp_path / "cache.sqlite"), max_entries=2)
+    cache.put("a", 2, True, {1: True, 2: False})
+    cache.put("b", 2, False, {})
+    assert cache.get("a") == (True, {1: True, 2: False})
+    cache.put("c", 1, True, {1: True})
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") == (True, {1: True})
+    assert len(cache) == 2
+
+
+def test_run_uses_cache(tmp_path):
+    cached_solver = SatSolver(INPUT_FILE, result_file_name="test_results", results_folder_path=str(tmp_path),
+                              cache_path=str(tmp_path / "cache.sqlite"))
+    cached_solver.sub_problems = [SubProblemSelection.best_case]
+    for expected in ("False", "True"):
+        cached_solver.run()
+        with open(tmp_path / "best_case_cnffile_test_results.csv", newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert rows and all(row["cached"] == expected for row in rows)
+
+
+def count_exhaustive(n_vars, clauses):
+    return sum(all(any(bits[abs(l) - 1] == (l > 0) for l in c) for c in clauses)
+               for bits in itertools.product([False, True], repeat=n_vars))
+
+
+def test_model_count_matches_exhaustive(solver):
+    rng = random.Random(5)
+    for seed in range(200):
+        n_vars = rng.randint(1, 10)
+        clauses = [[rng.choice([-1, 1]) * rng.randint(1, n_vars) for _ in range(rng.randint(1, 3))]
+                   for _ in range(rng.randint(0, 3 * n_vars))]
+        expected = count_exhaustive(n_vars, clauses)
+        assert solver.sat_model_count(n_vars, clauses) == expected
+        # a tiny cache forces evictions without changing the count
+        assert ModelCounter(max_cache_literals=4).count(n_vars, clauses) == expected
+
+
+def test_model_count_components_and_depth(solver):
+    # 40 independent copies of (a or b) plus 20 free variables
+    clauses = [[2 * i + 1, 2 * i + 2] for i in range(40)]
+    counter = ModelCounter()
+    assert counter.count(100, clauses) == 3 ** 40 * 2 ** 20
+    # the component counts are kept for the next call
+    assert counter.count(100, clauses) == 3 ** 40 * 2 ** 20 and counter.cache_hits == 40
+    # a long implication chain would overflow a recursive counter
+    assert solver.sat_model_count(1500, [[-v, v + 1] for v in range(1, 1500)]) == 1501
+
+
+def test_run_writes_model_count(tmp_path):
+    counting_solver = SatSolver(INPUT_FILE, result_file_name="test_results", results_folder_path=str(tmp_path),
+                                count_models=True)
+    counting_solver.sub_problems = [SubProblemSelection.best_case]
+    counting_solver.run()
+    clauses_by_id = {inst_id: (n_vars, clauses) for inst_id, n_vars, clauses in counting_solver.solution_instances}
+    with open(tmp_path / "best_case_cnffile_test_results.csv", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == len(clauses_by_id)
+    for row in rows:
+        n_vars, clauses = clauses_by_id[row["instance_id"]]
+        assert int(row["model_count"]) == count_exhaustive(n_vars, clauses)
+        assert (row["satisfiable"] == "S") == (int(row["model_count"]) > 0)
+
+
+def canonical(clauses):
+    return sorted({tuple(sorted(set(c))) for c in clauses})
+
+
+def test_symmetry_breaking_preserves_satisfiability():
+    rng = random.Random(13)
+    for seed in range(150):
+        n_vars = rng.randint(2, 8)
+        base = random_cnf(n_vars, rng.randint(1, 2 * n_vars), rng.randint(1, 3), seed)
+        # close base under a random signed variable permutation
+        images = rng.sample(range(1, n_vars + 1), n_vars)
+        signs = [rng.choice([-1, 1]) for _ in range(n_vars)]
+        move = lambda l: images[abs(l) - 1] * signs[abs(l) - 1] * (1 if l > 0 else -1)
+        clauses, current = list(base), base
+        for _ in range(n_vars):
+            current = [[move(l) for l in c] for c in current]
+            clauses += current
+        symmetry = break_symmetries(n_vars, clauses)
+        for mapping in symmetry.generators:
+            image = lambda l: mapping.get(abs(l), abs(l)) * (1 if l > 0 else -1)
+            assert canonical([[image(l) for l in c] for c in clauses]) == canonical(clauses)
+        cdcl = CDCLSolver(n_vars, clauses + symmetry.clauses)
+        assert cdcl.solve() == exhaustive(n_vars, clauses)
+
+
+def test_symmetry_breaking_pigeonhole(solver):
+    pigeons, holes = 7, 6
+    var = lambda p, h: p * holes + h + 1
+    clauses = [[var(p, h) for h in range(holes)] for p in range(pigeons)]
+    for h in range(holes):
+        for p, q in itertools.combinations(range(pigeons), 2):
+            clauses.append([-var(p, h), -var(q, h)])
+    symmetry = break_symmetries(pigeons * holes, clauses)
+    # pigeon swaps and hole swaps
+    assert len(symmetry.generators) == (pigeons - 1) + (holes - 1)
+    assert solver.sat_bestcase(pigeons * holes, clauses + symmetry.clauses) == (False, {})
+
+
+def test_run_with_symmetry_breaking(tmp_path):
+    breaking_solver = SatSolver(INPUT_FILE, result_file_name="test_results", results_folder_path=str(tmp_path),
+                                symmetry_breaking=True)
+    breaking_solver.sub_problems = [SubProblemSelection.btracking, SubProblemSelection.best_case]
+    breaking_solver.incremental = False
+    breaking_solver.run()
+    clauses_by_id = {inst_id: (n_vars, clauses) for inst_id, n_vars, clauses in breaking_solver.solution_instances}
+    for sub_problem in breaking_solver.sub_problems:
+        with open(tmp_path / f"{sub_problem.name}_cnffile_test_results.csv", newline="") as f:
+            rows = list(csv.DictReader(f))
+        for row in rows:
+            n_vars, clauses = clauses_by_id[row["instance_id"]]
+            assert row["satisfiable"] == ("S" if exhaustive(n_vars, clauses) else "U")
+            if row["satisfiable"] == "S":
+                assignment = ast.literal_eval(row["solution"])
+                assert set(assignment) == set(range(1, n_vars + 1))
+                assert satisfies(assignment, clauses)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -27,9 +27,11 @@ instance_id,bin_capacity,bins_array,method,time_taken
 
 """
 
-from typing import List
+from typing import Iterator, List
 
 from src.helpers.bin_packing_helper_LANK import BinPackingAbstractClass
+from src.helpers.meet_in_middle_LANK import iter_meet_in_the_middle_subsets
+from src.helpers.min_bins_LANK import min_bins_packing
 
 
 class BinPacking(BinPackingAbstractClass):
@@ -51,7 +53,16 @@ class BinPacking(BinPackingAbstractClass):
     def binpacking_bruteforce(
         self, bin_capacity: int, clauses: List[int]
     ) -> List[List[int]]:
-        pass
+        """
+        Every subset summing to bin_capacity, by meet-in-the-middle over the
+        subset sums of two halves (see src/helpers/meet_in_middle_LANK.py).
+        """
+        return list(self.iter_bruteforce(bin_capacity, clauses))
+
+    def iter_bruteforce(
+        self, bin_capacity: int, clauses: List[int]
+    ) -> Iterator[List[int]]:
+        return iter_meet_in_the_middle_subsets(bin_capacity, clauses)
 
     def binpacking_simple(
         self, bin_capacity: int, clauses: List[int]
@@ -61,4 +72,8 @@ class BinPacking(BinPackingAbstractClass):
     def binpacking_bestcase(
         self, bin_capacity: int, clauses: List[int]
     ) -> List[List[int]]:
-        pass
+        """
+        Packs all items into the fewest bins of bin_capacity and returns the
+        per-bin item lists (see src/helpers/min_bins_LANK.py).
+        """
+        return min_bins_packing(bin_capacity, clauses)
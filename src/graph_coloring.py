@@ -42,6 +42,11 @@ instance_id,n_vertices,n_edges,k,method,colorable,time_seconds,coloring
 """
 
 from src.helpers.graph_coloring_helper import GraphColoringAbstractClass
+from src.helpers.dsatur_helper import dsatur_coloring
+from src.helpers.vectorized_coloring_helper import vectorized_coloring
+from src.helpers.chromatic_helper import chromatic_number
+from src.helpers.tabucol_helper import tabucol_coloring
+import functools
 import itertools
 from typing import List, Optional, Dict, Tuple
 
@@ -60,10 +65,35 @@ class GraphColoring(GraphColoringAbstractClass):
         pass
 
     def coloring_bruteforce(self, n_vertices: int, edges: List[Tuple[int]], k:int) -> Tuple[bool, Optional[Dict[int, bool]]]:
-        pass
+        """
+        Tries the k^n assignments in itertools.product order, a block of them
+        per vectorized check (see src/helpers/vectorized_coloring_helper.py).
+        """
+        return self.solve_instance(vectorized_coloring, n_vertices, edges, k)
 
     def coloring_simple(self, n_vertices: int, edges: List[Tuple[int]], k:int) -> Tuple[bool, Optional[Dict[int, bool]]]:
-        pass
+        """
+        Tabucol local search from a greedy DSATUR start, for graphs too large
+        for the exact methods (see src/helpers/tabucol_helper.py); k <= 2 is
+        decided exactly. Returns None instead of False when
+        self.tabu_iterations moves find no proper coloring, which run()
+        reports as "unknown".
+        """
+        method = functools.partial(tabucol_coloring, max_iterations=self.tabu_iterations)
+        return self.solve_instance(method, n_vertices, edges, k)
 
     def coloring_bestcase(self, n_vertices: int, edges: List[Tuple[int]], k:int) -> Tuple[bool, Optional[Dict[int, bool]]]:
-        pass
+        """
+        Exact k-colorability by DSATUR branch and bound with a greedy clique
+        lower bound (see src/helpers/dsatur_helper.py). Returns the coloring
+        as a list of colors in vertex order, or [] when there is none.
+        """
+        return self.solve_instance(dsatur_coloring, n_vertices, edges, k)
+
+    def coloring_chromatic(self, n_vertices: int, edges: List[Tuple[int]]) -> Tuple[Optional[int], List[int]]:
+        """
+        Exact chromatic number and a coloring that uses that many colors:
+        inclusion-exclusion over independent sets for small graphs, an
+        increasing-k DSATUR search otherwise (see src/helpers/chromatic_helper.py).
+        """
+        return chromatic_number(n_vertices, edges)
@@ -1,10 +1,18 @@
 from abc import ABC, abstractmethod
 import os
 from src.helpers.dmaics_parser import parse_multi_instance_bin_packing
+from src.helpers.subset_sum_reach_LANK import SubsetSumReach, subset_sum_feasible
+from src.helpers.subset_count_LANK import count_subsets, iter_lex_subsets
+from src.helpers.parallel_backtracking_LANK import SubsetSearch, iter_parallel_subsets
+from src.helpers.large_bin_packing_LANK import LargePackingReport, pack_large, parse_bin_packing_line
 from src.helpers.constants import RESULTS_FOLDER, CONFIGURATION_FILE_PATH
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Iterable, Iterator, Optional
+import bisect
 import json
+import math
 import csv
+import itertools
+import tempfile
 import time
 from src.helpers.project_selection_enum import ProjectSelection, SubProblemSelection
 
@@ -14,8 +22,23 @@ class BinPackingAbstractClass(ABC):
     def __init__(self, 
                     cnf_file_input_path: str,
                     result_file_name:str = "sat_solver_results",
-                    results_folder_path: str = RESULTS_FOLDER):
+                    results_folder_path: str = RESULTS_FOLDER,
+                    batch_size: int = 10000,
+                    multiset: bool = False,
+                    processes: Optional[int] = None,
+                    count_only: bool = False,
+                    top_k: Optional[int] = None):
         self.cnf_file_input_path = cnf_file_input_path
+        # solutions pulled from a method / rows written to the CSV at a time
+        self.batch_size = batch_size
+        # BackTracking rows list each distinct multiset of sizes once
+        self.multiset = multiset
+        # BackTracking runs on this many worker processes when set (and not multiset)
+        self.processes = processes
+        # BackTracking modes that skip full enumeration: one row per instance
+        # with the number of solutions in bins_array, or only the first top_k
+        self.count_only = count_only
+        self.top_k = top_k
         self.results_folder_path = results_folder_path
         self.result_file_name = result_file_name
         self.config_path = CONFIGURATION_FILE_PATH
@@ -46,39 +69,148 @@ class BinPackingAbstractClass(ABC):
     def parse_input_file(self):
         return parse_multi_instance_bin_packing(self.cnf_file_input_path)
     
-    def save_results(self, run_results: List[Any], sub_problem):
-        # Write to CSV
+    def save_results(self, run_results: Iterable[Any], sub_problem):
+        # Write to CSV, pulling rows from run_results batch_size at a time
         dir_name, file_name = os.path.split(self.cnf_file_input_path)
         file_name_only, ext = os.path.splitext(file_name)
         temp_result = os.path.join(self.results_folder_path, f"{sub_problem}_{file_name_only}_{self.result_file_name}.csv")
+        rows = iter(run_results)
         with open(temp_result, "w", newline="") as f:
             w = csv.writer(f)
             w.writerow(["instance_id", "bin_capacity", "bins_array", "method", "time_taken"])
-            w.writerows(run_results)
+            while True:
+                batch = list(itertools.islice(rows, self.batch_size))
+                if not batch:
+                    break
+                w.writerows(batch)
         print(f"\nResults written to {temp_result}")
     
     def binpacking_backtracing(self, bin_capacity:int, clauses:List[int]) -> List[List[int]]:
         """
         Backtracking approach to find all subsets that sum to bin_capacity.
         """
-        results = []
-        def backtrack(start: int, current_sum: int, current_bin: List[int]):
-            if current_sum == bin_capacity:
-                results.append(sorted(current_bin[:]))
-                return
-            
-            if current_sum > bin_capacity:
-                return
-            
-            for i in range(start, len(clauses)):
-                item = clauses[i]
-                if current_sum + item <= bin_capacity:
-                    current_bin.append(item)
-                    backtrack(i + 1, current_sum + item, current_bin)
-                    current_bin.pop()
-        
-        backtrack(0, 0, [])
-        return results
+        return list(self.iter_backtracing(bin_capacity, clauses))
+
+    def iter_backtracing(self, bin_capacity:int, clauses:List[int]) -> Iterator[List[int]]:
+        """
+        Yields every subset that sums to bin_capacity, in ascending order.
+
+        Items are sorted descending, so a node skips (by bisection) the items
+        too large for its remaining capacity and stops as soon as the suffix
+        of smaller items can no longer fill it. A child is only entered when
+        the suffix reachability table (src/helpers/subset_sum_reach_LANK.py)
+        says its remaining capacity can be hit exactly, so every entered node
+        leads to at least one solution. For capacities too large to store
+        the table (see REACH_MAX_BITS), (index, remaining capacity) states
+        whose subtree produced no solution are remembered and cut in O(1)
+        instead. The search itself is SubsetSearch in
+        src/helpers/parallel_backtracking_LANK.py, run from an explicit stack
+        so it can be suspended at every solution.
+        """
+        return SubsetSearch(bin_capacity, clauses).run()
+
+    def iter_parallel_backtracing(self, bin_capacity:int, clauses:List[int]) -> Iterator[List[int]]:
+        """
+        Same solutions as iter_backtracing, searched by self.processes worker
+        processes with dynamic work splitting (order differs).
+        """
+        return iter_parallel_subsets(bin_capacity, clauses, self.processes)
+
+    def iter_multiset_backtracing(self, bin_capacity:int, clauses:List[int],
+                                  with_counts: bool = False) -> Iterator[Any]:
+        """
+        Like iter_backtracing, but items of equal size are one group: a node
+        picks the next group to use and how many of its copies to take, so
+        every distinct multiset of sizes comes out exactly once (ascending).
+        With with_counts, yields (subset, n) where n is the number of
+        index-level subsets it stands for, the product of C(copies, taken).
+        Size-0 items never help reach the capacity and are left out, as in
+        iter_backtracing.
+        """
+        items = sorted((size for size in clauses if size > 0), reverse=True)
+        sizes = sorted(set(items), reverse=True)
+        copies = [items.count(size) for size in sizes]
+        negated = [-size for size in sizes]   # ascending, for bisect
+        starts = [0] * (len(sizes) + 1)        # index of each group's first copy in items
+        for j, count in enumerate(copies):
+            starts[j + 1] = starts[j] + count
+        table = SubsetSumReach(bin_capacity, items)
+        if bin_capacity == 0:
+            yield ([], 1) if with_counts else []
+            return
+        if not table.feasible():
+            return
+        chosen: List[Tuple[int, int]] = []    # (group, copies taken)
+        frames = [[bin_capacity, bisect.bisect_left(negated, -bin_capacity), 1]]
+        while frames:
+            frame = frames[-1]
+            remaining, j, take = frame
+            if j < len(sizes) and table.can_reach(starts[j], remaining):
+                if take > min(copies[j], remaining // sizes[j]):
+                    frame[1], frame[2] = j + 1, 1
+                    continue
+                frame[2] = take + 1
+                rest = remaining - take * sizes[j]
+                if rest == 0:
+                    chosen.append((j, take))
+                    subset = [sizes[g] for g, t in reversed(chosen) for _ in range(t)]
+                    if with_counts:
+                        n = 1
+                        for g, t in chosen:
+                            n *= math.comb(copies[g], t)
+                        yield subset, n
+                    else:
+                        yield subset
+                    chosen.pop()
+                elif table.can_reach(starts[j + 1], rest):
+                    chosen.append((j, take))
+                    frames.append([rest, bisect.bisect_left(negated, -rest, j + 1), 1])
+                continue
+            frames.pop()
+            if frames:
+                chosen.pop()
+
+    def binpacking_count(self, bin_capacity:int, clauses:List[int]) -> int:
+        """Number of subsets summing to bin_capacity, by DP instead of enumeration."""
+        return count_subsets(bin_capacity, clauses)
+
+    def iter_topk_backtracing(self, bin_capacity:int, clauses:List[int]) -> Iterator[List[int]]:
+        """The first self.top_k subsets summing to bin_capacity, in lexicographic order."""
+        return itertools.islice(iter_lex_subsets(bin_capacity, clauses), self.top_k)
+
+    def binpacking_feasible(self, bin_capacity:int, clauses:List[int]) -> bool:
+        """Whether any subset of the items sums to exactly bin_capacity, without searching."""
+        return subset_sum_feasible(bin_capacity, clauses)
+
+    def binpacking_large(self, bin_capacity:int, items, method: str = "ffd") -> LargePackingReport:
+        """
+        Number of bins first-fit ("ffd") or best-fit ("bfd") decreasing uses
+        for a very large instance (NumPy array of sizes), against ceil(sum / C).
+        """
+        return pack_large(bin_capacity, items, method)
+
+    def run_large(self, input_path: str, method: str = "ffd"):
+        """
+        Packs every line of a binpacking.txt-format file with binpacking_large.
+        Lines are parsed one at a time straight into NumPy arrays (not through
+        parse_input_file), so instances of millions of items fit in memory.
+        """
+        file_name_only, _ = os.path.splitext(os.path.basename(input_path))
+        temp_result = os.path.join(self.results_folder_path, f"Large_{file_name_only}_{self.result_file_name}.csv")
+        with open(input_path, mode='r', encoding='utf-8') as lines, open(temp_result, "w", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(["instance_id", "bin_capacity", "n_items", "method", "bins_used", "lower_bound", "time_taken"])
+            inst_id = 0
+            for line in lines:
+                if not line.strip() or line.lstrip().startswith(("c", "#")):
+                    continue
+                bin_capacity, items = parse_bin_packing_line(line)
+                report = self.binpacking_large(bin_capacity, items, method)
+                print(report.summary())
+                w.writerow([inst_id, bin_capacity, report.n_items, report.method,
+                            report.bins_used, report.lower_bound, report.seconds])
+                inst_id += 1
+        print(f"\nResults written to {temp_result}")
 
     @abstractmethod
     def binpacking_bruteforce(self, bin_capacity:int, clauses:List[int]) -> List[List[int]]:
@@ -92,74 +224,61 @@ class BinPackingAbstractClass(ABC):
     def binpacking_bestcase(self, bin_capacity:int, clauses:List[int]) -> List[List[int]]:
         pass
 
-    def run(self):
-        results = []
-        
-        for inst_id, clause in enumerate(self.solution_instances):
-            bin_capacity = clause[0]
-            clauses = clause[1:]
-            if SubProblemSelection.brute_force in self.sub_problems:
-                t0 = time.perf_counter()
-                temp_results = self.binpacking_bruteforce(bin_capacity, clauses)
-                bt_time = time.perf_counter() - t0
-                for result in temp_results:
-                    results.append([inst_id, bin_capacity, result,"BruteForce", bt_time])
-        
-        if SubProblemSelection.brute_force in self.sub_problems:
-            self.save_results(results, SubProblemSelection.brute_force.name)
-            results = []
-
-        for inst_id, clause in enumerate(self.solution_instances):
-            bin_capacity = clause[0]
-            clauses = clause[1:]
-            if SubProblemSelection.btracking in self.sub_problems:
-                t0 = time.perf_counter()
-                temp_results = self.binpacking_backtracing(bin_capacity, clauses)
-                bt_time = time.perf_counter() - t0
-                for result in temp_results:
-                    results.append([inst_id, bin_capacity, result,"BackTracking", bt_time])
-        
-        if SubProblemSelection.btracking in self.sub_problems:
-            self.save_results(results, SubProblemSelection.btracking.name)
-            results = []
+    # Streaming versions used by run(). Methods that can produce their
+    # solutions lazily override these; the defaults wrap the list methods.
+    def iter_bruteforce(self, bin_capacity:int, clauses:List[int]) -> Iterator[List[int]]:
+        return iter(self.binpacking_bruteforce(bin_capacity, clauses) or [])
 
-        for inst_id, clause in enumerate(self.solution_instances):
-            bin_capacity = clause[0]
-            clauses = clause[1:]
-            if SubProblemSelection.simple in self.sub_problems:
-                t0 = time.perf_counter()
-                temp_results = self.binpacking_simple(bin_capacity, clauses)
-                bt_time = time.perf_counter() - t0
-                for result in temp_results:
-                    results.append([inst_id, bin_capacity, result,"Simple", bt_time])
+    def iter_simple(self, bin_capacity:int, clauses:List[int]) -> Iterator[List[int]]:
+        return iter(self.binpacking_simple(bin_capacity, clauses) or [])
 
-        
-        if SubProblemSelection.simple in self.sub_problems:
-            self.save_results(results, SubProblemSelection.simple.name)
-            results = []
-        
+    def iter_bestcase(self, bin_capacity:int, clauses:List[int]) -> Iterator[List[int]]:
+        return iter(self.binpacking_bestcase(bin_capacity, clauses) or [])
 
+    def instance_rows(self, method_name: str, method) -> Iterator[List[Any]]:
+        """
+        CSV rows of every instance for one streaming method. Solutions are
+        spooled to a temporary file while only the time spent inside the
+        method is measured; the instance's rows are then read back with that
+        time, so memory stays bounded however many solutions there are.
+        """
         for inst_id, clause in enumerate(self.solution_instances):
             bin_capacity = clause[0]
             clauses = clause[1:]
-            if SubProblemSelection.best_case in self.sub_problems:
+            with tempfile.TemporaryFile("w+", newline="") as spool:
+                writer = csv.writer(spool)
                 t0 = time.perf_counter()
-                temp_results = self.binpacking_bestcase(bin_capacity, clauses)
+                solutions = method(bin_capacity, clauses)
                 bt_time = time.perf_counter() - t0
-                for result in temp_results:
-                    results.append([inst_id, bin_capacity, result,"BestCase", bt_time])
-        
-        if SubProblemSelection.best_case in self.sub_problems:
-            self.save_results(results, SubProblemSelection.best_case.name)
-            results = []
-
-
-
-        
-
+                while True:
+                    t0 = time.perf_counter()
+                    batch = list(itertools.islice(solutions, self.batch_size))
+                    bt_time += time.perf_counter() - t0
+                    if not batch:
+                        break
+                    writer.writerows([result] for result in batch)
+                spool.seek(0)
+                for row in csv.reader(spool):
+                    yield [inst_id, bin_capacity, row[0], method_name, bt_time]
 
-    
-    
-
-
-    
\ No newline at end of file
+    def run(self):
+        backtracking_name = "BackTracking"
+        if self.count_only:
+            backtracking_name = "Count"
+            backtracking = lambda bin_capacity, clauses: iter([self.binpacking_count(bin_capacity, clauses)])
+        elif self.top_k is not None:
+            backtracking_name = f"Top{self.top_k}"
+            backtracking = self.iter_topk_backtracing
+        elif self.multiset:
+            backtracking = self.iter_multiset_backtracing
+        elif self.processes:
+            backtracking = self.iter_parallel_backtracing
+        else:
+            backtracking = self.iter_backtracing
+        methods = [(SubProblemSelection.brute_force, "BruteForce", self.iter_bruteforce),
+                   (SubProblemSelection.btracking, backtracking_name, backtracking),
+                   (SubProblemSelection.simple, "Simple", self.iter_simple),
+                   (SubProblemSelection.best_case, "BestCase", self.iter_bestcase)]
+        for sub_problem, method_name, method in methods:
+            if sub_problem in self.sub_problems:
+                self.save_results(self.instance_rows(method_name, method), sub_problem.name)
@@ -0,0 +1,90 @@
+"""
+Bit-parallel exhaustive SAT search used by SatSolver.sat_bruteforce.
+
+The variables that occur in the formula are split into a "low" group of up to
+`block_bits` variables and a "high" group. For the low group every one of the
+2^low assignments is one bit of a Python int, so each low variable has a fixed
+truth-table mask (bit t is set iff variable j is True in assignment t). A
+clause restricted to the low group is then the OR of its literal masks and the
+whole CNF is the AND of its clauses: one big-int operation evaluates 2^low
+assignments at once.
+
+The high group is enumerated one block at a time. Under a fixed high
+assignment a clause is either already satisfied by one of its high literals
+(and drops out) or contributes its low mask to the AND. Any bit surviving the
+AND is a satisfying assignment.
+"""
+
+from typing import Dict, List, Tuple
+
+
+def truth_table_mask(j: int, low: int) -> int:
+    """Mask over 2^low assignments whose bit t is set iff bit j of t is set."""
+    width = 1 << (j + 1)
+    mask = ((1 << (1 << j)) - 1) << (1 << j)
+    total = 1 << low
+    while width < total:
+        mask |= mask << width
+        width <<= 1
+    return mask
+
+
+def bitparallel_search(n_vars: int, clauses: List[List[int]], block_bits: int = 18) -> Tuple[bool, Dict[int, bool]]:
+    """
+    Exhaustive search over all assignments of the variables occurring in clauses.
+    Variables that never occur are reported as False.
+    Returns (True, assignment) or (False, {}).
+    """
+    normalized = []
+    for clause in clauses:
+        lits = set(clause)
+        if any(-lit in lits for lit in lits):
+            continue  # tautology
+        if not lits:
+            return False, {}
+        normalized.append(lits)
+
+    variables = sorted({abs(lit) for lits in normalized for lit in lits})
+    n_used = len(variables)
+    low = min(n_used, block_bits)
+    position = {var: i for i, var in enumerate(variables)}
+
+    full = (1 << (1 << low)) - 1
+    var_masks = [truth_table_mask(j, low) for j in range(low)]
+
+    base = full
+    dynamic = []   # (high positive bits, high negative bits, low mask)
+    for lits in normalized:
+        low_mask = 0
+        pos_bits = neg_bits = 0
+        for lit in lits:
+            i = position[abs(lit)]
+            if i < low:
+                low_mask |= var_masks[i] if lit > 0 else full ^ var_masks[i]
+            elif lit > 0:
+                pos_bits |= 1 << (i - low)
+            else:
+                neg_bits |= 1 << (i - low)
+        if pos_bits or neg_bits:
+            dynamic.append((pos_bits, neg_bits, low_mask))
+        else:
+            base &= low_mask
+    if not base:
+        return False, {}
+
+    for high in range(1 << (n_used - low)):
+        acc = base
+        for pos_bits, neg_bits, low_mask in dynamic:
+            if high & pos_bits or (high & neg_bits) != neg_bits:
+                continue
+            acc &= low_mask
+            if not acc:
+                break
+        if acc:
+            t = (acc & -acc).bit_length() - 1
+            assignment = {var: False for var in range(1, n_vars + 1)}
+            for i, var in enumerate(variables):
+                bit = (t >> i) & 1 if i < low else (high >> (i - low)) & 1
+                assignment[var] = bool(bit)
+            return True, assignment
+    return False, {}
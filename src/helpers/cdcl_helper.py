@@ -0,0 +1,558 @@
+"""
+Conflict-driven clause learning (CDCL) engine used by SatSolver.sat_bestcase.
+
+Literals are stored internally as non-negative ints: variable v maps to 2*v for
+the positive literal and 2*v + 1 for the negative one, so negation is `lit ^ 1`
+and the variable is `lit >> 1`.
+
+Features:
+    - two-watched-literal unit propagation
+    - 1-UIP conflict analysis with local clause minimization
+    - non-chronological backjumping
+    - EVSIDS variable activities kept in an indexed binary heap
+    - phase saving
+    - Luby restarts
+    - learned-clause database reduction driven by LBD (glue) and activity
+    - incremental use: add_clause() between calls and solve(assumptions=...)
+      with a failed-assumption core on UNSAT
+"""
+
+import random
+from typing import Dict, List, Optional, Tuple
+
+
+def to_internal(lit: int) -> int:
+    """DIMACS literal (e.g. -3) -> internal literal."""
+    return 2 * lit if lit > 0 else 2 * (-lit) + 1
+
+
+def to_dimacs(lit: int) -> int:
+    """Internal literal -> DIMACS literal."""
+    return -(lit >> 1) if lit & 1 else lit >> 1
+
+
+def luby(y: float, x: int) -> float:
+    """x-th element (0 based) of the Luby sequence scaled by y."""
+    size, seq = 1, 0
+    while size < x + 1:
+        seq += 1
+        size = 2 * size + 1
+    while size - 1 != x:
+        size = (size - 1) >> 1
+        seq -= 1
+        x = x % size
+    return y ** seq
+
+
+class VarOrder:
+    """Indexed max-heap of variables ordered by activity."""
+
+    def __init__(self, activity: List[float]):
+        self.activity = activity
+        self.heap: List[int] = []
+        self.indices: Dict[int, int] = {}
+
+    def __contains__(self, var: int) -> bool:
+        return var in self.indices
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def insert(self, var: int):
+        if var in self.indices:
+            return
+        self.indices[var] = len(self.heap)
+        self.heap.append(var)
+        self._up(len(self.heap) - 1)
+
+    def increased(self, var: int):
+        pos = self.indices.get(var)
+        if pos is not None:
+            self._up(pos)
+
+    def pop(self) -> int:
+        heap = self.heap
+        top = heap[0]
+        last = heap.pop()
+        del self.indices[top]
+        if heap:
+            heap[0] = last
+            self.indices[last] = 0
+            self._down(0)
+        return top
+
+    def _up(self, pos: int):
+        heap, act, idx = self.heap, self.activity, self.indices
+        var = heap[pos]
+        a = act[var]
+        while pos > 0:
+            parent = (pos - 1) >> 1
+            pvar = heap[parent]
+            if act[pvar] >= a:
+                break
+            heap[pos] = pvar
+            idx[pvar] = pos
+            pos = parent
+        heap[pos] = var
+        idx[var] = pos
+
+    def _down(self, pos: int):
+        heap, act, idx = self.heap, self.activity, self.indices
+        n = len(heap)
+        var = heap[pos]
+        a = act[var]
+        while True:
+            child = 2 * pos + 1
+            if child >= n:
+                break
+            if child + 1 < n and act[heap[child + 1]] > act[heap[child]]:
+                child += 1
+            cvar = heap[child]
+            if act[cvar] <= a:
+                break
+            heap[pos] = cvar
+            idx[cvar] = pos
+            pos = child
+        heap[pos] = var
+        idx[var] = pos
+
+
+class CDCLSolver:
+    """
+    CDCL solver over DIMACS style clauses (List[List[int]]).
+
+    Usage:
+        solver = CDCLSolver(n_vars, clauses)
+        if solver.solve():
+            model = solver.model()   # Dict[int, bool] for 1..n_vars
+    """
+
+    def __init__(self,
+                 n_vars: int,
+                 clauses: List[List[int]],
+                 restart_base: int = 100,
+                 var_decay: float = 0.95,
+                 clause_decay: float = 0.999,
+                 first_reduce: int = 2000,
+                 reduce_increment: int = 300,
+                 seed: Optional[int] = None):
+        self.n_vars = n_vars
+        self.restart_base = restart_base
+        self.var_decay = var_decay
+        self.clause_decay = clause_decay
+        self.first_reduce = first_reduce
+        self.reduce_increment = reduce_increment
+
+        self.clauses: List[Optional[List[int]]] = []
+        self.learnt: List[bool] = []
+        self.lbd: List[int] = []
+        self.clause_activity: List[float] = []
+        self.clause_inc = 1.0
+        self.n_learnts = 0
+
+        self.watches: List[List[int]] = []
+        self.value: List[int] = []
+        self.level: List[int] = []
+        self.reason: List[int] = []
+        self.phase: List[bool] = []
+        self.activity: List[float] = []
+        self.var_inc = 1.0
+        self.seen: List[bool] = []
+        self.order = VarOrder(self.activity)
+
+        self.trail: List[int] = []
+        self.trail_lim: List[int] = []
+        self.qhead = 0
+        self.ok = True
+        self.core: List[int] = []
+
+        self.conflicts = 0
+        self.decisions = 0
+        self.propagations = 0
+        self.restarts = 0
+
+        self._grow(n_vars)
+        if seed is not None:
+            # seeded variants start from a random variable order and random phases
+            rng = random.Random(seed)
+            for var in range(1, self.n_vars + 1):
+                self.activity[var] = rng.random() * 1e-3
+                self.phase[var] = rng.random() < 0.5
+            self.order = VarOrder(self.activity)
+            for var in range(1, self.n_vars + 1):
+                self.order.insert(var)
+        for clause in clauses:
+            if not self.add_clause(clause):
+                break
+
+    # ------------------------------------------------------------------ setup
+
+    def _grow(self, n_vars: int):
+        """Make room for variables up to n_vars."""
+        current = len(self.level) - 1
+        if n_vars <= current:
+            return
+        start = max(current + 1, 0)
+        missing = n_vars + 1 - len(self.level)
+        self.watches.extend([] for _ in range(2 * missing))
+        self.value.extend([0] * (2 * missing))
+        self.level.extend([0] * missing)
+        self.reason.extend([-1] * missing)
+        self.phase.extend([False] * missing)
+        self.activity.extend([0.0] * missing)
+        self.seen.extend([False] * missing)
+        for var in range(max(start, 1), n_vars + 1):
+            self.order.insert(var)
+        self.n_vars = max(self.n_vars, n_vars)
+
+    def new_var(self) -> int:
+        """Allocate one more variable and return it."""
+        self._grow(self.n_vars + 1)
+        return self.n_vars
+
+    def add_clause(self, clause: List[int]) -> bool:
+        """
+        Add an original clause (DIMACS literals) at decision level 0.
+        Returns False once the formula is known to be unsatisfiable.
+        """
+        if not self.ok:
+            return False
+        if self.trail_lim:
+            self._cancel_until(0)
+        top = max((abs(lit) for lit in clause), default=0)
+        if top > self.n_vars:
+            self._grow(top)
+
+        lits = []
+        present = set()
+        value = self.value
+        for dimacs in clause:
+            lit = to_internal(dimacs)
+            if lit ^ 1 in present or value[lit] == 1:
+                return True  # tautology or already satisfied at level 0
+            if lit in present or value[lit] == -1:
+                continue
+            present.add(lit)
+            lits.append(lit)
+
+        if not lits:
+            self.ok = False
+            return False
+        if len(lits) == 1:
+            self._enqueue(lits[0], -1)
+            if self._propagate() is not None:
+                self.ok = False
+            return self.ok
+        self._attach(lits, learnt=False, lbd=0)
+        return True
+
+    def _attach(self, lits: List[int], learnt: bool, lbd: int) -> int:
+        ci = len(self.clauses)
+        self.clauses.append(lits)
+        self.learnt.append(learnt)
+        self.lbd.append(lbd)
+        self.clause_activity.append(0.0)
+        self.watches[lits[0]].append(ci)
+        self.watches[lits[1]].append(ci)
+        if learnt:
+            self.n_learnts += 1
+        return ci
+
+    # -------------------------------------------------------------- assignment
+
+    def _decision_level(self) -> int:
+        return len(self.trail_lim)
+
+    def _enqueue(self, lit: int, reason: int):
+        var = lit >> 1
+        self.value[lit] = 1
+        self.value[lit ^ 1] = -1
+        self.level[var] = len(self.trail_lim)
+        self.reason[var] = reason
+        self.trail.append(lit)
+
+    def _cancel_until(self, level: int):
+        if len(self.trail_lim) <= level:
+            return
+        value, reason, phase, order = self.value, self.reason, self.phase, self.order
+        stop = self.trail_lim[level]
+        trail = self.trail
+        for i in range(len(trail) - 1, stop - 1, -1):
+            lit = trail[i]
+            var = lit >> 1
+            value[lit] = 0
+            value[lit ^ 1] = 0
+            reason[var] = -1
+            phase[var] = not (lit & 1)
+            order.insert(var)
+        del trail[stop:]
+        del self.trail_lim[level:]
+        self.qhead = stop
+
+    def _propagate(self) -> Optional[int]:
+        """Unit propagation with two watched literals. Returns a conflict clause index or None."""
+        value, watches, clauses = self.value, self.watches, self.clauses
+        trail = self.trail
+        conflict = None
+        while self.qhead < len(trail):
+            false_lit = trail[self.qhead] ^ 1
+            self.qhead += 1
+            self.propagations += 1
+            ws = watches[false_lit]
+            kept = []
+            i, n = 0, len(ws)
+            while i < n:
+                ci = ws[i]
+                i += 1
+                c = clauses[ci]
+                if c is None:
+                    continue  # clause deleted by reduce_db
+                if c[0] == false_lit:
+                    c[0], c[1] = c[1], false_lit
+                first = c[0]
+                if value[first] == 1:
+                    kept.append(ci)
+                    continue
+                for k in range(2, len(c)):
+                    lit = c[k]
+                    if value[lit] != -1:
+                        c[1], c[k] = lit, false_lit
+                        watches[lit].append(ci)
+                        break
+                else:
+                    kept.append(ci)
+                    if value[first] == -1:
+                        conflict = ci
+                        kept.extend(ws[i:n])
+                        break
+                    self._enqueue(first, ci)
+            watches[false_lit] = kept
+            if conflict is not None:
+                self.qhead = len(trail)
+                return conflict
+        return None
+
+    # ---------------------------------------------------------------- learning
+
+    def _bump_var(self, var: int):
+        act = self.activity
+        act[var] += self.var_inc
+        if act[var] > 1e100:
+            for v in range(1, len(act)):
+                act[v] *= 1e-100
+            self.var_inc *= 1e-100
+        self.order.increased(var)
+
+    def _bump_clause(self, ci: int):
+        act = self.clause_activity
+        act[ci] += self.clause_inc
+        if act[ci] > 1e20:
+            for i in range(len(act)):
+                act[i] *= 1e-20
+            self.clause_inc *= 1e-20
+
+    def _analyze(self, confl: int):
+        """1-UIP conflict analysis. Returns (learnt clause, backjump level, lbd)."""
+        seen, level, reason, trail = self.seen, self.level, self.reason, self.trail
+        current = len(self.trail_lim)
+        learnt = [0]
+        path = 0
+        p = -1
+        idx = len(trail) - 1
+        to_clear = []
+
+        while True:
+            clause = self.clauses[confl]
+            if self.learnt[confl]:
+                self._bump_clause(confl)
+            for q in (clause if p == -1 else clause[1:]):
+                var = q >> 1
+                if not seen[var] and level[var] > 0:
+                    seen[var] = True
+                    to_clear.append(var)
+                    self._bump_var(var)
+                    if level[var] >= current:
+                        path += 1
+                    else:
+                        learnt.append(q)
+            while not seen[trail[idx] >> 1]:
+                idx -= 1
+            p = trail[idx]
+            idx -= 1
+            confl = reason[p >> 1]
+            seen[p >> 1] = False
+            path -= 1
+            if path == 0:
+                break
+        learnt[0] = p ^ 1
+
+        # local minimization: drop literals implied by other literals of the clause
+        minimized = [learnt[0]]
+        for q in learnt[1:]:
+            r = reason[q >> 1]
+            if r == -1:
+                minimized.append(q)
+                continue
+            for lit in self.clauses[r][1:]:
+                var = lit >> 1
+                if not seen[var] and level[var] > 0:
+                    minimized.append(q)
+                    break
+        learnt = minimized
+        for var in to_clear:
+            seen[var] = False
+
+        if len(learnt) == 1:
+            back_level = 0
+        else:
+            best = 1
+            for i in range(2, len(learnt)):
+                if level[learnt[i] >> 1] > level[learnt[best] >> 1]:
+                    best = i
+            learnt[1], learnt[best] = learnt[best], learnt[1]
+            back_level = level[learnt[1] >> 1]
+        lbd = len({level[lit >> 1] for lit in learnt})
+        return learnt, back_level, lbd
+
+    def _reduce_db(self):
+        """Drop roughly half of the learnt clauses, keeping glue clauses and reasons."""
+        clauses, value, reason = self.clauses, self.value, self.reason
+        candidates = []
+        for ci, c in enumerate(clauses):
+            if c is None or not self.learnt[ci] or self.lbd[ci] <= 2:
+                continue
+            first = c[0]
+            if value[first] == 1 and reason[first >> 1] == ci:
+                continue  # locked: currently the reason of an assignment
+            candidates.append(ci)
+        candidates.sort(key=lambda ci: (-self.lbd[ci], self.clause_activity[ci]))
+        for ci in candidates[: len(candidates) // 2]:
+            clauses[ci] = None
+            self.n_learnts -= 1
+
+    # ------------------------------------------------------------------ search
+
+    def _pick_branch(self) -> int:
+        order, value = self.order, self.value
+        while len(order):
+            var = order.pop()
+            if value[2 * var] == 0:
+                self.decisions += 1
+                return 2 * var if self.phase[var] else 2 * var + 1
+        return -1
+
+    def _analyze_final(self, p: int) -> List[int]:
+        """
+        p is true and contradicts an assumption. Returns the subset of the
+        assumptions (DIMACS literals) that together force p.
+        """
+        failed = [to_dimacs(p ^ 1)]
+        if not self.trail_lim:
+            return failed
+        seen, level, reason, trail = self.seen, self.level, self.reason, self.trail
+        seen[p >> 1] = True
+        for i in range(len(trail) - 1, self.trail_lim[0] - 1, -1):
+            var = trail[i] >> 1
+            if not seen[var]:
+                continue
+            r = reason[var]
+            if r == -1:
+                failed.append(to_dimacs(trail[i]))
+            else:
+                for lit in self.clauses[r][1:]:
+                    if level[lit >> 1] > 0:
+                        seen[lit >> 1] = True
+            seen[var] = False
+        seen[p >> 1] = False
+        return failed
+
+    def solve(self, max_conflicts: Optional[int] = None,
+              assumptions: Optional[List[int]] = None) -> Optional[bool]:
+        """
+        Run the CDCL search. Returns True (SAT), False (UNSAT) or None when
+        max_conflicts is exhausted first.
+
+        assumptions are DIMACS literals taken as the first decisions. When
+        they make the formula unsatisfiable, False is returned, self.core
+        holds the failed subset of them and the solver stays usable: clauses
+        and learnt clauses, activities and phases carry over to the next call.
+        """
+        self.core = []
+        if not self.ok:
+            return False
+        self._cancel_until(0)
+        assumed = [to_internal(lit) for lit in assumptions or []]
+        top = max((lit >> 1 for lit in assumed), default=0)
+        if top > self.n_vars:
+            self._grow(top)
+        if self._propagate() is not None:
+            self.ok = False
+            return False
+
+        restart_limit = self.restart_base * luby(2, self.restarts)
+        since_restart = 0
+        next_reduce = self.conflicts + self.first_reduce
+        budget_end = None if max_conflicts is None else self.conflicts + max_conflicts
+
+        while True:
+            confl = self._propagate()
+            if confl is not None:
+                self.conflicts += 1
+                since_restart += 1
+                if not self.trail_lim:
+                    self.ok = False
+                    return False
+                learnt, back_level, lbd = self._analyze(confl)
+                self._cancel_until(back_level)
+                if len(learnt) == 1:
+                    self._enqueue(learnt[0], -1)
+                else:
+                    ci = self._attach(learnt, learnt=True, lbd=lbd)
+                    self._bump_clause(ci)
+                    self._enqueue(learnt[0], ci)
+                self.var_inc /= self.var_decay
+                self.clause_inc /= self.clause_decay
+
+                if budget_end is not None and self.conflicts >= budget_end:
+                    self._cancel_until(0)
+                    return None
+                if since_restart >= restart_limit:
+                    self.restarts += 1
+                    since_restart = 0
+                    restart_limit = self.restart_base * luby(2, self.restarts)
+                    self._cancel_until(0)
+                if self.conflicts >= next_reduce:
+                    next_reduce = self.conflicts + self.first_reduce + self.reduce_increment * self.restarts
+                    self._reduce_db()
+            else:
+                lit = -1
+                while len(self.trail_lim) < len(assumed):
+                    p = assumed[len(self.trail_lim)]
+                    if self.value[p] == 1:
+                        self.trail_lim.append(len(self.trail))  # already true: empty level
+                    elif self.value[p] == -1:
+                        self.core = self._analyze_final(p ^ 1)
+                        self._cancel_until(0)
+                        return False
+                    else:
+                        lit = p
+                        break
+                if lit == -1:
+                    lit = self._pick_branch()
+                    if lit == -1:
+                        return True
+                self.trail_lim.append(len(self.trail))
+                self._enqueue(lit, -1)
+
+    def model(self) -> Dict[int, bool]:
+        """Assignment of the last satisfiable call, for variables 1..n_vars."""
+        value = self.value
+        return {var: value[2 * var] == 1 for var in range(1, self.n_vars + 1)}
+
+
+def solve_cdcl(n_vars: int, clauses: List[List[int]], **params) -> Tuple[bool, Dict[int, bool]]:
+    """One-shot CDCL call with solver parameters, e.g. solve_cdcl(n, cls, seed=3)."""
+    solver = CDCLSolver(n_vars, clauses, **params)
+    if solver.solve():
+        return True, solver.model()
+    return False, {}
@@ -0,0 +1,95 @@
+"""
+Exact chromatic number, used by GraphColoring.coloring_chromatic.
+
+Up to IE_MAX_VERTICES vertices: inclusion-exclusion over independent sets
+(Bjorklund-Husfeldt-Koivisto). With i(S) the number of independent sets
+(the empty one included) inside vertex set S,
+
+    c_k = sum over S of (-1)^(n - |S|) * i(S)^k
+
+counts the k-tuples of independent sets that cover every vertex, so chi(G)
+is the smallest k with c_k > 0. i(S) for all 2^n sets comes from one
+vectorized DP over NumPy arrays, a doubling step per vertex j (the highest
+vertex of S either stays out or goes in with its neighbours removed):
+
+    i[2^j + T] = i[T] + i[T & ~N(j)]      for every T below 2^j
+
+and c_1, c_2, ... follow from elementwise powers, O(2^n) per k. The sums are
+taken modulo two primes below 2^31 so every product fits in int64; c_k is
+declared zero only when both residues are, and a false zero (c_k a multiple
+of both primes) would only make the answer too large.
+
+Larger graphs: an increasing-k search. The greedy clique is the first k
+tried and greedy DSATUR's color count is the answer if nothing below it
+works; each k in between is decided by the DSATUR branch and bound, and
+every failed k raises the lower bound for the next one. The clique, the
+greedy coloring and the adjacency are computed once and handed to the
+search at every k instead of being rebuilt for it.
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from src.helpers.dsatur_helper import DsaturSearch, adjacency_masks, greedy_clique, greedy_dsatur
+
+IE_MAX_VERTICES = 20
+PRIMES = (2147483647, 2147483629)
+
+
+def independent_set_counts(n_vertices: int, adj: List[int]) -> np.ndarray:
+    counts = np.ones(1 << n_vertices, dtype=np.int64)
+    for j in range(n_vertices):
+        half = 1 << j
+        below = np.arange(half, dtype=np.int64)
+        counts[half:2 * half] = counts[:half] + counts[below & ~adj[j]]
+    return counts
+
+
+def chromatic_number_ie(n_vertices: int, edges: List[Tuple[int, int]]) -> int:
+    if n_vertices == 0:
+        return 0
+    adj = adjacency_masks(n_vertices, edges)
+    counts = independent_set_counts(n_vertices, adj)
+    parity = np.zeros(1 << n_vertices, dtype=np.int64)
+    for j in range(n_vertices):
+        half = 1 << j
+        parity[half:2 * half] = parity[:half] ^ 1
+    sign = np.where(parity == n_vertices % 2, 1, -1)
+    residues = [counts % p for p in PRIMES]
+    powers = [np.ones_like(counts) for _ in PRIMES]
+    for k in range(1, n_vertices + 1):
+        nonzero = False
+        for p, residue, power in zip(PRIMES, residues, powers):
+            power *= residue
+            power %= p
+            if int(np.sum(sign * power)) % p:
+                nonzero = True
+        if nonzero:
+            return k
+    return n_vertices
+
+
+def chromatic_number_search(n_vertices: int, edges: List[Tuple[int, int]]) -> Tuple[int, List[int]]:
+    if n_vertices == 0:
+        return 0, []
+    search = DsaturSearch(n_vertices, edges, 0)
+    clique = greedy_clique(search.adj)
+    colors = greedy_dsatur(search.adj)
+    upper = max(colors) + 1
+    for k in range(len(clique), upper):
+        search.k = k
+        found = search.solve(clique, colors)
+        if found is not None:
+            return k, found
+    return upper, colors
+
+
+def chromatic_number(n_vertices: int, edges: List[Tuple[int, int]]) -> Tuple[Optional[int], List[int]]:
+    """(chi, a chi-coloring), or (None, []) when a self-loop leaves no coloring at all."""
+    if any(u == v for u, v in edges):
+        return None, []
+    if n_vertices > IE_MAX_VERTICES:
+        return chromatic_number_search(n_vertices, edges)
+    chi = chromatic_number_ie(n_vertices, edges)
+    return chi, DsaturSearch(n_vertices, edges, chi).solve() or []
@@ -0,0 +1,128 @@
+"""
+Compact, array-backed clause database (CSR layout).
+
+All literals of an instance live in one flat array('i') buffer; clause i is
+literals[offsets[i]:offsets[i + 1]]. A second CSR pair (occurrence_starts,
+occurrence_clauses) lists, for every literal, the clauses it occurs in, so
+solvers that work off occurrence lists can use it without building their own.
+
+Literal l is stored at occurrence slot l + n_vars, i.e. slots run from
+-n_vars..n_vars with slot n_vars (literal 0) unused.
+
+The store still behaves like the old List[List[int]] for reading: len(),
+indexing and iteration return plain lists, and to_lists() gives a full copy.
+"""
+
+from array import array
+from typing import Iterator, List
+
+
+class CSRView:
+    """Read-only sequence view: item i is flat[starts[i]:starts[i + 1]]."""
+
+    def __init__(self, flat: array, starts: array):
+        self.flat = flat
+        self.starts = starts
+
+    def __len__(self) -> int:
+        return len(self.starts) - 1
+
+    def __getitem__(self, index: int) -> array:
+        return self.flat[self.starts[index]:self.starts[index + 1]]
+
+
+class ClauseStore:
+
+    def __init__(self, n_vars: int, literals: array, offsets: array):
+        self.literals = literals
+        self.offsets = offsets
+        top = max(max(literals, default=0), -min(literals, default=0))
+        self.n_vars = max(n_vars, top)
+        self.simple = True
+        self._build_occurrences()
+
+    @classmethod
+    def from_lists(cls, n_vars: int, clauses: List[List[int]]) -> "ClauseStore":
+        literals = array("i")
+        offsets = array("q", [0])
+        for clause in clauses:
+            literals.extend(clause)
+            offsets.append(len(literals))
+        return cls(n_vars, literals, offsets)
+
+    def _build_occurrences(self):
+        """
+        Counting-sort the clause indices by literal. While filling, a literal
+        whose slot (or whose negation's slot) was last written by the same
+        clause reveals a duplicate literal (or a tautology); `simple` is False
+        if any clause has either.
+        """
+        n = self.n_vars
+        literals, offsets = self.literals, self.offsets
+        starts = [0] * (2 * n + 2)
+        for lit in literals:
+            starts[lit + n + 1] += 1
+        for i in range(1, len(starts)):
+            starts[i] += starts[i - 1]
+        occurrences = array("i", bytes(4 * len(literals)))
+        fill = starts[:-1]
+        simple = True
+        for ci in range(len(offsets) - 1):
+            for k in range(offsets[ci], offsets[ci + 1]):
+                slot = literals[k] + n
+                if simple:
+                    neg = 2 * n - slot
+                    if (fill[slot] > starts[slot] and occurrences[fill[slot] - 1] == ci) or \
+                       (fill[neg] > starts[neg] and occurrences[fill[neg] - 1] == ci):
+                        simple = False
+                occurrences[fill[slot]] = ci
+                fill[slot] += 1
+        self.occurrence_starts = array("q", starts)
+        self.occurrence_clauses = occurrences
+        self.simple = simple
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("clause index out of range")
+        return self.literals[self.offsets[index]:self.offsets[index + 1]].tolist()
+
+    def __iter__(self) -> Iterator[List[int]]:
+        literals, offsets = self.literals, self.offsets
+        for i in range(len(offsets) - 1):
+            yield literals[offsets[i]:offsets[i + 1]].tolist()
+
+    def clause(self, index: int) -> array:
+        """Literals of one clause as a small array (no list boxing)."""
+        return self.literals[self.offsets[index]:self.offsets[index + 1]]
+
+    def clause_length(self, index: int) -> int:
+        return self.offsets[index + 1] - self.offsets[index]
+
+    def occurrences(self, lit: int) -> array:
+        """Indices of the clauses containing lit."""
+        slot = lit + self.n_vars
+        starts = self.occurrence_starts
+        return self.occurrence_clauses[starts[slot]:starts[slot + 1]]
+
+    def clause_view(self) -> CSRView:
+        """Sequence of clauses as arrays, indexed like the list of lists."""
+        return CSRView(self.literals, self.offsets)
+
+    def occurrence_view(self) -> CSRView:
+        """Sequence indexed by literal slot (lit + n_vars) of clause index arrays."""
+        return CSRView(self.occurrence_clauses, self.occurrence_starts)
+
+    def to_lists(self) -> List[List[int]]:
+        return list(self)
+
+    def nbytes(self) -> int:
+        """Approximate size of the buffers in bytes."""
+        return sum(buf.itemsize * len(buf) for buf in
+                   (self.literals, self.offsets, self.occurrence_starts, self.occurrence_clauses))
@@ -0,0 +1,249 @@
+"""
+CNF preprocessing run once per instance before the sat_* methods.
+
+Pipeline (SatELite style):
+    1. drop duplicate literals, tautologies and duplicate clauses
+    2. top-level unit propagation
+    3. forward/backward subsumption and self-subsuming resolution
+    4. bounded variable elimination (clause distribution that does not grow
+       the formula), followed by another round of 2. and 3.
+
+The simplified formula keeps the original variable numbering. Solve it, then
+call PreprocessResult.extend_model() on the solver's model: fixed variables
+are filled in and eliminated variables are reconstructed in reverse
+elimination order, so the final assignment covers all original n_vars and
+satisfies the original clauses.
+"""
+
+from typing import Dict, List, Set, Tuple
+
+# variables with more occurrences than this are never eliminated
+BVE_MAX_OCCURRENCES = 16
+# resolvents longer than this block an elimination
+BVE_MAX_RESOLVENT = 24
+
+
+class PreprocessResult:
+
+    def __init__(self, n_vars: int, clauses: List[List[int]], unsat: bool,
+                 fixed: Dict[int, bool], eliminated: List[Tuple[int, List[List[int]]]],
+                 stats: Dict[str, int]):
+        self.n_vars = n_vars
+        self.clauses = clauses
+        self.unsat = unsat
+        self.fixed = fixed
+        self.eliminated = eliminated
+        self.stats = stats
+
+    def extend_model(self, model: Dict[int, bool]) -> Dict[int, bool]:
+        """Model of the simplified formula -> model of the original formula."""
+        full = {var: bool(model.get(var, False)) for var in range(1, self.n_vars + 1)}
+        full.update(self.fixed)
+        for var, clauses in reversed(self.eliminated):
+            full[var] = False
+            for clause in clauses:
+                if var in clause and not any(full[abs(lit)] == (lit > 0) for lit in clause if lit != var):
+                    full[var] = True
+                    break
+        return full
+
+    def summary(self) -> str:
+        stats = self.stats
+        return (f"vars {stats['vars_before']}->{stats['vars_after']}, "
+                f"clauses {stats['clauses_before']}->{stats['clauses_after']} "
+                f"(tautologies {stats['tautologies']}, duplicate literals {stats['duplicate_literals']}, "
+                f"duplicate clauses {stats['duplicate_clauses']}, units {stats['units']}, "
+                f"subsumed {stats['subsumed']}, strengthened {stats['strengthened']}, "
+                f"eliminated vars {stats['eliminated_vars']})"
+                + (" UNSAT" if self.unsat else ""))
+
+
+class CNFPreprocessor:
+
+    def __init__(self, n_vars: int, clauses: List[List[int]]):
+        top = max((abs(lit) for clause in clauses for lit in clause), default=0)
+        self.n_vars = max(n_vars, top)
+        self.original = clauses
+        self.clauses: Dict[int, Set[int]] = {}
+        self.occurrences: Dict[int, Set[int]] = {}
+        self.fixed: Dict[int, bool] = {}
+        self.eliminated: List[Tuple[int, List[List[int]]]] = []
+        self.unsat = False
+        self.next_id = 0
+        self.units: List[int] = []
+        self.touched: Set[int] = set()
+        self.stats = {"vars_before": 0, "vars_after": 0,
+                      "clauses_before": len(clauses), "clauses_after": 0,
+                      "tautologies": 0, "duplicate_literals": 0, "duplicate_clauses": 0,
+                      "units": 0, "subsumed": 0, "strengthened": 0, "eliminated_vars": 0}
+
+    # ------------------------------------------------------------- database
+
+    def _add(self, lits: Set[int]) -> int:
+        cid = self.next_id
+        self.next_id += 1
+        self.clauses[cid] = lits
+        for lit in lits:
+            self.occurrences.setdefault(lit, set()).add(cid)
+        self.touched.add(cid)
+        if len(lits) == 1:
+            self.units.append(next(iter(lits)))
+        elif not lits:
+            self.unsat = True
+        return cid
+
+    def _remove(self, cid: int):
+        for lit in self.clauses.pop(cid):
+            self.occurrences[lit].discard(cid)
+        self.touched.discard(cid)
+
+    def _remove_literal(self, cid: int, lit: int):
+        lits = self.clauses[cid]
+        lits.discard(lit)
+        self.occurrences[lit].discard(cid)
+        self.touched.add(cid)
+        if len(lits) == 1:
+            self.units.append(next(iter(lits)))
+        elif not lits:
+            self.unsat = True
+
+    def _occ(self, lit: int) -> Set[int]:
+        return self.occurrences.get(lit, set())
+
+    # ---------------------------------------------------------------- steps
+
+    def _normalize(self):
+        seen = set()
+        for clause in self.original:
+            lits = set(clause)
+            if len(lits) < len(clause):
+                self.stats["duplicate_literals"] += 1
+            if any(-lit in lits for lit in lits):
+                self.stats["tautologies"] += 1
+                continue
+            key = frozenset(lits)
+            if key in seen:
+                self.stats["duplicate_clauses"] += 1
+                continue
+            seen.add(key)
+            self._add(lits)
+        self.stats["vars_before"] = len({abs(lit) for lits in self.clauses.values() for lit in lits})
+
+    def _propagate_units(self):
+        while self.units and not self.unsat:
+            lit = self.units.pop()
+            var = abs(lit)
+            if var in self.fixed:
+                if self.fixed[var] != (lit > 0):
+                    self.unsat = True
+                continue
+            self.fixed[var] = lit > 0
+            self.stats["units"] += 1
+            for cid in list(self._occ(lit)):
+                self._remove(cid)
+            for cid in list(self._occ(-lit)):
+                self._remove_literal(cid, -lit)
+
+    def _subsume_from(self, cid: int):
+        """Use clause cid to subsume or strengthen other clauses."""
+        lits = self.clauses[cid]
+        pivot = min(lits, key=lambda lit: len(self._occ(lit)) + len(self._occ(-lit)))
+        candidates = (self._occ(pivot) | self._occ(-pivot)) - {cid}
+        size = len(lits)
+        for other in list(candidates):
+            other_lits = self.clauses.get(other)
+            if other_lits is None or len(other_lits) < size:
+                continue
+            flipped = None
+            for lit in lits:
+                if lit in other_lits:
+                    continue
+                if flipped is None and -lit in other_lits:
+                    flipped = lit
+                    continue
+                break
+            else:
+                if flipped is None:
+                    self._remove(other)
+                    self.stats["subsumed"] += 1
+                else:
+                    # self-subsuming resolution: other loses -flipped
+                    self._remove_literal(other, -flipped)
+                    self.stats["strengthened"] += 1
+                    if len(other_lits) == size - 1:
+                        # other now subsumes cid as well
+                        self._remove(cid)
+                        self.stats["subsumed"] += 1
+                        return
+
+    def _subsumption(self):
+        while self.touched and not self.unsat:
+            pending = sorted(self.touched, key=lambda cid: len(self.clauses[cid]))
+            self.touched = set()
+            for cid in pending:
+                if cid in self.clauses and not self.unsat:
+                    self._subsume_from(cid)
+            self._propagate_units()
+
+    def _eliminate(self, var: int) -> bool:
+        pos, neg = self._occ(var), self._occ(-var)
+        if not pos and not neg:
+            return False
+        if len(pos) + len(neg) > BVE_MAX_OCCURRENCES:
+            return False
+        resolvents = []
+        limit = len(pos) + len(neg)
+        for p in pos:
+            for q in neg:
+                resolvent = (self.clauses[p] | self.clauses[q]) - {var, -var}
+                if any(-lit in resolvent for lit in resolvent):
+                    continue
+                if len(resolvent) > BVE_MAX_RESOLVENT:
+                    return False
+                resolvents.append(resolvent)
+                if len(resolvents) > limit:
+                    return False
+        saved = [sorted(self.clauses[cid]) for cid in list(pos) + list(neg)]
+        for cid in list(pos) + list(neg):
+            self._remove(cid)
+        self.eliminated.append((var, saved))
+        self.stats["eliminated_vars"] += 1
+        for resolvent in resolvents:
+            self._add(set(resolvent))
+        return True
+
+    def _variable_elimination(self):
+        changed = True
+        while changed and not self.unsat:
+            changed = False
+            done = {var for var, _ in self.eliminated} | set(self.fixed)
+            variables = {abs(lit) for lits in self.clauses.values() for lit in lits} - done
+            order = sorted(variables, key=lambda v: len(self._occ(v)) * len(self._occ(-v)))
+            for var in order:
+                if self.unsat:
+                    break
+                if self._eliminate(var):
+                    changed = True
+                    self._propagate_units()
+            self._subsumption()
+
+    # ------------------------------------------------------------------ API
+
+    def run(self, eliminate: bool = True) -> PreprocessResult:
+        self._normalize()
+        self._propagate_units()
+        self._subsumption()
+        if eliminate:
+            self._variable_elimination()
+        if self.unsat:
+            clauses = [[]]
+        else:
+            clauses = [sorted(lits, key=abs) for _, lits in sorted(self.clauses.items())]
+        self.stats["clauses_after"] = 0 if self.unsat else len(clauses)
+        self.stats["vars_after"] = len({abs(lit) for clause in clauses for lit in clause})
+        return PreprocessResult(self.n_vars, clauses, self.unsat, dict(self.fixed),
+                                list(self.eliminated), self.stats)
+
+
+def preprocess_cnf(n_vars: int, clauses: List[List[int]], eliminate: bool = True) -> PreprocessResult:
+    return CNFPreprocessor(n_vars, clauses).run(eliminate=eliminate)
@@ -1,48 +1,77 @@
 import os
+from array import array
 from typing import List, Tuple, Any
+from src.helpers.clause_store import ClauseStore
 
-def parse_multi_instance_dimacs(path: str) -> Tuple[str, int, List[List[int]]]:
+def parse_multi_instance_dimacs(path: str, compact: bool = False) -> List[Tuple[str, int, List[List[int]]]]:
     """
     Parses a DIMACS-like file containing multiple CNF instances.
     Returns a list of (instance_id, n_vars, clauses) tuples.
+
+    With compact=True the clauses of each instance are written straight into a
+    ClauseStore (flat array('i') literals + clause offsets + occurrence index)
+    instead of a list of lists. The file is streamed line by line either way.
     """
 
     if not os.path.exists(path = path):
         raise Exception(f"File path: {path} does not exists!!")
 
     instances = []
+    header = None          # the "c ..." line of the instance being read
+    expecting_problem = False
+    remaining = 0          # clause lines still expected for the current instance
+    current = None
+
+    def finish():
+        instance_id, n_vars, clauses = current
+        if compact:
+            literals, offsets = clauses
+            clauses = ClauseStore(n_vars, literals, offsets)
+        instances.append((instance_id, n_vars, clauses))
+
     with open(path) as f:
-        lines = [ln.strip() for ln in f if ln.strip()]
-    
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        if line.startswith("c "):
-            # Example: c 3 2 ?
-            parts = line.split()
-            instance_id = parts[1] if len(parts) > 1 else str(len(instances) + 1)
-            i += 1
-            if i >= len(lines):
-                break
-            # Expect next line: p cnf n_vars n_clauses
-            if not lines[i].startswith("p cnf"):
-                raise ValueError(f"Expected 'p cnf' after {line}")
-            _, _, n_vars_str, n_clauses_str = lines[i].split()
-            n_vars = int(n_vars_str)
-            n_clauses = int(n_clauses_str)
-            i += 1
-            clauses = []
-            # Read next n_clauses lines (allow commas)
-            for _ in range(n_clauses):
-                if i >= len(lines) or lines[i].startswith("c "):
-                    break
-                clause = [int(x) for x in lines[i].replace(",", " ").split() if x != "0"]
+        for raw in f:
+            line = raw.strip()
+            if not line:
+                continue
+            if expecting_problem:
+                # Expect next line: p cnf n_vars n_clauses
+                if not line.startswith("p cnf"):
+                    raise ValueError(f"Expected 'p cnf' after {header}")
+                _, _, n_vars_str, n_clauses_str = line.split()
+                clauses = (array("i"), array("q", [0])) if compact else []
+                current = (instance_id, int(n_vars_str), clauses)
+                remaining = int(n_clauses_str)
+                expecting_problem = False
+                if remaining == 0:
+                    finish()
+                continue
+            if remaining > 0 and not line.startswith("c "):
+                # Read next n_clauses lines (allow commas)
+                clause = [int(x) for x in line.replace(",", " ").split() if x != "0"]
                 if clause:
-                    clauses.append(clause)
-                i += 1
-            instances.append((instance_id, n_vars, clauses))
-        else:
-            i += 1
+                    if compact:
+                        literals, offsets = current[2]
+                        literals.extend(clause)
+                        offsets.append(len(literals))
+                    else:
+                        current[2].append(clause)
+                remaining -= 1
+                if remaining == 0:
+                    finish()
+                continue
+            if remaining > 0:
+                # a new instance started before n_clauses lines were read
+                remaining = 0
+                finish()
+            if line.startswith("c "):
+                # Example: c 3 2 ?
+                parts = line.split()
+                header = line
+                instance_id = parts[1] if len(parts) > 1 else str(len(instances) + 1)
+                expecting_problem = True
+    if remaining > 0:
+        finish()
     return instances
 
 
@@ -0,0 +1,241 @@
+"""
+Iterative DPLL solver used by SatSolver.sat_backtracking.
+
+No recursion: the search keeps an explicit trail of assigned literals and a
+decision stack of (trail length, literal, flipped) entries. Every clause keeps
+two counters, the number of true literals and the number of unassigned
+literals, which are updated through per-literal occurrence lists (or the
+occurrence index of a ClauseStore) when a variable is assigned and restored in
+reverse order when it is unassigned, so backtracking never copies the clause
+list.
+
+On top of the counters the solver maintains, for every literal, the number of
+unsatisfied clauses it still occurs in (for pure-literal elimination) and its
+two-sided Jeroslow-Wang weight (sum of 2^-|c| over those clauses, |c| counted
+in unassigned literals) which drives branching.
+"""
+
+from typing import Dict, List, Union
+from src.helpers.clause_store import ClauseStore
+
+JW_SCALE = 32
+
+
+class DPLLSolver:
+    """
+    DPLL over DIMACS style clauses (List[List[int]] or a ClauseStore).
+
+    Usage:
+        solver = DPLLSolver(n_vars, clauses)
+        if solver.solve():
+            model = solver.model()   # Dict[int, bool] for 1..n_vars
+    """
+
+    def __init__(self, n_vars: int, clauses: Union[List[List[int]], ClauseStore]):
+        if isinstance(clauses, ClauseStore) and clauses.simple:
+            # work directly on the store's flat buffers and occurrence index
+            if clauses.n_vars < n_vars:
+                clauses = ClauseStore(n_vars, clauses.literals, clauses.offsets)
+            self.n_vars = n = clauses.n_vars
+            self.clauses = clauses.clause_view()
+            self.occurrences = clauses.occurrence_view()
+            lengths = [clauses.clause_length(ci) for ci in range(len(clauses))]
+        else:
+            normalized = []
+            for clause in clauses:
+                lits = list(dict.fromkeys(clause))
+                present = set(lits)
+                if any(-lit in present for lit in lits):
+                    continue  # tautology
+                normalized.append(lits)
+            top = max((abs(lit) for lits in normalized for lit in lits), default=0)
+            self.n_vars = n = max(n_vars, top)
+            # literal l lives at index l + n in the per-literal arrays
+            self.clauses = normalized
+            self.occurrences = [[] for _ in range(2 * n + 1)]
+            for ci, lits in enumerate(normalized):
+                for lit in lits:
+                    self.occurrences[lit + n].append(ci)
+            lengths = [len(lits) for lits in normalized]
+        self.ok = all(lengths)
+        self.initial_units: List[int] = [
+            self.clauses[ci][0] for ci, size in enumerate(lengths) if size == 1
+        ]
+
+        longest = max(lengths, default=0)
+        self.weight = [1 << (JW_SCALE - min(f, JW_SCALE)) for f in range(longest + 2)]
+
+        self.value = [0] * (n + 1)
+        self.n_true = [0] * len(lengths)
+        self.n_free = lengths
+        self.n_satisfied = 0
+        self.active = [len(self.occurrences[i]) for i in range(2 * n + 1)]
+        self.jw = [0] * (2 * n + 1)
+        for ci, size in enumerate(lengths):
+            w = self.weight[size]
+            for lit in self.clauses[ci]:
+                self.jw[lit + n] += w
+
+        self.trail: List[int] = []
+        self.pure_candidates: List[int] = [
+            -(i - n) for i in range(2 * n + 1) if i != n and self.active[i] == 0
+        ]
+        self.decisions = 0
+        self.propagations = 0
+
+    # ------------------------------------------------------------ assignment
+
+    def _assign(self, lit: int, units: List[int]) -> bool:
+        """Make lit true and update all counters. Returns False on conflict."""
+        n = self.n_vars
+        value, clauses = self.value, self.clauses
+        n_true, n_free, active, jw, weight = self.n_true, self.n_free, self.active, self.jw, self.weight
+        pure = self.pure_candidates
+        value[abs(lit)] = 1 if lit > 0 else -1
+        self.trail.append(lit)
+        self.propagations += 1
+        ok = True
+
+        for ci in self.occurrences[lit + n]:
+            f = n_free[ci]
+            n_free[ci] = f - 1
+            n_true[ci] += 1
+            if n_true[ci] == 1:
+                # clause becomes satisfied: withdraw every unassigned literal's share
+                self.n_satisfied += 1
+                w = weight[f]
+                active[lit + n] -= 1
+                jw[lit + n] -= w
+                for other in clauses[ci]:
+                    if value[abs(other)] == 0:
+                        i = other + n
+                        active[i] -= 1
+                        jw[i] -= w
+                        if active[i] == 0:
+                            pure.append(-other)
+
+        neg = -lit + n
+        for ci in self.occurrences[neg]:
+            f = n_free[ci]
+            n_free[ci] = f - 1
+            if n_true[ci]:
+                continue
+            active[neg] -= 1
+            jw[neg] -= weight[f]
+            delta = weight[f - 1] - weight[f]
+            last = 0
+            for other in clauses[ci]:
+                if value[abs(other)] == 0:
+                    jw[other + n] += delta
+                    last = other
+            if f == 1:
+                ok = False
+            elif f == 2:
+                units.append(last)
+        return ok
+
+    def _unassign(self, lit: int):
+        """Exact inverse of _assign for the most recent trail literal."""
+        n = self.n_vars
+        value, clauses = self.value, self.clauses
+        n_true, n_free, active, jw, weight = self.n_true, self.n_free, self.active, self.jw, self.weight
+
+        neg = -lit + n
+        for ci in self.occurrences[neg]:
+            f = n_free[ci] + 1
+            n_free[ci] = f
+            if n_true[ci]:
+                continue
+            active[neg] += 1
+            jw[neg] += weight[f]
+            delta = weight[f - 1] - weight[f]
+            for other in clauses[ci]:
+                if value[abs(other)] == 0:
+                    jw[other + n] -= delta
+
+        for ci in self.occurrences[lit + n]:
+            f = n_free[ci] + 1
+            n_free[ci] = f
+            n_true[ci] -= 1
+            if n_true[ci] == 0:
+                self.n_satisfied -= 1
+                w = weight[f]
+                active[lit + n] += 1
+                jw[lit + n] += w
+                for other in clauses[ci]:
+                    if value[abs(other)] == 0:
+                        active[other + n] += 1
+                        jw[other + n] += w
+
+        value[abs(lit)] = 0
+        self.trail.pop()
+
+    def _undo_to(self, length: int):
+        trail = self.trail
+        while len(trail) > length:
+            self._unassign(trail[-1])
+        self.pure_candidates.clear()
+
+    def _propagate(self, units: List[int]) -> bool:
+        """Assign queued units, then pure literals, until fixpoint. False on conflict."""
+        n, value, active = self.n_vars, self.value, self.active
+        pure = self.pure_candidates
+        while True:
+            while units:
+                lit = units.pop()
+                current = value[abs(lit)]
+                if current:
+                    if (current > 0) != (lit > 0):
+                        units.clear()
+                        return False
+                    continue
+                if not self._assign(lit, units):
+                    units.clear()
+                    return False
+            if not pure:
+                return True
+            lit = pure.pop()
+            if value[abs(lit)] == 0 and active[-lit + n] == 0 and active[lit + n] > 0:
+                self._assign(lit, units)
+
+    def _choose(self) -> int:
+        """Two-sided Jeroslow-Wang: pick the variable with largest J(x) + J(-x)."""
+        n, value, jw = self.n_vars, self.value, self.jw
+        best, best_score = 0, -1
+        for var in range(1, n + 1):
+            if value[var] == 0:
+                score = jw[var + n] + jw[n - var]
+                if score > best_score:
+                    best, best_score = var, score
+        return best if jw[best + n] >= jw[n - best] else -best
+
+    # ---------------------------------------------------------------- search
+
+    def solve(self) -> bool:
+        if not self.ok or not self._propagate(list(self.initial_units)):
+            self.ok = False
+            return False
+
+        stack = []  # (trail length before decision, decided literal, flipped)
+        n_clauses = len(self.n_true)
+        while self.n_satisfied < n_clauses:
+            lit = self._choose()
+            self.decisions += 1
+            stack.append((len(self.trail), lit, False))
+            ok = self._propagate([lit])
+            while not ok:
+                while stack and stack[-1][2]:
+                    stack.pop()
+                if not stack:
+                    self._undo_to(0)
+                    self.ok = False
+                    return False
+                length, lit, _ = stack.pop()
+                self._undo_to(length)
+                stack.append((length, -lit, True))
+                ok = self._propagate([-lit])
+        return True
+
+    def model(self) -> Dict[int, bool]:
+        """Assignment after a satisfiable solve(); free variables are False."""
+        return {var: self.value[var] > 0 for var in range(1, self.n_vars + 1)}
@@ -0,0 +1,187 @@
+"""
+Exact k-coloring by DSATUR-ordered branch and bound, used by
+GraphColoring.coloring_bestcase.
+
+Adjacency and color sets are Python int bitmasks: forbid[v] has bit c set
+when a colored neighbour of v uses color c, so the saturation of v is
+forbid[v].bit_count().
+
+    - a greedy clique (grown from every vertex, always adding the candidate
+      with most neighbours) is a lower bound: if it has more than k vertices
+      the answer is NO without any search; otherwise its vertices are fixed
+      to colors 0..|Q|-1 up front
+    - greedy DSATUR gives an upper bound: if it needs at most k colors its
+      coloring is returned directly
+    - the search always branches on the uncolored vertex of highest
+      saturation (ties: highest degree) and tries the colors not in its
+      forbidden mask, but at most one color that no vertex uses yet (all
+      unused colors are interchangeable, so opening any other one would
+      only repeat the same subtree)
+    - coloring v with c sets bit c in the masks of its uncolored neighbours
+      that did not have it and records them, so undoing the move clears
+      exactly those bits; a neighbour left with all k colors forbidden
+      fails the branch at once (forward checking)
+
+The search runs from an explicit stack, like the other solvers here.
+"""
+
+import heapq
+from typing import List, Optional, Tuple
+
+
+def adjacency_masks(n_vertices: int, edges: List[Tuple[int, int]]) -> List[int]:
+    adj = [0] * n_vertices
+    for u, v in edges:
+        adj[u] |= 1 << v
+        adj[v] |= 1 << u
+    return adj
+
+
+def bits(mask: int):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def greedy_clique(adj: List[int]) -> List[int]:
+    best: List[int] = []
+    degree = [mask.bit_count() for mask in adj]
+    for seed in sorted(range(len(adj)), key=lambda v: -degree[v]):
+        if degree[seed] < len(best):
+            break    # a clique through seed cannot be larger
+        clique, candidates = [seed], adj[seed]
+        while candidates:
+            u = max(bits(candidates), key=lambda w: (adj[w] & candidates).bit_count())
+            clique.append(u)
+            candidates &= adj[u]
+        if len(clique) > len(best):
+            best = clique
+    return best
+
+
+def greedy_dsatur(adj: List[int]) -> List[int]:
+    """DSATUR coloring with as many colors as it needs (smallest free color each step)."""
+    return greedy_dsatur_lists([list(bits(mask)) for mask in adj])
+
+
+def greedy_dsatur_lists(neighbours: List[List[int]]) -> List[int]:
+    """
+    greedy_dsatur on neighbour lists, for large sparse graphs: a heap of
+    (saturation, degree) keys with stale entries skipped when popped, so the
+    whole coloring takes O((n + m) log n).
+    """
+    n = len(neighbours)
+    colors = [-1] * n
+    forbid = [0] * n
+    degree = [len(ns) for ns in neighbours]
+    heap = [(0, -degree[v], v) for v in range(n)]   # (-saturation, -degree, v)
+    heapq.heapify(heap)
+    saturation = [0] * n
+    while heap:
+        neg_sat, _, v = heapq.heappop(heap)
+        if colors[v] != -1 or -neg_sat != saturation[v]:
+            continue
+        c = (~forbid[v] & (forbid[v] + 1)).bit_length() - 1    # lowest zero bit
+        colors[v] = c
+        for u in neighbours[v]:
+            if colors[u] == -1 and not forbid[u] >> c & 1:
+                forbid[u] |= 1 << c
+                saturation[u] += 1
+                heapq.heappush(heap, (-saturation[u], -degree[u], u))
+    return colors
+
+
+class DsaturSearch:
+
+    def __init__(self, n_vertices: int, edges: List[Tuple[int, int]], k: int):
+        self.n = n_vertices
+        self.k = k
+        self.self_loop = any(u == v for u, v in edges)
+        self.adj = adjacency_masks(n_vertices, edges)
+        self.neighbours = [list(bits(mask)) for mask in self.adj]
+        self.degree = [len(ns) for ns in self.neighbours]
+        self.nodes = 0
+
+    def solve(self, clique: Optional[List[int]] = None, upper: Optional[List[int]] = None) -> Optional[List[int]]:
+        """
+        A proper coloring with colors 0..k-1, or None if there is none. The
+        greedy clique and greedy DSATUR coloring (upper) are computed here
+        unless the caller already has them, e.g. from an earlier k.
+        """
+        n, k, adj, neighbours, degree = self.n, self.k, self.adj, self.neighbours, self.degree
+        if n == 0:
+            return []
+        if self.self_loop or k <= 0:
+            return None
+        if clique is None:
+            clique = greedy_clique(adj)
+        if len(clique) > k:
+            return None
+        colors = greedy_dsatur(adj) if upper is None else upper
+        if max(colors) < k:
+            return colors
+
+        full = (1 << k) - 1
+        colors = [-1] * n
+        forbid = [0] * n
+        for c, v in enumerate(clique):
+            colors[v] = c
+            for u in neighbours[v]:
+                forbid[u] |= 1 << c
+        if any(colors[v] == -1 and forbid[v] == full for v in range(n)):
+            return None
+        uncolored = set(range(n)) - set(clique)
+        used = len(clique)
+
+        def open_frame() -> list:
+            """[vertex, colors to try, next option, undo list, colors used before]."""
+            v = max(uncolored, key=lambda w: (forbid[w].bit_count(), degree[w]))
+            uncolored.discard(v)
+            options = [c for c in range(min(used + 1, k)) if not forbid[v] >> c & 1]
+            return [v, options, 0, None, used]
+
+        if not uncolored:
+            return colors
+        stack = [open_frame()]
+        while stack:
+            frame = stack[-1]
+            v, options, pos, undo, used_before = frame
+            if undo is not None:
+                colors[v] = -1
+                clear = ~(1 << options[pos - 1])
+                for u in undo:
+                    forbid[u] &= clear
+                frame[3] = None
+                used = used_before
+            if pos == len(options):
+                stack.pop()
+                uncolored.add(v)
+                continue
+            c = options[pos]
+            frame[2] = pos + 1
+            colors[v] = c
+            used = max(used_before, c + 1)
+            self.nodes += 1
+            bit = 1 << c
+            undo = frame[3] = []
+            dead = False
+            for u in neighbours[v]:
+                if colors[u] == -1 and not forbid[u] & bit:
+                    forbid[u] |= bit
+                    undo.append(u)
+                    if forbid[u] == full:
+                        dead = True
+                        break
+            if dead:
+                continue
+            if not uncolored:
+                return colors
+            stack.append(open_frame())
+        return None
+
+
+def dsatur_coloring(n_vertices: int, edges: List[Tuple[int, int]], k: int) -> Tuple[bool, List[int]]:
+    """(True, coloring) or (False, []) in the shape the results CSV expects."""
+    colors = DsaturSearch(n_vertices, edges, k).solve()
+    return (True, colors) if colors is not None else (False, [])
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 import os
 from src.helpers.dmaics_parser import parse_multi_instance_graph
+from src.helpers.graph_decomposition_helper import solve_decomposed
 from src.helpers.constants import RESULTS_FOLDER, CONFIGURATION_FILE_PATH
 from typing import List, Tuple, Dict, Any, Optional
 import json
@@ -14,8 +15,21 @@ class GraphColoringAbstractClass(ABC):
     def __init__(self, 
                     cnf_file_input_path: str,
                     result_file_name:str = "graph_coloring_results",
-                    results_folder_path: str = RESULTS_FOLDER):
+                    results_folder_path: str = RESULTS_FOLDER,
+                    decompose: bool = True,
+                    processes: Optional[int] = None,
+                    chromatic: bool = False,
+                    tabu_iterations: int = 100_000):
         self.cnf_file_input_path = cnf_file_input_path
+        # adds a chromatic_number column (see coloring_chromatic) to every
+        # results CSV and a Chromatic result set judged against the file's k
+        self.chromatic = chromatic
+        # move budget of the Tabucol local search behind coloring_simple
+        self.tabu_iterations = tabu_iterations
+        # peel vertices of degree < k and color connected components separately
+        self.decompose = decompose
+        # worker processes for large components (None: one per CPU)
+        self.processes = processes
         self.results_folder_path = results_folder_path
         self.result_file_name = result_file_name
         self.config_path = CONFIGURATION_FILE_PATH
@@ -46,7 +60,7 @@ class GraphColoringAbstractClass(ABC):
     def parse_input_file(self):
         return parse_multi_instance_graph(self.cnf_file_input_path)
     
-    def save_results(self, run_results: List[Any], sub_problem):
+    def save_results(self, run_results: List[Any], sub_problem, extra_columns: Optional[List[str]] = None):
         # Write to CSV
         dir_name, file_name = os.path.split(self.cnf_file_input_path)
         file_name_only, ext = os.path.splitext(file_name)
@@ -54,10 +68,22 @@ class GraphColoringAbstractClass(ABC):
         with open(temp_result, "w", newline="") as f:
             w = csv.writer(f)
             w.writerow(["instance_id", "n_vertices", "n_edges", "k",
-                    "method", "colorable", "time_seconds", "coloring"])
+                    "method", "colorable", "time_seconds", "coloring"] + (extra_columns or []))
             w.writerows(run_results)
         print(f"\nResults written to {temp_result}")
     
+    def solve_instance(self, method, n_vertices: int, edges: List[Tuple[int]], k:int) -> Tuple[bool, Any]:
+        """
+        Runs one coloring method on an instance, through the low-degree and
+        component decomposition (src/helpers/graph_decomposition_helper.py)
+        unless self.decompose is off. Large components are sent to worker
+        processes, so method is a module-level function (or a
+        functools.partial of one) rather than a bound method of the solver.
+        """
+        if not self.decompose:
+            return method(n_vertices, edges, k)
+        return solve_decomposed(method, n_vertices, edges, k, self.processes)
+
     @abstractmethod
     def coloring_backtracking(self, n_vertices: int, edges: List[Tuple[int]], k:int) -> Tuple[bool, Optional[Dict[int, bool]]]:
         pass
@@ -74,73 +100,52 @@ class GraphColoringAbstractClass(ABC):
     def coloring_bestcase(self, n_vertices: int, edges: List[Tuple[int]], k:int) -> Tuple[bool, Optional[Dict[int, bool]]]:
         pass
 
-    def run(self):
-        results = []
-        
-        for instance_id, k, n_vertices, edges in self.solution_instances:
-
-            if SubProblemSelection.brute_force in self.sub_problems:
-                t0 = time.perf_counter()
-                bt_ok, bt_assign = self.coloring_bruteforce(n_vertices, edges, k)
-                bt_time = time.perf_counter() - t0
-                results.append([instance_id, n_vertices, len(edges), k,
-                        "BruteForce", "YES" if bt_ok else "NO",
-                        f"{bt_time:.6f}", str(bt_assign)])
-        
-        if SubProblemSelection.brute_force in self.sub_problems:
-            self.save_results(results, SubProblemSelection.brute_force.name)
-            results = []
+    @abstractmethod
+    def coloring_chromatic(self, n_vertices: int, edges: List[Tuple[int]]) -> Tuple[Optional[int], List[int]]:
+        pass
 
+    def chromatic_numbers(self) -> List[Tuple[Optional[int], List[int], float]]:
+        """
+        (chi, chi-coloring, seconds) of every instance, computed once per run
+        (empty entries when the mode is off).
+        """
+        if not self.chromatic:
+            return [(None, [], 0.0)] * len(self.solution_instances)
+        numbers = []
         for instance_id, k, n_vertices, edges in self.solution_instances:
+            t0 = time.perf_counter()
+            chi, colors = self.coloring_chromatic(n_vertices, edges)
+            numbers.append((chi, colors, time.perf_counter() - t0))
+            print(f"Instance {instance_id}: chromatic number {chi} in {numbers[-1][2]:.6f}s")
+        return numbers
 
-            if SubProblemSelection.btracking in self.sub_problems:
-                t0 = time.perf_counter()
-                bt_ok, bt_assign = self.coloring_backtracking(n_vertices, edges, k)
-                bt_time = time.perf_counter() - t0
-                results.append([instance_id, n_vertices, len(edges), k,
-                        "BackTracking", "YES" if bt_ok else "NO",
-                        f"{bt_time:.6f}", str(bt_assign)])
-        
-        if SubProblemSelection.btracking in self.sub_problems:
-            self.save_results(results, SubProblemSelection.btracking.name)
+    def run(self):
+        methods = [(SubProblemSelection.brute_force, "BruteForce", self.coloring_bruteforce),
+                   (SubProblemSelection.btracking, "BackTracking", self.coloring_backtracking),
+                   (SubProblemSelection.simple, "Simple", self.coloring_simple),
+                   (SubProblemSelection.best_case, "BestCase", self.coloring_bestcase)]
+        numbers = self.chromatic_numbers()
+        extra_columns = ["chromatic_number"] if self.chromatic else []
+
+        for sub_problem, method_name, method in methods:
+            if sub_problem not in self.sub_problems:
+                continue
             results = []
-
-        for instance_id, k, n_vertices, edges in self.solution_instances:
-
-            if SubProblemSelection.simple in self.sub_problems:
+            for index, (instance_id, k, n_vertices, edges) in enumerate(self.solution_instances):
                 t0 = time.perf_counter()
-                bt_ok, bt_assign = self.coloring_simple(n_vertices, edges, k)
+                bt_ok, bt_assign = method(n_vertices, edges, k)
                 bt_time = time.perf_counter() - t0
                 results.append([instance_id, n_vertices, len(edges), k,
-                        "Simple", "YES" if bt_ok else "NO",
-                        f"{bt_time:.6f}", str(bt_assign)])
-        
-        if SubProblemSelection.simple in self.sub_problems:
-            self.save_results(results, SubProblemSelection.simple.name)
-            results = []
-        
-
-        for instance_id, k, n_vertices, edges in self.solution_instances:
+                        method_name, "unknown" if bt_ok is None else ("YES" if bt_ok else "NO"),
+                        f"{bt_time:.6f}", str(bt_assign)] + ([numbers[index][0]] if self.chromatic else []))
+            self.save_results(results, sub_problem.name, extra_columns=extra_columns)
 
-            if SubProblemSelection.best_case in self.sub_problems:
-                t0 = time.perf_counter()
-                bt_ok, bt_assign = self.coloring_bestcase(n_vertices, edges, k)
-                bt_time = time.perf_counter() - t0
-                results.append([instance_id, n_vertices, len(edges), k,
-                        "BestCase", "YES" if bt_ok else "NO",
-                        f"{bt_time:.6f}", str(bt_assign)])
-        
-        if SubProblemSelection.best_case in self.sub_problems:
-            self.save_results(results, SubProblemSelection.best_case.name)
+        if self.chromatic:
+            # the verdict for the file's k is chi <= k, and the chi-coloring is then a k-coloring
             results = []
-
-
-
-        
-
-
-    
-    
-
-
-    
\ No newline at end of file
+            for (instance_id, k, n_vertices, edges), (chi, colors, seconds) in zip(self.solution_instances, numbers):
+                ok = chi is not None and chi <= k
+                results.append([instance_id, n_vertices, len(edges), k,
+                        "Chromatic", "YES" if ok else "NO",
+                        f"{seconds:.6f}", str(colors if ok else []), chi])
+            self.save_results(results, "chromatic", extra_columns=extra_columns)
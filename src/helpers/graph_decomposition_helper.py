@@ -0,0 +1,137 @@
+"""
+Preprocessing shared by every coloring method: low-degree peeling and
+connected components.
+
+    1. peeling: a vertex with fewer than k neighbours can always be colored
+       after all of them, so it is removed, which may push its neighbours
+       below k in turn (a queue over the degrees, O(n + m), leaving the
+       k-core)
+    2. components: the core splits into connected components, which are
+       colored independently by the chosen method on relabelled vertices
+       0..len(component) - 1; large ones go to a process pool when there
+       are several of them, so the method must pickle cheaply: a
+       module-level function or a functools.partial of one, never a bound
+       method that would carry its whole solver along
+    3. stitching: component colorings are copied back to the original
+       vertex numbers, then the peeled vertices are colored in reverse
+       peeling order with the smallest color none of their neighbours uses
+       (one is always free, since fewer than k of them were still there
+       when the vertex was peeled)
+
+If any component has no k-coloring the graph has none; otherwise, if a
+heuristic method could not decide some component (None), neither can the
+decomposition. A graph that peels away completely is colored by step 3
+alone, without calling the method.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional, Set, Tuple
+
+# components with at least this many vertices are solved in worker processes
+PARALLEL_MIN_VERTICES = 60
+
+ColoringMethod = Callable[[int, List[Tuple[int, int]], int], Tuple[Optional[bool], Optional[List[int]]]]
+
+
+class Decomposition:
+
+    def __init__(self, n_vertices: int, edges: List[Tuple[int, int]], k: int):
+        self.n = n_vertices
+        self.k = k
+        self.neighbours: List[Set[int]] = [set() for _ in range(n_vertices)]
+        self.self_loop = False
+        for u, v in edges:
+            if u == v:
+                self.self_loop = True
+            else:
+                self.neighbours[u].add(v)
+                self.neighbours[v].add(u)
+        self.peeled = self._peel()
+        removed = set(self.peeled)
+        self.components = self._components([v for v in range(n_vertices) if v not in removed])
+
+    def _peel(self) -> List[int]:
+        degree = [len(ns) for ns in self.neighbours]
+        removed = [False] * self.n
+        queue = [v for v in range(self.n) if degree[v] < self.k]
+        for v in queue:
+            removed[v] = True
+        order = []
+        while queue:
+            v = queue.pop()
+            order.append(v)
+            for u in self.neighbours[v]:
+                if not removed[u]:
+                    degree[u] -= 1
+                    if degree[u] < self.k:
+                        removed[u] = True
+                        queue.append(u)
+        return order
+
+    def _components(self, core: List[int]) -> List[List[int]]:
+        in_core = set(core)
+        seen: Set[int] = set()
+        components = []
+        for start in core:
+            if start in seen:
+                continue
+            seen.add(start)
+            component, stack = [], [start]
+            while stack:
+                v = stack.pop()
+                component.append(v)
+                for u in self.neighbours[v]:
+                    if u in in_core and u not in seen:
+                        seen.add(u)
+                        stack.append(u)
+            components.append(sorted(component))
+        return components
+
+    def subproblem(self, component: List[int]) -> Tuple[int, List[Tuple[int, int]]]:
+        """The component relabelled to vertices 0..len - 1, with its edges."""
+        local = {v: i for i, v in enumerate(component)}
+        edges = [(local[v], local[u]) for v in component for u in self.neighbours[v] if v < u and u in local]
+        return len(component), edges
+
+    def stitch(self, colorings: List[List[int]]) -> List[int]:
+        colors = [-1] * self.n
+        for component, coloring in zip(self.components, colorings):
+            for v, c in zip(component, coloring):
+                colors[v] = c
+        for v in reversed(self.peeled):
+            taken = {colors[u] for u in self.neighbours[v]}
+            colors[v] = next(c for c in range(self.k) if c not in taken)
+        return colors
+
+
+def solve_decomposed(method: ColoringMethod, n_vertices: int, edges: List[Tuple[int, int]], k: int,
+                     processes: Optional[int] = None) -> Tuple[Optional[bool], List[int]]:
+    """Runs method on every component of the k-core and returns the stitched coloring."""
+    if n_vertices == 0:
+        return True, []
+    decomposition = Decomposition(n_vertices, edges, k)
+    if decomposition.self_loop or k <= 0:
+        return False, []
+    subproblems = [decomposition.subproblem(component) for component in decomposition.components]
+    large = [i for i, (n, _) in enumerate(subproblems) if n >= PARALLEL_MIN_VERTICES]
+    results: List[Optional[Tuple[Optional[bool], Optional[List[int]]]]] = [None] * len(subproblems)
+    if len(large) > 1:
+        workers = min(len(large), processes or os.cpu_count() or 1)
+        with ProcessPoolExecutor(workers) as pool:
+            futures = {i: pool.submit(method, *subproblems[i], k) for i in large}
+            for i, (n, sub_edges) in enumerate(subproblems):
+                if i not in futures:
+                    results[i] = method(n, sub_edges, k)
+            for i, future in futures.items():
+                results[i] = future.result()
+    else:
+        for i, (n, sub_edges) in enumerate(subproblems):
+            results[i] = method(n, sub_edges, k)
+            if results[i][0] is False:
+                return False, []
+    if any(ok is False for ok, _ in results):
+        return False, []
+    if any(ok is None for ok, _ in results):
+        return None, []
+    return True, decomposition.stitch([coloring for _, coloring in results])
@@ -0,0 +1,121 @@
+"""
+Incremental SAT sessions on top of the CDCL engine.
+
+IncrementalSatSolver keeps one CDCLSolver alive across calls, so learnt
+clauses, variable activities and saved phases carry over from one solve() to
+the next. solve() takes assumptions (DIMACS literals that must hold for this
+call only) and, on UNSAT, core() returns the failed subset of them.
+
+SharedPrefixSession solves a run of instances whose clause lists start with
+the same prefix: the prefix is added once, unit extras become assumptions and
+other extra clauses are guarded by a fresh selector variable s (added as
+clause + [-s], solved under assumption s and retired with the unit [-s]
+afterwards), so nothing an instance adds leaks into the next one.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+from src.helpers.cdcl_helper import CDCLSolver
+
+
+class IncrementalSatSolver:
+
+    def __init__(self, n_vars: int = 0, clauses: Optional[List[List[int]]] = None):
+        self.engine = CDCLSolver(n_vars, clauses or [])
+        self.n_vars = self.engine.n_vars
+        self.selectors = set()
+        self.calls = 0
+
+    def new_var(self) -> int:
+        """
+        Allocate a fresh helper variable (e.g. a clause selector) above every
+        variable seen so far. Helper variables are left out of models.
+        """
+        var = self.engine.new_var()
+        self.selectors.add(var)
+        return var
+
+    def add_clause(self, clause: List[int]) -> bool:
+        """Add a permanent clause. Returns False once the formula is UNSAT."""
+        for lit in clause:
+            if abs(lit) not in self.selectors:
+                self.n_vars = max(self.n_vars, abs(lit))
+        return self.engine.add_clause(clause)
+
+    def solve(self, assumptions: Optional[List[int]] = None) -> Tuple[bool, Dict[int, bool]]:
+        """(True, model over 1..n_vars) or (False, {}); see core() after UNSAT."""
+        self.calls += 1
+        if self.engine.solve(assumptions=assumptions):
+            model = self.engine.model()
+            return True, {var: model[var] for var in range(1, self.n_vars + 1)}
+        return False, {}
+
+    def core(self) -> List[int]:
+        """Failed assumptions of the last UNSAT call ([] if UNSAT without assumptions)."""
+        return list(self.engine.core)
+
+
+def shared_prefix_length(a: Sequence[List[int]], b: Sequence[List[int]]) -> int:
+    size = 0
+    for left, right in zip(a, b):
+        if left != right:
+            break
+        size += 1
+    return size
+
+
+def group_shared_prefix(instances: List[Tuple[str, int, List[List[int]]]],
+                        min_fraction: float = 0.5) -> List[Tuple[List[int], int]]:
+    """
+    Groups consecutive instances that share a clause prefix covering at least
+    min_fraction of every member's clauses. Returns (instance indices, prefix
+    length) for every group with two or more members.
+    """
+    groups = []
+    members: List[int] = []
+    prefix = 0
+    for index, (_, _, clauses) in enumerate(instances):
+        if members:
+            first = instances[members[0]][2]
+            shared = min(prefix, shared_prefix_length(first, clauses))
+            smallest = min(len(instances[i][2]) for i in members + [index])
+            if shared > 0 and shared >= min_fraction * smallest:
+                members.append(index)
+                prefix = shared
+                continue
+            if len(members) > 1:
+                groups.append((members, prefix))
+        members, prefix = [index], len(clauses)
+    if len(members) > 1:
+        groups.append((members, prefix))
+    return groups
+
+
+class SharedPrefixSession:
+
+    def __init__(self, prefix: List[List[int]], n_vars: int):
+        self.prefix = prefix
+        self.prefix_length = len(prefix)
+        self.n_vars = n_vars
+        self.solver: Optional[IncrementalSatSolver] = None
+
+    def solve(self, n_vars: int, clauses: Sequence[List[int]]) -> Tuple[bool, Dict[int, bool]]:
+        if self.solver is None:
+            # built on first use so the cost lands in the first instance's timing
+            self.solver = IncrementalSatSolver(self.n_vars)
+            for clause in self.prefix:
+                self.solver.add_clause(clause)
+        assumptions, selectors = [], []
+        for clause in list(clauses)[self.prefix_length:]:
+            if len(set(clause)) == 1:
+                assumptions.append(clause[0])
+            else:
+                selector = self.solver.new_var()
+                self.solver.add_clause(list(clause) + [-selector])
+                assumptions.append(selector)
+                selectors.append(selector)
+        ok, model = self.solver.solve(assumptions)
+        for selector in selectors:
+            self.solver.add_clause([-selector])
+        if not ok:
+            return False, {}
+        return True, {var: model.get(var, False) for var in range(1, n_vars + 1)}
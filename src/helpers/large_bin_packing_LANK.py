@@ -0,0 +1,369 @@
+"""
+Heuristic bin packing for very large single-line instances (10^5 to 10^7
+items in the binpacking.txt format: capacity followed by the item sizes).
+
+    - the line is parsed straight into a NumPy array
+    - np.unique sorts and run-length encodes the items in one vectorized step,
+      so both heuristics walk the distinct sizes in decreasing order with a
+      copy count each
+    - a run of k copies of size s is placed in bulk: in both first fit and
+      best fit, once a copy lands in a bin, the following copies go into the
+      same bin until it has less than s left, so a bin takes
+      min(k, residual // s) copies in one step, and the copies still left
+      over open ceil(k / (C // s)) identical bins at once
+
+First-fit decreasing keeps a max segment tree over the bins' residual
+capacities (a NumPy array); descending it finds the leftmost bin with room
+for s in O(log bins). The sizes are placed BATCH_RUNS at a time, with one
+vectorized descent per tree level for the whole batch. Within a batch the
+leftmost bins found only move left as the sizes shrink, and FFD stays exact
+when every run of equal targets is resolved on its own:
+
+    - the runs aiming at the same bin take it in order while their copies
+      fit whole; the first run that does not fit takes what still does and
+      carries on through the bins up to the previous target (no larger size
+      has room there, and no smaller one is placed there in this batch)
+    - everything not placed is carried into the next batch, ahead of the
+      sizes not yet read
+    - sizes that fit no open bin fill new ones: with m = C // s the same for
+      all of them, m consecutive items fill each new bin exactly as first
+      fit would
+    - a batch led by a size with RUN_MIN_COPIES copies or more places it on
+      its own, with a vectorized scan of the next bins
+
+Best-fit decreasing only needs the residual values, not bin order: bins
+with the same residual are interchangeable, so it keeps a count per
+residual value plus a sorted list of the values present, and a whole group
+of equal bins is filled per step.
+
+With 10^7 random items, FFD takes about 1.5 s at C = 1000 and 2 to 3 s at
+C = 10^6 (sizes in [1, 10^6) or in [250000, 600000)); BFD takes 3 to 5 s
+at C = 10^6.
+
+Only the number of bins is tracked (per-bin item lists for 10^7 items are not
+useful output); it is reported against the L1 lower bound ceil(sum / C).
+"""
+
+import bisect
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# first fit switches to a vectorized scan of the next bins (as many as there
+# are copies left, doubling while it keeps finding room) when at least this
+# many copies remain to be placed
+CHUNK_MIN_COPIES = 32
+# distinct sizes first fit places per batch of vectorized tree descents
+BATCH_RUNS = 4096
+# bins a batch scans past a run's first bin, beyond two per copy left
+GAP_MIN_BINS = 8
+# a batch that starts with a size of at least this many copies places it on its own
+RUN_MIN_COPIES = 1 << 14
+
+def parse_bin_packing_line(line: str) -> Tuple[int, np.ndarray]:
+    values = np.array(line.split(), dtype=np.int64)
+    return int(values[0]), values[1:]
+
+
+def decreasing_runs(items: np.ndarray) -> Tuple[List[int], List[int]]:
+    """(sizes, copies) of the distinct item sizes, largest first."""
+    sizes, copies = np.unique(items, return_counts=True)
+    return sizes[::-1].tolist(), copies[::-1].tolist()
+
+
+class MaxSegmentTree:
+    """Residual capacity per bin; leaves beyond the open bins hold -1."""
+
+    def __init__(self, expected_bins: int = 1024):
+        leaves = 1
+        while leaves < expected_bins:
+            leaves *= 2
+        self.size = leaves
+        self.tree = np.full(2 * leaves, -1, dtype=np.int64)
+        self.depth = leaves.bit_length() - 1
+        self.n_bins = 0
+
+    def _grow(self, n_bins: int):
+        size = self.size
+        while size < n_bins:
+            size *= 2
+        if size == self.size:
+            return
+        old = self.tree[self.size:self.size + self.n_bins]
+        self.size = size
+        self.depth = size.bit_length() - 1
+        self.tree = np.full(2 * size, -1, dtype=np.int64)
+        self.tree[size:size + len(old)] = old
+        self._rebuild(size, size + len(old))
+
+    def _rebuild(self, lo: int, hi: int):
+        """Recompute every ancestor of tree positions lo..hi - 1."""
+        tree = self.tree
+        if hi - lo <= 4:
+            for pos in range(lo, hi):
+                self.update(pos - self.size, tree[pos])
+            return
+        while lo > 1:
+            lo, hi = lo // 2, (hi + 1) // 2
+            np.maximum(tree[2 * lo:2 * hi:2], tree[2 * lo + 1:2 * hi:2], out=tree[lo:hi])
+
+    def append(self, residual: int, count: int):
+        """Opens count bins with the same residual capacity."""
+        self.extend(np.full(count, residual, dtype=np.int64))
+
+    def extend(self, residuals: np.ndarray):
+        """Opens one bin per entry of residuals, in order."""
+        start = self.n_bins
+        self._grow(start + len(residuals))
+        self.tree[self.size + start:self.size + start + len(residuals)] = residuals
+        self.n_bins += len(residuals)
+        self._rebuild(self.size + start, self.size + start + len(residuals))
+
+    def leftmost(self, need: int) -> int:
+        """Index of the first bin with residual >= need (the root must allow it)."""
+        tree, pos = self.tree, 1
+        while pos < self.size:
+            pos *= 2
+            if tree[pos] < need:
+                pos += 1
+        return pos - self.size
+
+    def leftmost_many(self, needs: np.ndarray) -> np.ndarray:
+        """leftmost for every entry of needs, one descent step per level for all of them."""
+        tree = self.tree
+        pos = np.ones(len(needs), dtype=np.int64)
+        for _ in range(self.depth):
+            pos *= 2
+            pos += tree[pos] < needs
+        return pos - self.size
+
+    def residual(self, index: int) -> int:
+        return int(self.tree[self.size + index])
+
+    def update(self, index: int, residual: int):
+        tree = self.tree
+        pos = self.size + index
+        tree[pos] = residual
+        pos //= 2
+        while pos:
+            value = max(tree[2 * pos], tree[2 * pos + 1])
+            if tree[pos] == value:
+                break
+            tree[pos] = value
+            pos //= 2
+
+    def update_many(self, indices: np.ndarray, residuals: np.ndarray):
+        """update for distinct bin indices given in sorted order."""
+        tree = self.tree
+        pos = indices + self.size
+        tree[pos] = residuals
+        for _ in range(self.depth):
+            pos //= 2
+            pos = np.concatenate((pos[:1], pos[1:][pos[1:] != pos[:-1]]))
+            tree[pos] = np.maximum(tree[2 * pos], tree[2 * pos + 1])
+
+
+def _fill_chunk(bins: MaxSegmentTree, start: int, end: int, size: int, left: int) -> Tuple[int, int]:
+    """
+    Puts up to left copies of size into bins start..end - 1 in first-fit order,
+    vectorized. Returns (copies placed, bins that took some).
+    """
+    lo, hi = bins.size + start, bins.size + end
+    free = bins.tree[lo:hi].copy()
+    fits = np.where(free >= size, free // size, 0)
+    placed = np.cumsum(fits)
+    if placed[-1] > left:
+        j = int(np.searchsorted(placed, left))
+        fits[j] -= placed[j] - left
+        fits[j + 1:] = 0
+    bins.tree[lo:hi] = free - fits * size
+    bins._rebuild(lo, hi)
+    return int(fits.sum()), int(np.count_nonzero(fits))
+
+
+def _starts(values: np.ndarray) -> np.ndarray:
+    """Positions where a run of equal values begins."""
+    return np.concatenate(([0], np.flatnonzero(values[1:] != values[:-1]) + 1))
+
+
+def _place_run(bins: MaxSegmentTree, bin_capacity: int, size: int, left: int):
+    """First fit of left copies of size, one descent or vectorized chunk per step."""
+    width = left
+    while left and bins.tree[1] >= size:
+        index = bins.leftmost(size)
+        free = bins.residual(index)
+        if left - free // size >= CHUNK_MIN_COPIES and width:
+            end = min(bins.n_bins, index + width)
+            taken, used = _fill_chunk(bins, index, end, size, left)
+            left -= taken
+            # sparse candidates: go back to one descent per bin for this size
+            width = 2 * width if used * 8 >= end - index else 0
+            continue
+        taken = min(left, free // size)
+        bins.update(index, free - taken * size)
+        left -= taken
+    if left:
+        per_bin = bin_capacity // size
+        full, rest = divmod(left, per_bin)
+        if full:
+            bins.append(bin_capacity - per_bin * size, full)
+        if rest:
+            bins.append(bin_capacity - rest * size, 1)
+
+
+def _place_runs(bins: MaxSegmentTree, bin_capacity: int, sizes: np.ndarray, copies: np.ndarray):
+    """First fit of the runs (sizes descending, all > 0), BATCH_RUNS at a time."""
+    carry_sizes, carry_copies, done = sizes[:0], copies[:0], 0
+    while len(carry_sizes) or done < len(sizes):
+        take = max(BATCH_RUNS - len(carry_sizes), 0)
+        size = np.concatenate((carry_sizes, sizes[done:done + take]))
+        count = np.concatenate((carry_copies, copies[done:done + take]))
+        done += take
+        if count[0] >= RUN_MIN_COPIES:
+            # it comes first, so it can be placed on its own
+            _place_run(bins, bin_capacity, int(size[0]), int(count[0]))
+            carry_sizes, carry_copies = size[1:], count[1:]
+            continue
+        new = int(np.count_nonzero(size > bins.tree[1]))
+        if new:
+            # they fit no open bin: consecutive groups of m = C // size fill new bins
+            m = bin_capacity // int(size[0])
+            band = (bin_capacity // size[:new] == m) & (np.cumsum(count[:new]) <= RUN_MIN_COPIES)
+            band = new if band.all() else int(np.argmin(band))
+            items = np.repeat(size[:band], count[:band])
+            bins.extend(bin_capacity - np.add.reduceat(items, np.arange(0, len(items), m)))
+            carry_sizes, carry_copies = size[band:], count[band:]
+            continue
+        target = bins.leftmost_many(size)
+        groups = _starts(target)
+        weight = size * count
+        used = np.cumsum(weight)
+        used -= np.repeat(used[groups] - weight[groups], np.diff(groups, append=len(size)))
+        free = bins.tree[bins.size + target]
+        whole = used <= free
+        # the first run of a group that does not fit whole takes what still fits
+        partial = ~whole & np.concatenate(([True], whole[:-1]))
+        partial[groups] = ~whole[groups]
+        taken = np.where(whole, count, 0)
+        taken[partial] = (free[partial] - used[partial] + weight[partial]) // size[partial]
+        left = count - taken
+        index, residual = target[groups], free[groups] - np.add.reduceat(taken * size, groups)
+        # a partial run goes on into the bins up to the previous group's target,
+        # which no other run of the batch has room in or is placed into
+        runs = np.flatnonzero(partial & (left > 0))
+        if len(runs):
+            group = np.searchsorted(groups, runs, side="right") - 1
+            lo = target[runs] + 1
+            hi = np.where(group > 0, target[groups[group - 1]], bins.n_bins)
+            width = np.clip(hi - lo, 0, 2 * left[runs] + GAP_MIN_BINS)
+            owner = np.repeat(np.arange(len(runs)), width)
+            first = np.cumsum(width) - width
+            gap = lo[owner] + np.arange(len(owner)) - first[owner]
+            room = bins.tree[bins.size + gap]
+            fits = room // size[runs][owner]
+            before = np.cumsum(fits) - fits
+            before -= before[first[owner]]
+            put = np.clip(left[runs][owner] - before, 0, fits)
+            left[runs] -= np.bincount(owner, put, len(runs)).astype(np.int64)
+            changed = np.flatnonzero(put)
+            index = np.concatenate((index, gap[changed]))
+            residual = np.concatenate((residual, room[changed] - put[changed] * size[runs][owner[changed]]))
+            order = np.argsort(index)
+            index, residual = index[order], residual[order]
+        bins.update_many(index, residual)
+        carry_sizes, carry_copies = size[left > 0], left[left > 0]
+
+
+def first_fit_decreasing_count(bin_capacity: int, sizes: List[int], copies: List[int]) -> int:
+    # room for L1 plus a quarter before the tree has to grow
+    total = sum(size * count for size, count in zip(sizes, copies))
+    bins = MaxSegmentTree(max(1024, 5 * (total // max(bin_capacity, 1)) // 4))
+    positive = len(sizes) - (len(sizes) > 0 and sizes[-1] == 0)
+    if positive:
+        _place_runs(bins, bin_capacity, np.array(sizes[:positive], dtype=np.int64),
+                    np.array(copies[:positive], dtype=np.int64))
+    if positive < len(sizes) and bins.n_bins == 0:
+        bins.append(bin_capacity, 1)    # only items of size 0
+    return bins.n_bins
+
+
+def best_fit_decreasing_count(bin_capacity: int, sizes: List[int], copies: List[int]) -> int:
+    count: Dict[int, int] = {}    # residual -> number of bins
+    values: List[int] = []        # residuals present, ascending
+    n_bins = 0
+
+    def add(residual: int, bins: int):
+        if residual not in count:
+            count[residual] = 0
+            bisect.insort(values, residual)
+        count[residual] += bins
+
+    for size, left in zip(sizes, copies):
+        if size == 0:
+            if n_bins == 0:
+                add(bin_capacity, 1)
+                n_bins = 1
+            continue
+        while left:
+            pos = bisect.bisect_left(values, size)
+            if pos == len(values):
+                break
+            free = values[pos]
+            per_bin = free // size
+            group = count.pop(free)
+            values.pop(pos)
+            filled = min(group, left // per_bin)
+            left -= filled * per_bin
+            if filled:
+                add(free - per_bin * size, filled)
+            if filled < group:
+                if left:
+                    add(free - left * size, 1)
+                    filled += 1
+                    left = 0
+                if filled < group:
+                    add(free, group - filled)
+        if left:
+            per_bin = bin_capacity // size
+            full, rest = divmod(left, per_bin)
+            if full:
+                add(bin_capacity - per_bin * size, full)
+            if rest:
+                add(bin_capacity - rest * size, 1)
+            n_bins += full + (rest > 0)
+    return n_bins
+
+
+class LargePackingReport:
+
+    def __init__(self, method: str, bin_capacity: int, n_items: int, bins_used: int,
+                 lower_bound: int, seconds: float):
+        self.method = method
+        self.bin_capacity = bin_capacity
+        self.n_items = n_items
+        self.bins_used = bins_used
+        self.lower_bound = lower_bound
+        self.seconds = seconds
+
+    def summary(self) -> str:
+        return (f"{self.method}: {self.n_items} items in {self.bins_used} bins "
+                f"(lower bound {self.lower_bound}, +{self.bins_used - self.lower_bound}) in {self.seconds:.3f}s")
+
+
+def pack_large(bin_capacity: int, items: np.ndarray, method: str = "ffd") -> LargePackingReport:
+    """Bins used by first-fit ("ffd") or best-fit ("bfd") decreasing."""
+    if method not in ("ffd", "bfd"):
+        raise ValueError(f"unknown heuristic {method!r}, expected 'ffd' or 'bfd'")
+    t0 = time.perf_counter()
+    items = np.asarray(items, dtype=np.int64)
+    if len(items) and int(items.max()) > bin_capacity:
+        raise ValueError(f"an item of size {int(items.max())} does not fit in a bin of {bin_capacity}")
+    sizes, copies = decreasing_runs(items)
+    if method == "ffd":
+        bins_used = first_fit_decreasing_count(bin_capacity, sizes, copies)
+    else:
+        bins_used = best_fit_decreasing_count(bin_capacity, sizes, copies)
+    lower_bound = -(-int(items.sum()) // bin_capacity) if bin_capacity > 0 else int(len(items) > 0)
+    return LargePackingReport(method.upper(), bin_capacity, len(items), bins_used, lower_bound,
+                              time.perf_counter() - t0)
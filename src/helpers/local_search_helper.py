@@ -0,0 +1,172 @@
+"""
+Stochastic local search (WalkSAT / probSAT) used by SatSolver.sat_simple.
+
+The solver keeps, for the current full assignment:
+    - the number of true literals of every clause
+    - the critical variable of every clause with exactly one true literal
+    - break[v]: clauses that become unsatisfied if v is flipped
+    - make[v]:  unsatisfied clauses that become satisfied if v is flipped
+    - the list of unsatisfied clauses with each clause's position in it
+All of them are updated in O(occurrences of the flipped variable) per flip.
+
+Local search is incomplete: when the flip budget of every try is spent it
+answers None ("unknown"), never UNSAT. The only UNSAT answer it gives is for
+a formula containing an empty clause.
+"""
+
+import random
+from typing import Dict, List, Optional
+
+
+class LocalSearchSolver:
+
+    def __init__(self,
+                 n_vars: int,
+                 clauses: List[List[int]],
+                 algorithm: str = "probsat",
+                 noise: float = 0.567,
+                 cb: float = 2.38,
+                 max_flips: int = 100000,
+                 max_tries: int = 10,
+                 seed: Optional[int] = None):
+        if algorithm not in ("walksat", "probsat"):
+            raise ValueError(f"Unknown local search algorithm: {algorithm}")
+        self.algorithm = algorithm
+        self.noise = noise
+        self.cb = cb
+        self.max_flips = max_flips
+        self.max_tries = max_tries
+        self.rng = random.Random(seed)
+
+        self.clauses: List[List[int]] = []
+        self.has_empty_clause = False
+        for clause in clauses:
+            lits = list(dict.fromkeys(clause))
+            present = set(lits)
+            if any(-lit in present for lit in lits):
+                continue  # tautology
+            if not lits:
+                self.has_empty_clause = True
+            self.clauses.append(lits)
+        top = max((abs(lit) for lits in self.clauses for lit in lits), default=0)
+        self.n_vars = n = max(n_vars, top)
+
+        # literal l lives at index l + n
+        self.occurrences: List[List[int]] = [[] for _ in range(2 * n + 1)]
+        for ci, lits in enumerate(self.clauses):
+            for lit in lits:
+                self.occurrences[lit + n].append(ci)
+
+        self.value = [False] * (n + 1)
+        self.n_true = [0] * len(self.clauses)
+        self.critical = [0] * len(self.clauses)
+        self.break_count = [0] * (n + 1)
+        self.make_count = [0] * (n + 1)
+        self.unsat: List[int] = []
+        self.unsat_pos = [-1] * len(self.clauses)
+        self.flips = 0
+        self.tries = 0
+        # probSAT weights (eps + break)^-cb for small break values
+        self.break_weight = [(1.0 + b) ** -cb for b in range(64)]
+
+    def _randomize(self):
+        n, value, clauses = self.n_vars, self.value, self.clauses
+        rng = self.rng
+        for var in range(1, n + 1):
+            value[var] = rng.random() < 0.5
+        self.break_count = [0] * (n + 1)
+        self.make_count = [0] * (n + 1)
+        self.unsat = []
+        self.unsat_pos = [-1] * len(clauses)
+        for ci, lits in enumerate(clauses):
+            true_lits = [lit for lit in lits if value[abs(lit)] == (lit > 0)]
+            self.n_true[ci] = len(true_lits)
+            if not true_lits:
+                self.unsat_pos[ci] = len(self.unsat)
+                self.unsat.append(ci)
+                for lit in lits:
+                    self.make_count[abs(lit)] += 1
+            elif len(true_lits) == 1:
+                self.critical[ci] = abs(true_lits[0])
+                self.break_count[abs(true_lits[0])] += 1
+
+    def _flip(self, var: int):
+        n, value, clauses = self.n_vars, self.value, self.clauses
+        n_true, critical = self.n_true, self.critical
+        break_count, make_count = self.break_count, self.make_count
+        unsat, unsat_pos = self.unsat, self.unsat_pos
+        was_true = var if value[var] else -var
+        value[var] = not value[var]
+        self.flips += 1
+
+        for ci in self.occurrences[-was_true + n]:
+            count = n_true[ci] + 1
+            n_true[ci] = count
+            if count == 1:
+                # clause leaves the unsatisfied list
+                last = unsat.pop()
+                pos = unsat_pos[ci]
+                if last != ci:
+                    unsat[pos] = last
+                    unsat_pos[last] = pos
+                unsat_pos[ci] = -1
+                for lit in clauses[ci]:
+                    make_count[abs(lit)] -= 1
+                critical[ci] = var
+                break_count[var] += 1
+            elif count == 2:
+                break_count[critical[ci]] -= 1
+
+        for ci in self.occurrences[was_true + n]:
+            count = n_true[ci] - 1
+            n_true[ci] = count
+            if count == 0:
+                break_count[var] -= 1
+                unsat_pos[ci] = len(unsat)
+                unsat.append(ci)
+                for lit in clauses[ci]:
+                    make_count[abs(lit)] += 1
+            elif count == 1:
+                for lit in clauses[ci]:
+                    if value[abs(lit)] == (lit > 0):
+                        critical[ci] = abs(lit)
+                        break_count[abs(lit)] += 1
+                        break
+
+    def _pick(self, ci: int) -> int:
+        rng, break_count = self.rng, self.break_count
+        variables = [abs(lit) for lit in self.clauses[ci]]
+        if self.algorithm == "walksat":
+            breaks = [break_count[var] for var in variables]
+            best = min(breaks)
+            if best == 0 or rng.random() >= self.noise:
+                return rng.choice([var for var, b in zip(variables, breaks) if b == best])
+            return rng.choice(variables)
+        weights = self.break_weight
+        scores = [weights[b] if b < len(weights) else (1.0 + b) ** -self.cb
+                  for b in (break_count[var] for var in variables)]
+        threshold = rng.random() * sum(scores)
+        for var, score in zip(variables, scores):
+            threshold -= score
+            if threshold <= 0:
+                return var
+        return variables[-1]
+
+    def solve(self) -> Optional[bool]:
+        """True when a model is found, False only for an empty clause, None otherwise."""
+        if self.has_empty_clause:
+            return False
+        for _ in range(self.max_tries):
+            self.tries += 1
+            self._randomize()
+            for _ in range(self.max_flips):
+                if not self.unsat:
+                    return True
+                ci = self.unsat[self.rng.randrange(len(self.unsat))]
+                self._flip(self._pick(ci))
+            if not self.unsat:
+                return True
+        return None
+
+    def model(self) -> Dict[int, bool]:
+        return {var: self.value[var] for var in range(1, self.n_vars + 1)}
@@ -0,0 +1,89 @@
+"""
+Meet-in-the-middle enumeration of every subset of items summing exactly to
+bin_capacity, used by BinPacking.binpacking_bruteforce.
+
+    1. sort the items ascending and split them into a low and a high half
+    2. enumerate all 2^(n/2) subset sums of each half as NumPy arrays, with
+       the bitmask of every subset alongside, and sort them by sum
+    3. for every low sum s, np.searchsorted finds the run of high sums equal
+       to bin_capacity - s; the runs are expanded into (low, high) index pairs
+       without a Python loop, a bounded chunk at a time
+    4. the matching bitmasks are decoded back into item lists in chunks and
+       yielded lazily
+
+Because the low half holds the smaller items, low items followed by high items
+is already an ascending list, like the output of binpacking_backtracing.
+Item sizes are assumed positive; copies of the same size count as distinct
+items.
+"""
+
+from typing import Iterator, List, Tuple
+
+import numpy as np
+
+from src.helpers.subset_sum_reach_LANK import reach_table_fits, subset_sum_feasible
+
+# index pairs expanded and decoded into item lists per chunk
+CHUNK = 1 << 16
+
+
+def subset_sums(items: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(sums, masks) of all 2^len(items) subsets, sorted by sum."""
+    sums = np.zeros(1, dtype=np.int64)
+    masks = np.zeros(1, dtype=np.int64)
+    for bit, item in enumerate(items):
+        sums = np.concatenate((sums, sums + item))
+        masks = np.concatenate((masks, masks | (1 << bit)))
+    order = np.argsort(sums, kind="stable")
+    return sums[order], masks[order]
+
+
+def matching_pairs(low_sums: np.ndarray, high_sums: np.ndarray, target: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Index pairs (i, j) with low_sums[i] + high_sums[j] == target, CHUNK pairs
+    at a time. Pair k of the flattened runs belongs to the low index whose
+    cumulative run length first exceeds k.
+    """
+    wanted = target - low_sums
+    lo = np.searchsorted(high_sums, wanted, side="left")
+    counts = np.searchsorted(high_sums, wanted, side="right") - lo
+    ends = np.cumsum(counts)
+    total = int(ends[-1]) if len(ends) else 0
+    for start in range(0, total, CHUNK):
+        k = np.arange(start, min(start + CHUNK, total), dtype=np.int64)
+        low_index = np.searchsorted(ends, k, side="right")
+        high_index = lo[low_index] + (k - (ends[low_index] - counts[low_index]))
+        yield low_index, high_index
+
+
+def decode(masks: np.ndarray, items: np.ndarray) -> np.ndarray:
+    """Boolean matrix: row r marks the items chosen by masks[r]."""
+    if len(items) == 0:
+        return np.zeros((len(masks), 0), dtype=bool)
+    return ((masks[:, None] >> np.arange(len(items), dtype=np.int64)) & 1).astype(bool)
+
+
+def iter_meet_in_the_middle_subsets(bin_capacity: int, items: List[int]) -> Iterator[List[int]]:
+    """
+    Yields the matching subsets lazily. Only one chunk of index pairs is held
+    in memory at a time, besides the two halves' sum tables. Instances that
+    the reachability bitset proves infeasible skip the enumeration entirely;
+    the check only runs while it is cheaper than the split itself (the same
+    capacity bound as the reachability table), never for large capacities.
+    """
+    if reach_table_fits(bin_capacity, len(items)) and not subset_sum_feasible(bin_capacity, items):
+        return
+    ordered = np.sort(np.asarray(items, dtype=np.int64))
+    half = len(ordered) // 2
+    low, high = ordered[:half], ordered[half:]
+    low_sums, low_masks = subset_sums(low)
+    high_sums, high_masks = subset_sums(high)
+
+    for low_index, high_index in matching_pairs(low_sums, high_sums, bin_capacity):
+        chosen = np.concatenate((decode(low_masks[low_index], low), decode(high_masks[high_index], high)), axis=1)
+        for row in chosen:
+            yield ordered[row].tolist()
+
+
+def meet_in_the_middle_subsets(bin_capacity: int, items: List[int]) -> List[List[int]]:
+    return list(iter_meet_in_the_middle_subsets(bin_capacity, items))
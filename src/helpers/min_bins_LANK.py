@@ -0,0 +1,241 @@
+"""
+Exact minimum number of bins, used by BinPacking.binpacking_bestcase.
+
+    - upper bound: the better of first-fit decreasing and best-fit decreasing
+    - lower bound: Martello-Toth L1 (ceil(sum / C)) and L2
+    - if they meet, the heuristic packing is optimal and no search runs
+    - otherwise a bin-completion branch-and-bound (Korf) builds one bin per
+      level: the largest remaining item plus one of its completions
+
+Pruning:
+    - only maximal completions are tried (dominance: an item that still fits
+      could always be added), as multisets of distinct sizes so identical
+      copies never branch twice, fullest bin first
+    - completions in which one or two items could be replaced by a single
+      larger remaining item are dominated and skipped
+    - a remaining multiset already searched with no more bins is not
+      searched again
+    - a node is cut when its bins plus L2 of the remaining items reach the
+      incumbent
+    - the search stops as soon as a packing meets the lower bound
+
+The search runs from an explicit stack, so instances with thousands of items
+do not hit Python's recursion limit.
+"""
+
+import bisect
+from typing import Dict, List, Optional, Tuple
+
+
+def first_fit_decreasing(bin_capacity: int, items: List[int]) -> List[List[int]]:
+    bins: List[List[int]] = []
+    residual: List[int] = []
+    for item in sorted(items, reverse=True):
+        for b, free in enumerate(residual):
+            if item <= free:
+                bins[b].append(item)
+                residual[b] -= item
+                break
+        else:
+            bins.append([item])
+            residual.append(bin_capacity - item)
+    return bins
+
+
+def best_fit_decreasing(bin_capacity: int, items: List[int]) -> List[List[int]]:
+    bins: List[List[int]] = []
+    by_residual: List[tuple] = []   # sorted (residual, bin index)
+    for item in sorted(items, reverse=True):
+        pos = bisect.bisect_left(by_residual, (item, -1))
+        if pos < len(by_residual):
+            free, b = by_residual.pop(pos)
+            bins[b].append(item)
+            bisect.insort(by_residual, (free - item, b))
+        else:
+            bins.append([item])
+            bisect.insort(by_residual, (bin_capacity - item, len(bins) - 1))
+    return bins
+
+
+def lower_bound_l1(bin_capacity: int, items: List[int]) -> int:
+    return -(-sum(items) // bin_capacity)
+
+
+def lower_bound_l2(bin_capacity: int, items: List[int]) -> int:
+    """
+    Martello-Toth L2: for every threshold K <= C/2, items above C - K need a
+    bin each, items in (C/2, C - K] need a bin each, and items in [K, C/2]
+    need whatever space the second group leaves over.
+    """
+    best = 0
+    thresholds = sorted({0} | {item for item in items if item <= bin_capacity // 2})
+    for k in thresholds:
+        big = [item for item in items if item > bin_capacity - k]
+        middle = [item for item in items if bin_capacity / 2 < item <= bin_capacity - k]
+        small = [item for item in items if k <= item <= bin_capacity / 2]
+        spare = len(middle) * bin_capacity - sum(middle)
+        overflow = max(0, -(-(sum(small) - spare) // bin_capacity))
+        best = max(best, len(big) + len(middle) + overflow)
+    return best
+
+
+class MinBinsSolver:
+
+    def __init__(self, bin_capacity: int, items: List[int]):
+        self.bin_capacity = bin_capacity
+        self.items = sorted(items, reverse=True)
+        self.sizes = sorted(set(items), reverse=True)
+        self.counts = [self.items.count(size) for size in self.sizes]
+        self.nodes = 0
+
+    def _remaining(self) -> List[int]:
+        return [size for size, count in zip(self.sizes, self.counts) for _ in range(count)]
+
+    def _dominated(self, chosen: List[int], free: int) -> bool:
+        """
+        Korf's replacement test: the completion is dominated if one chosen
+        item, or two together, could be swapped for a single larger remaining
+        item that still fits; the swapped-out items can always take that
+        item's place in another bin.
+        """
+        sizes, counts = self.sizes, self.counts
+        available = [sizes[j] for j in range(len(sizes)) if counts[j]]
+        values = [sizes[j] for j in chosen]
+        for a, y in enumerate(values):
+            if any(y < w <= y + free for w in available):
+                return True
+            for z in values[a + 1:]:
+                if any(y + z <= w <= y + z + free for w in available):
+                    return True
+        return False
+
+    def _completions(self, first: int) -> List[List[int]]:
+        """
+        Undominated ways to fill the bin of sizes[first] (one copy already
+        taken out of counts): maximal multisets of the remaining sizes that
+        pass the replacement test, fullest first.
+
+        Sizes are decided largest first from an explicit stack of frames
+        [j, free, next take, applied take, smallest size left out]. A branch
+        that leaves a copy of size s out can only end maximal if the space
+        still free drops below s, so it is cut as soon as even every smaller
+        remaining item would not get it there.
+        """
+        sizes, counts = self.sizes, self.counts
+        n_sizes = len(sizes)
+        found = []
+        chosen: List[int] = []
+        # room the sizes after j could still take up (their counts stay fixed below j)
+        after = [0] * (n_sizes + 1)
+        for j in range(n_sizes - 1, -1, -1):
+            after[j] = after[j + 1] + sizes[j] * counts[j]
+
+        def open_frame(j: int, free: int, need: float) -> Optional[list]:
+            """Frame for the next size that fits, or None after recording a leaf."""
+            while j < n_sizes and (counts[j] == 0 or sizes[j] > free):
+                j += 1
+            if j == n_sizes:
+                if (not any(counts[i] and sizes[i] <= free for i in range(n_sizes))
+                        and not self._dominated(chosen, free)):
+                    found.append((free, list(chosen)))
+                return None
+            most = min(counts[j], free // sizes[j] if sizes[j] else counts[j])
+            return [j, free, most, None, need]
+
+        stack = [open_frame(0, self.bin_capacity - sizes[first], float("inf"))]
+        if stack[0] is None:
+            stack = []
+        while stack:
+            frame = stack[-1]
+            j, free, take, applied, need = frame
+            if applied is not None:
+                counts[j] += applied
+                del chosen[len(chosen) - applied:]
+                frame[3] = None
+            if take < 0:
+                stack.pop()
+                continue
+            frame[2] = take - 1
+            rest = free - take * sizes[j]
+            if take < counts[j]:
+                need = min(need, sizes[j])
+            if rest - after[j + 1] >= need:
+                continue    # a left-out copy will still fit: never maximal
+            counts[j] -= take
+            chosen.extend([j] * take)
+            frame[3] = take
+            child = open_frame(j + 1, rest, need)
+            if child is not None:
+                stack.append(child)
+
+        found.sort(key=lambda entry: entry[0])
+        return [[first] + completion for _, completion in found]
+
+    def solve(self) -> Optional[List[List[int]]]:
+        capacity, items, sizes, counts = self.bin_capacity, self.items, self.sizes, self.counts
+        if not items:
+            return []
+        if items[0] > capacity:
+            return None
+        best = min(first_fit_decreasing(capacity, items), best_fit_decreasing(capacity, items), key=len)
+        lower = max(lower_bound_l1(capacity, items), lower_bound_l2(capacity, items)) if capacity > 0 else 1
+        if len(best) <= lower:
+            return best
+
+        bins: List[List[int]] = []
+        # remaining multiset -> fewest bins it was already searched with
+        visited: Dict[Tuple[int, ...], int] = {}
+
+        def open_node() -> Optional[list]:
+            """Frame [completions, next, applied] for the largest remaining item, or None if pruned."""
+            key = tuple(counts)
+            if visited.get(key, len(bins) + 1) <= len(bins):
+                return None
+            visited[key] = len(bins)
+            if len(bins) + lower_bound_l2(capacity, self._remaining()) >= len(best):
+                return None
+            first = next(j for j, count in enumerate(counts) if count)
+            counts[first] -= 1
+            completions = self._completions(first)
+            counts[first] += 1
+            return [completions, 0, None]
+
+        stack = [open_node()]
+        while stack:
+            frame = stack[-1]
+            completions, pos, applied = frame
+            if applied is not None:
+                for j in applied:
+                    counts[j] += 1
+                bins.pop()
+                frame[2] = None
+            if pos == len(completions):
+                stack.pop()
+                continue
+            frame[1] += 1
+            applied = frame[2] = completions[pos]
+            for j in applied:
+                counts[j] -= 1
+            bins.append([sizes[j] for j in applied])
+            self.nodes += 1
+            if not any(counts):
+                if len(bins) < len(best):
+                    best = [list(bin_items) for bin_items in bins]
+                    if len(best) <= lower:
+                        break
+                continue
+            child = open_node()
+            if child is not None:
+                stack.append(child)
+        return best
+
+
+def min_bins_packing(bin_capacity: int, items: List[int]) -> List[List[int]]:
+    """
+    Optimal packing as per-bin item lists (ascending within a bin), or [] when
+    some item is larger than bin_capacity and no packing exists.
+    """
+    bins = MinBinsSolver(bin_capacity, items).solve()
+    if bins is None:
+        return []
+    return [sorted(bin_items) for bin_items in bins]
@@ -0,0 +1,191 @@
+"""
+Exact model counting (#SAT) used by SatSolver.sat_model_count.
+
+Search in the style of Relsat / Cachet:
+    - after every decision, unit propagation simplifies the residual formula
+    - the residual clauses are split into variable-disjoint connected
+      components whose counts multiply
+    - each component's count is cached under its canonical form (sorted
+      clauses of sorted literals); the cache is LRU-bounded by the number of
+      literals it stores
+    - variables that drop out of the residual formula without being assigned
+      contribute a factor of 2 each
+
+The recursion over components is run from an explicit stack of generators, so
+long implication chains do not hit Python's recursion limit.
+
+Counts are over all n_vars variables of the formula given; run this on the
+original clauses, since preprocessing (variable elimination) changes the count.
+"""
+
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+Clause = Tuple[int, ...]
+Component = Tuple[Clause, ...]
+
+
+def propagate(clauses: Component, decision: Optional[int]) -> Tuple[Optional[List[Clause]], Set[int]]:
+    """
+    Assigns decision (if any) plus every unit clause and propagates. Returns
+    (residual clauses, assigned variables), or (None, ...) on a conflict.
+    """
+    occurrences: Dict[int, List[int]] = {}
+    for ci, clause in enumerate(clauses):
+        for lit in clause:
+            occurrences.setdefault(lit, []).append(ci)
+    assigned: Set[int] = set()
+    queue = [] if decision is None else [decision]
+    queue += [clause[0] for clause in clauses if len(clause) == 1]
+    while queue:
+        lit = queue.pop()
+        if lit in assigned:
+            continue
+        if -lit in assigned:
+            return None, set()
+        assigned.add(lit)
+        for ci in occurrences.get(-lit, ()):
+            unassigned = None
+            for other in clauses[ci]:
+                if other in assigned:
+                    break
+                if -other in assigned:
+                    continue
+                if unassigned is not None:
+                    break
+                unassigned = other
+            else:
+                if unassigned is None:
+                    return None, set()
+                queue.append(unassigned)
+    residual = []
+    for clause in clauses:
+        if any(lit in assigned for lit in clause):
+            continue
+        residual.append(tuple(lit for lit in clause if -lit not in assigned))
+    return residual, {abs(lit) for lit in assigned}
+
+
+def split_components(clauses: List[Clause]) -> List[Component]:
+    """Variable-disjoint connected components, each in canonical (sorted) form."""
+    parent: Dict[int, int] = {}
+
+    def find(var: int) -> int:
+        root = var
+        while parent[root] != root:
+            root = parent[root]
+        while parent[var] != root:
+            parent[var], var = root, parent[var]
+        return root
+
+    for clause in clauses:
+        first = abs(clause[0])
+        parent.setdefault(first, first)
+        for lit in clause[1:]:
+            var = abs(lit)
+            parent.setdefault(var, var)
+            a, b = find(first), find(var)
+            if a != b:
+                parent[b] = a
+    groups: Dict[int, List[Clause]] = {}
+    for clause in clauses:
+        groups.setdefault(find(abs(clause[0])), []).append(clause)
+    return [tuple(sorted(group)) for group in groups.values()]
+
+
+def component_variables(clauses) -> Set[int]:
+    return {abs(lit) for clause in clauses for lit in clause}
+
+
+class ModelCounter:
+
+    def __init__(self, max_cache_literals: int = 2_000_000):
+        self.max_cache_literals = max_cache_literals
+        self.cache: "OrderedDict[Component, int]" = OrderedDict()
+        self.cache_literals = 0
+        self.decisions = 0
+        self.cache_hits = 0
+
+    def _lookup(self, component: Component) -> Optional[int]:
+        count = self.cache.get(component)
+        if count is not None:
+            self.cache.move_to_end(component)
+            self.cache_hits += 1
+        return count
+
+    def _store(self, component: Component, count: int):
+        size = sum(len(clause) for clause in component)
+        if size > self.max_cache_literals:
+            return
+        self.cache[component] = count
+        self.cache_literals += size
+        while self.cache_literals > self.max_cache_literals:
+            evicted, _ = self.cache.popitem(last=False)
+            self.cache_literals -= sum(len(clause) for clause in evicted)
+
+    def _branch(self, clauses: Component, decision: Optional[int], variables: Set[int]):
+        """Count of one branch: propagate, then multiply the component counts."""
+        residual, assigned = propagate(clauses, decision)
+        if residual is None:
+            return 0
+        if any(not clause for clause in residual):
+            return 0
+        free = len(variables) - len(assigned) - len(component_variables(residual))
+        product = 1 << free
+        for component in split_components(residual):
+            product *= yield component
+            if product == 0:
+                break
+        return product
+
+    def _component(self, component: Component):
+        occurrences: Dict[int, int] = {}
+        for clause in component:
+            for lit in clause:
+                occurrences[abs(lit)] = occurrences.get(abs(lit), 0) + 1
+        var = max(occurrences, key=occurrences.get)
+        variables = set(occurrences)
+        self.decisions += 1
+        total = 0
+        for decision in (var, -var):
+            total += yield from self._branch(component, decision, variables)
+        return total
+
+    def count(self, n_vars: int, clauses: List[List[int]]) -> int:
+        normalized = []
+        for clause in clauses:
+            lits = tuple(sorted(set(clause)))
+            if any(-lit in lits for lit in lits):
+                continue
+            if not lits:
+                return 0
+            normalized.append(lits)
+        variables = set(range(1, n_vars + 1)) | component_variables(normalized)
+
+        # explicit stack of generators instead of recursion
+        stack = [(None, self._branch(tuple(normalized), None, variables))]
+        value = None
+        result = 0
+        while stack:
+            component, frame = stack[-1]
+            try:
+                child = frame.send(value)
+            except StopIteration as done:
+                stack.pop()
+                if component is not None:
+                    self._store(component, done.value)
+                else:
+                    result = done.value
+                value = done.value
+                continue
+            cached = self._lookup(child)
+            if cached is not None:
+                value = cached
+            else:
+                stack.append((child, self._component(child)))
+                value = None
+        return result
+
+
+def count_models(n_vars: int, clauses: List[List[int]], max_cache_literals: int = 2_000_000) -> int:
+    return ModelCounter(max_cache_literals).count(n_vars, clauses)
@@ -0,0 +1,172 @@
+"""
+Exact-fill subset search, sequential and spread over a process pool.
+
+SubsetSearch is the depth-first search behind binpacking_backtracing: items
+sorted descending, bisection past items too large for the remaining capacity,
+a break once the suffix sum cannot fill it, and the suffix reachability table
+(src/helpers/subset_sum_reach_LANK.py) guarding every child. When the
+capacity is too large for the table, its suffix-sum fallback cannot tell a
+dead child apart, so (index, remaining) states whose subtree produced no
+solution are kept in self.dead instead and skipped in O(1). A search can
+start from any subproblem
+
+    (start index, current sum, partial bin)
+
+meaning "partial bin plus any subset of items[start:] that completes it", and
+can be given a node budget. When the budget runs out, every frame still on
+the stack is handed back as such a subproblem: frame d with next index i and
+remaining r is exactly (i, C - r, first d items of the partial bin).
+
+iter_parallel_subsets:
+    1. expands the top of the include/exclude tree breadth-first until there
+       are a few subproblems per worker
+    2. keeps every worker of a ProcessPoolExecutor busy with subproblems,
+       each searched under the node budget
+    3. re-queues the subproblems a worker hands back, so long subtrees are
+       split further exactly when they would otherwise leave workers idle
+    4. yields each batch of solutions as it arrives
+
+The result is the same multiset of solutions as the sequential search, in a
+different order.
+"""
+
+import bisect
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterator, List, Optional, Tuple
+
+from src.helpers.subset_sum_reach_LANK import SubsetSumReach
+
+Task = Tuple[int, int, Tuple[int, ...]]   # (start index, current sum, partial bin, descending)
+
+# nodes a worker searches before handing the rest of its subtree back
+TASK_NODE_BUDGET = 20000
+# subproblems per worker produced by the initial expansion
+TASKS_PER_WORKER = 4
+
+
+class SubsetSearch:
+
+    def __init__(self, bin_capacity: int, items: List[int]):
+        self.bin_capacity = bin_capacity
+        self.items = sorted(items, reverse=True)
+        self.negated = [-item for item in self.items]   # ascending, for bisect
+        n = len(self.items)
+        self.suffix = [0] * (n + 1)
+        for i in range(n - 1, -1, -1):
+            self.suffix[i] = self.suffix[i + 1] + self.items[i]
+        self.table = SubsetSumReach(bin_capacity, self.items)
+        # (index, remaining) states with no solution below them, only needed
+        # without the exact table (with it, every child entered has one)
+        self.dead = None if self.table.exact else set()
+        self.leftover: List[Task] = []
+
+    def viable(self, task: Task) -> bool:
+        start, current_sum, _ = task
+        remaining = self.bin_capacity - current_sum
+        return remaining == 0 or (start < len(self.items) and self.table.can_reach(start, remaining))
+
+    def run(self, task: Task = (0, 0, ()), budget: Optional[int] = None) -> Iterator[List[int]]:
+        """
+        Yields the solutions (ascending) below task. With a budget, stops
+        after that many nodes and leaves the unexplored part in self.leftover.
+        """
+        items, negated, suffix, table, dead = self.items, self.negated, self.suffix, self.table, self.dead
+        n = len(items)
+        start, current_sum, partial = task
+        self.leftover = []
+        remaining = self.bin_capacity - current_sum
+        if remaining == 0:
+            yield list(reversed(partial))
+            return
+        if not self.viable(task):
+            return
+        base = len(partial)
+        current_bin = list(partial)
+        # [remaining, next index, first index, found a solution below]
+        frames = [[remaining, bisect.bisect_left(negated, -remaining, start), start, False]]
+        nodes = 0
+        while frames:
+            if budget is not None and nodes >= budget:
+                for depth, (remaining, i, _, _) in enumerate(frames):
+                    leftover = (i, self.bin_capacity - remaining, tuple(current_bin[:base + depth]))
+                    if self.viable(leftover):
+                        self.leftover.append(leftover)
+                return
+            frame = frames[-1]
+            remaining, i = frame[0], frame[1]
+            if i < n and suffix[i] >= remaining:
+                frame[1] = i + 1
+                rest = remaining - items[i]
+                if rest == 0:
+                    nodes += 1
+                    frame[3] = True
+                    current_bin.append(items[i])
+                    yield current_bin[::-1]
+                    current_bin.pop()
+                elif table.can_reach(i + 1, rest) and (dead is None or (i + 1, rest) not in dead):
+                    nodes += 1
+                    current_bin.append(items[i])
+                    frames.append([rest, bisect.bisect_left(negated, -rest, i + 1), i + 1, False])
+                continue
+            frames.pop()
+            if dead is not None and not frame[3]:
+                dead.add((frame[2], remaining))
+            if frames:
+                frames[-1][3] |= frame[3]
+                current_bin.pop()
+
+    def expand(self, tasks: List[Task], target: int) -> Tuple[List[Task], List[List[int]]]:
+        """
+        Splits subproblems on include/exclude of their next item, breadth
+        first, until there are at least target of them. Returns (subproblems,
+        solutions completed along the way).
+        """
+        queue = deque(tasks)
+        solutions = []
+        while queue and len(queue) < target:
+            start, current_sum, partial = queue.popleft()
+            if current_sum == self.bin_capacity:
+                solutions.append(list(reversed(partial)))
+                continue
+            item = self.items[start]
+            for child in ((start + 1, current_sum + item, partial + (item,)), (start + 1, current_sum, partial)):
+                if child[1] <= self.bin_capacity and self.viable(child):
+                    queue.append(child)
+        return list(queue), solutions
+
+
+_worker_search: Optional[SubsetSearch] = None
+
+
+def _init_worker(bin_capacity: int, items: List[int]):
+    global _worker_search
+    _worker_search = SubsetSearch(bin_capacity, items)
+
+
+def _run_task(task: Task, budget: int) -> Tuple[List[List[int]], List[Task]]:
+    solutions = list(_worker_search.run(task, budget))
+    return solutions, _worker_search.leftover
+
+
+def iter_parallel_subsets(bin_capacity: int, items: List[int], processes: Optional[int] = None,
+                          budget: int = TASK_NODE_BUDGET) -> Iterator[List[int]]:
+    processes = processes or os.cpu_count() or 1
+    search = SubsetSearch(bin_capacity, items)
+    if not search.viable((0, 0, ())):
+        return
+    pending, solutions = search.expand([(0, 0, ())], processes * TASKS_PER_WORKER)
+    yield from solutions
+    pending = deque(pending)
+    with ProcessPoolExecutor(processes, initializer=_init_worker,
+                             initargs=(bin_capacity, search.items)) as pool:
+        running = set()
+        while pending or running:
+            while pending and len(running) < 2 * processes:
+                running.add(pool.submit(_run_task, pending.popleft(), budget))
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                solutions, leftover = future.result()
+                pending.extend(leftover)
+                yield from solutions
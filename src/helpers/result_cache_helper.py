@@ -0,0 +1,80 @@
+"""
+Persistent, content-addressed cache of SAT results.
+
+Instances are keyed by a SHA-256 hash of their canonical form: literals sorted
+and de-duplicated inside each clause, clauses sorted and de-duplicated, plus
+n_vars. Two instances that only differ in clause order or repeated literals
+therefore share one entry.
+
+Entries (verdict + model) live in a small SQLite file and are evicted least
+recently used first once the cache holds more than max_entries results.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+def canonical_cnf(clauses: List[List[int]]) -> List[Tuple[int, ...]]:
+    return sorted({tuple(sorted(set(clause))) for clause in clauses})
+
+
+def cnf_key(n_vars: int, clauses: List[List[int]]) -> str:
+    digest = hashlib.sha256(f"p {n_vars}\n".encode())
+    for clause in canonical_cnf(clauses):
+        digest.update((" ".join(map(str, clause)) + "\n").encode())
+    return digest.hexdigest()
+
+
+class SatResultCache:
+
+    def __init__(self, path: str, max_entries: int = 10000):
+        self.path = path
+        self.max_entries = max_entries
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY, n_vars INTEGER, satisfiable INTEGER,"
+            " true_vars TEXT, last_used REAL)")
+        self.connection.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Tuple[bool, Dict[int, bool]]]:
+        row = self.connection.execute(
+            "SELECT n_vars, satisfiable, true_vars FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.connection.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+        self.connection.commit()
+        n_vars, satisfiable, true_vars = row
+        if not satisfiable:
+            return False, {}
+        true_set = set(json.loads(true_vars))
+        return True, {var: var in true_set for var in range(1, n_vars + 1)}
+
+    def put(self, key: str, n_vars: int, satisfiable: bool, assignment: Dict[int, bool]):
+        true_vars = json.dumps(sorted(var for var, value in assignment.items() if value))
+        self.connection.execute(
+            "INSERT OR REPLACE INTO results (key, n_vars, satisfiable, true_vars, last_used)"
+            " VALUES (?, ?, ?, ?, ?)", (key, n_vars, int(satisfiable), true_vars, time.time()))
+        excess = self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0] - self.max_entries
+        if excess > 0:
+            self.connection.execute(
+                "DELETE FROM results WHERE key IN"
+                " (SELECT key FROM results ORDER BY last_used ASC LIMIT ?)", (excess,))
+        self.connection.commit()
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self):
+        self.connection.close()
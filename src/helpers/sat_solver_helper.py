@@ -1,21 +1,71 @@
 from abc import ABC, abstractmethod
 import os
 from src.helpers.dmaics_parser import parse_multi_instance_dimacs
+from src.helpers.clause_store import ClauseStore
+from src.helpers.cnf_preprocess_helper import PreprocessResult, preprocess_cnf
+from src.helpers.symmetry_helper import break_symmetries
+from src.helpers.incremental_sat_helper import SharedPrefixSession, group_shared_prefix
+from src.helpers.cdcl_helper import solve_cdcl
+from src.helpers.result_cache_helper import SatResultCache, cnf_key
 from src.helpers.constants import RESULTS_FOLDER, CONFIGURATION_FILE_PATH
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Optional
 import json
 import csv
 import time
+import functools
+import multiprocessing
+import queue
 from src.helpers.project_selection_enum import ProjectSelection, SubProblemSelection
 
 
+def portfolio_worker(results, solver, label: str, method_name: Optional[str], params: Dict[str, Any],
+                     n_vars: int, clauses: Any, prep: Optional[PreprocessResult]):
+    """Body of one portfolio process: solve and report (label, ok, assignment, seconds)."""
+    t0 = time.perf_counter()
+    try:
+        method = getattr(solver, method_name) if method_name else functools.partial(solve_cdcl, **params)
+        ok, assignment = solver.solve_instance(method, n_vars, clauses, prep)
+    except Exception:
+        # a stub or crashing method simply drops out of the race
+        ok, assignment = None, {}
+    results.put((label, ok, assignment, time.perf_counter() - t0))
+
+
 class SatSolverAbstractClass(ABC):
 
     def __init__(self, 
                     cnf_file_input_path: str,
                     result_file_name:str = "sat_solver_results",
-                    results_folder_path: str = RESULTS_FOLDER):
+                    results_folder_path: str = RESULTS_FOLDER,
+                    compact: bool = False,
+                    preprocess: bool = True,
+                    incremental: bool = True,
+                    portfolio: bool = False,
+                    portfolio_variants: int = 2,
+                    portfolio_timeout: Optional[float] = None,
+                    cache_path: Optional[str] = None,
+                    cache_max_entries: int = 10000,
+                    local_search_options: Optional[Dict[str, Any]] = None,
+                    count_models: bool = False,
+                    model_count_cache_literals: int = 2_000_000,
+                    symmetry_breaking: bool = False,
+                    symmetry_max_nodes: int = 20000):
         self.cnf_file_input_path = cnf_file_input_path
+        self.compact = compact
+        self.preprocess = preprocess
+        self.incremental = incremental
+        self.portfolio = portfolio
+        self.portfolio_variants = portfolio_variants
+        self.portfolio_timeout = portfolio_timeout
+        self.cache = SatResultCache(cache_path, cache_max_entries) if cache_path else None
+        # keyword arguments for LocalSearchSolver (noise, max_flips, max_tries, seed, ...)
+        self.local_search_options = dict(local_search_options or {})
+        # adds a model_count column (see sat_model_count) to every results CSV
+        self.count_models = count_models
+        self.model_count_cache_literals = model_count_cache_literals
+        # lex-leader symmetry-breaking clauses added during preprocessing
+        self.symmetry_breaking = symmetry_breaking
+        self.symmetry_max_nodes = symmetry_max_nodes
         self.results_folder_path = results_folder_path
         self.result_file_name = result_file_name
         self.config_path = CONFIGURATION_FILE_PATH
@@ -44,9 +94,9 @@ class SatSolverAbstractClass(ABC):
         return sub_probs
         
     def parse_input_file(self):
-        return parse_multi_instance_dimacs(self.cnf_file_input_path)
+        return parse_multi_instance_dimacs(self.cnf_file_input_path, compact=self.compact)
     
-    def save_results(self, run_results: List[Any], sub_problem):
+    def save_results(self, run_results: List[Any], sub_problem, extra_columns: Optional[List[str]] = None):
         # Write to CSV
         dir_name, file_name = os.path.split(self.cnf_file_input_path)
         file_name_only, ext = os.path.splitext(file_name)
@@ -54,7 +104,7 @@ class SatSolverAbstractClass(ABC):
         with open(temp_result, "w", newline="") as f:
             w = csv.writer(f)
             w.writerow(["instance_id", "n_vars", "n_clauses", "method",
-                        "satisfiable", "time_seconds", "solution"])
+                        "satisfiable", "time_seconds", "solution"] + (extra_columns or []))
             w.writerows(run_results)
         print(f"\nResults written to {temp_result}")
     
@@ -67,88 +117,217 @@ class SatSolverAbstractClass(ABC):
         pass
 
     @abstractmethod
-    def sat_simple(self, n_vars:int, clauses:List[List[int]]) -> Tuple[bool, Dict[int, bool]]:
+    def sat_simple(self, n_vars:int, clauses:List[List[int]]) -> Tuple[Optional[bool], Dict[int, bool]]:
         pass
 
     @abstractmethod
     def sat_bestcase(self, n_vars:int, clauses:List[List[int]]) -> Tuple[bool, Dict[int, bool]]:
         pass
 
-    def run(self):
-        results = []
-        
-        for inst_id, n_vars, clauses in self.solution_instances:
-
-            if SubProblemSelection.brute_force in self.sub_problems:
-                t0 = time.perf_counter()
-                bt_ok, bt_assign = self.sat_bruteforce(n_vars, clauses)
-                bt_time = time.perf_counter() - t0
-                results.append([inst_id, n_vars, len(clauses),
-                                 "BruteForce",
-                            "S" if bt_ok else "U", 
-                            bt_time,
-                            str(bt_assign)])
-        
-        if SubProblemSelection.brute_force in self.sub_problems:
-            self.save_results(results, SubProblemSelection.brute_force.name)
-            results = []
+    @abstractmethod
+    def sat_model_count(self, n_vars:int, clauses:List[List[int]]) -> int:
+        pass
 
+    def model_counts(self) -> List[Optional[int]]:
+        """
+        Number of satisfying assignments of every instance (None entries when
+        counting is off). Counted on the original clauses, since preprocessing
+        does not preserve the count.
+        """
+        if not self.count_models:
+            return [None] * len(self.solution_instances)
+        counts = []
         for inst_id, n_vars, clauses in self.solution_instances:
+            t0 = time.perf_counter()
+            counts.append(self.sat_model_count(n_vars, clauses))
+            print(f"Instance {inst_id}: {counts[-1]} models counted in {time.perf_counter() - t0:.6f}s")
+        return counts
 
-            if SubProblemSelection.btracking in self.sub_problems:
-                t0 = time.perf_counter()
-                bt_ok, bt_assign = self.sat_backtracking(n_vars, clauses)
-                bt_time = time.perf_counter() - t0
-                results.append([inst_id, n_vars, len(clauses),
-                            "BackTracking",
-                            "S" if bt_ok else "U", 
-                            bt_time,
-                            str(bt_assign)])
-        
-        if SubProblemSelection.btracking in self.sub_problems:
-            self.save_results(results, SubProblemSelection.btracking.name)
-            results = []
-
+    def preprocess_instances(self) -> List[Tuple[str, int, Any, PreprocessResult]]:
+        """
+        Runs the CNF preprocessing once per instance, before any sat_* method.
+        Returns (instance_id, n_vars, original clauses, PreprocessResult) tuples.
+        """
+        prepared = []
         for inst_id, n_vars, clauses in self.solution_instances:
+            t0 = time.perf_counter()
+            prep = preprocess_cnf(n_vars, list(clauses))
+            prep_time = time.perf_counter() - t0
+            print(f"Instance {inst_id}: preprocessing {prep.summary()} in {prep_time:.6f}s")
+            if self.symmetry_breaking and not prep.unsat:
+                symmetry = break_symmetries(n_vars, prep.clauses, self.symmetry_max_nodes)
+                prep.clauses = prep.clauses + symmetry.clauses
+                prep.stats["symmetry_generators"] = len(symmetry.generators)
+                print(f"Instance {inst_id}: symmetry breaking {symmetry.summary()}")
+            if self.compact and not prep.unsat:
+                prep.clauses = ClauseStore.from_lists(n_vars, prep.clauses)
+            prepared.append((inst_id, n_vars, clauses, prep))
+        return prepared
 
-            if SubProblemSelection.simple in self.sub_problems:
-                t0 = time.perf_counter()
-                bt_ok, bt_assign = self.sat_simple(n_vars, clauses)
-                bt_time = time.perf_counter() - t0
-                results.append([inst_id, n_vars, len(clauses), 
-                                "Simple",
-                            "S" if bt_ok else "U", 
-                            bt_time, 
-                            str(bt_assign)])
-        
-        if SubProblemSelection.simple in self.sub_problems:
-            self.save_results(results, SubProblemSelection.simple.name)
-            results = []
-        
+    def solve_instance(self, method, n_vars: int, clauses: Any, prep: Optional[PreprocessResult]) -> Tuple[bool, Dict[int, bool]]:
+        """Calls one sat_* method on the simplified formula and maps the model back."""
+        if prep is None:
+            return method(n_vars, clauses)
+        if prep.unsat:
+            return False, {}
+        ok, assignment = method(n_vars, prep.clauses)
+        if not ok:
+            return ok, assignment
+        return ok, prep.extend_model(assignment)
 
-        for inst_id, n_vars, clauses in self.solution_instances:
+    def incremental_sessions(self) -> Dict[int, SharedPrefixSession]:
+        """
+        Maps the index of every instance that shares a clause prefix with its
+        neighbours to one SharedPrefixSession per group.
+        """
+        sessions = {}
+        for members, prefix_length in group_shared_prefix(self.solution_instances):
+            first = self.solution_instances[members[0]][2]
+            top = max(max((abs(lit) for clause in self.solution_instances[i][2] for lit in clause), default=0)
+                      for i in members)
+            n_vars = max([top] + [self.solution_instances[i][1] for i in members])
+            session = SharedPrefixSession(list(first)[:prefix_length], n_vars)
+            print(f"Instances {[self.solution_instances[i][0] for i in members]} share "
+                  f"{prefix_length} clauses: solved in one incremental session")
+            for i in members:
+                sessions[i] = session
+        return sessions
 
-            if SubProblemSelection.best_case in self.sub_problems:
-                t0 = time.perf_counter()
-                bt_ok, bt_assign = self.sat_bestcase(n_vars, clauses)
-                bt_time = time.perf_counter() - t0
-                results.append([inst_id, n_vars, len(clauses), 
-                                "BestCase",
-                            "S" if bt_ok else "U", 
-                            bt_time, 
-                            str(bt_assign)])
-        
-        if SubProblemSelection.best_case in self.sub_problems:
-            self.save_results(results, SubProblemSelection.best_case.name)
-            results = []
+    def portfolio_entries(self) -> List[Tuple[str, Optional[str], Dict[str, Any]]]:
+        """
+        (label, sat_* method name or None, CDCL parameters) for every racer:
+        the configured methods plus seeded / re-parameterized CDCL variants.
+        """
+        names = {SubProblemSelection.brute_force: ("BruteForce", "sat_bruteforce"),
+                 SubProblemSelection.btracking: ("BackTracking", "sat_backtracking"),
+                 SubProblemSelection.simple: ("Simple", "sat_simple"),
+                 SubProblemSelection.best_case: ("BestCase", "sat_bestcase")}
+        entries = [(names[sub_problem][0], names[sub_problem][1], {}) for sub_problem in self.sub_problems]
+        restart_bases = [50, 300, 100, 1000]
+        for i in range(self.portfolio_variants):
+            params = {"seed": i + 1, "restart_base": restart_bases[i % len(restart_bases)]}
+            entries.append((f"CDCL[seed={params['seed']},restart={params['restart_base']}]", None, params))
+        return entries
 
+    def race_instance(self, n_vars: int, clauses: Any, prep: Optional[PreprocessResult]) -> Tuple[Optional[bool], Dict[int, bool], str, float]:
+        """
+        Starts every portfolio entry in its own process and returns
+        (satisfiable, assignment, winner label, winner's own solve time) for the
+        first definitive answer. The other processes are terminated.
+        """
+        if prep is not None and prep.unsat:
+            return False, {}, "Preprocessing", 0.0
+        ctx = multiprocessing.get_context()
+        results = ctx.Queue()
+        processes = []
+        for label, method_name, params in self.portfolio_entries():
+            process = ctx.Process(target=portfolio_worker, daemon=True,
+                                  args=(results, self, label, method_name, params, n_vars, clauses, prep))
+            process.start()
+            processes.append(process)
 
+        answer = (None, {}, "none", 0.0)
+        pending = len(processes)
+        deadline = None if self.portfolio_timeout is None else time.perf_counter() + self.portfolio_timeout
+        while pending:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            try:
+                label, ok, assignment, elapsed = results.get(timeout=0.05)
+            except queue.Empty:
+                if not any(process.is_alive() for process in processes) and results.empty():
+                    break  # every racer died without reporting
+                continue
+            pending -= 1
+            if ok is not None:
+                answer = (ok, assignment, label, elapsed)
+                break
 
-        
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+        results.close()
+        return answer
 
+    def instance_keys(self, instances) -> List[Optional[str]]:
+        """Canonical cache key of every instance (None entries when caching is off)."""
+        if self.cache is None:
+            return [None] * len(instances)
+        return [cnf_key(n_vars, clauses) for _, n_vars, clauses, _ in instances]
 
-    
-    
+    def run_portfolio(self):
+        if self.preprocess:
+            instances = self.preprocess_instances()
+        else:
+            instances = [(inst_id, n_vars, clauses, None) for inst_id, n_vars, clauses in self.solution_instances]
+        keys = self.instance_keys(instances)
+        counts = self.model_counts()
+        results = []
+        for (inst_id, n_vars, clauses, prep), key, count in zip(instances, keys, counts):
+            t0 = time.perf_counter()
+            cached = self.cache.get(key) if key else None
+            if cached is not None:
+                (bt_ok, bt_assign), winner, winner_time = cached, "Cache", 0.0
+            else:
+                bt_ok, bt_assign, winner, winner_time = self.race_instance(n_vars, clauses, prep)
+            bt_time = time.perf_counter() - t0
+            if key and cached is None and bt_ok is not None:
+                self.cache.put(key, n_vars, bt_ok, bt_assign)
+            print(f"Instance {inst_id}: {winner} won in {winner_time:.6f}s (wall {bt_time:.6f}s)")
+            results.append([inst_id, n_vars, len(clauses),
+                        "Portfolio",
+                        "?" if bt_ok is None else ("S" if bt_ok else "U"),
+                        bt_time,
+                        str(bt_assign),
+                        winner,
+                        winner_time] + ([cached is not None] if self.cache is not None else [])
+                           + ([count] if self.count_models else []))
+        self.save_results(results, "portfolio", extra_columns=["winner", "winner_time_seconds"]
+                          + (["cached"] if self.cache is not None else [])
+                          + (["model_count"] if self.count_models else []))
+
+    def run(self):
+        if self.portfolio:
+            self.run_portfolio()
+            return
+        if self.preprocess:
+            instances = self.preprocess_instances()
+        else:
+            instances = [(inst_id, n_vars, clauses, None) for inst_id, n_vars, clauses in self.solution_instances]
 
+        methods = [(SubProblemSelection.brute_force, "BruteForce", self.sat_bruteforce),
+                   (SubProblemSelection.btracking, "BackTracking", self.sat_backtracking),
+                   (SubProblemSelection.simple, "Simple", self.sat_simple),
+                   (SubProblemSelection.best_case, "BestCase", self.sat_bestcase)]
+        keys = self.instance_keys(instances)
+        counts = self.model_counts()
+        extra_columns = (["cached"] if self.cache is not None else []) + (["model_count"] if self.count_models else [])
 
-    
\ No newline at end of file
+        for sub_problem, method_name, method in methods:
+            if sub_problem not in self.sub_problems:
+                continue
+            sessions = {}
+            if self.incremental and sub_problem == SubProblemSelection.best_case:
+                sessions = self.incremental_sessions()
+            results = []
+            for index, (inst_id, n_vars, clauses, prep) in enumerate(instances):
+                t0 = time.perf_counter()
+                cached = self.cache.get(keys[index]) if keys[index] else None
+                if cached is not None:
+                    bt_ok, bt_assign = cached
+                elif index in sessions:
+                    # original clauses: preprocessing would break the shared prefix
+                    bt_ok, bt_assign = sessions[index].solve(n_vars, clauses)
+                else:
+                    bt_ok, bt_assign = self.solve_instance(method, n_vars, clauses, prep)
+                bt_time = time.perf_counter() - t0
+                if keys[index] and cached is None and bt_ok is not None:
+                    self.cache.put(keys[index], n_vars, bt_ok, bt_assign)
+                results.append([inst_id, n_vars, len(clauses),
+                            method_name,
+                            "?" if bt_ok is None else ("S" if bt_ok else "U"),
+                            bt_time,
+                            str(bt_assign)] + ([cached is not None] if self.cache is not None else [])
+                               + ([counts[index]] if self.count_models else []))
+            self.save_results(results, sub_problem.name, extra_columns=extra_columns)
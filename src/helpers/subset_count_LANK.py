@@ -0,0 +1,81 @@
+"""
+Count-only and top-K answers for the exact-fill subset problem, without
+enumerating everything.
+
+count_subsets: the usual 0/1 knapsack counting DP over one row of
+bin_capacity + 1 Python ints (so counts never overflow),
+
+    ways[s] += ways[s - item]   for s from C down to item, for every item
+
+O(n * C) additions; copies of the same size count as distinct items, like
+binpacking_backtracing.
+
+iter_lex_subsets: the solutions in lexicographic order of their ascending
+item lists. Items are sorted ascending and a node always tries the smallest
+next size first, taking only the first unused copy of each size; a list that
+stands for several index-level subsets is repeated that many times (the
+product of C(copies, taken)). The suffix reachability table (the boolean
+version of the same DP, src/helpers/subset_sum_reach_LANK.py) is consulted
+before every step, so the walk never enters a dead branch and the first K
+solutions cost O(K * n) steps (for capacities too large to build the table
+it only has the suffix-sum test, and dead branches cost their own steps).
+Take K of them with itertools.islice.
+"""
+
+import bisect
+import math
+from collections import Counter
+from typing import Iterator, List
+
+from src.helpers.subset_sum_reach_LANK import SubsetSumReach
+
+
+def count_subsets(bin_capacity: int, items: List[int]) -> int:
+    if bin_capacity < 0:
+        return 0
+    ways = [0] * (bin_capacity + 1)
+    ways[0] = 1
+    for item in items:
+        for s in range(bin_capacity, item - 1, -1):
+            if ways[s - item]:
+                ways[s] += ways[s - item]
+    return ways[bin_capacity]
+
+
+def iter_lex_subsets(bin_capacity: int, items: List[int]) -> Iterator[List[int]]:
+    items = sorted(items)
+    copies = Counter(items)
+    table = SubsetSumReach(bin_capacity, items)
+    if bin_capacity == 0:
+        yield []
+        return
+    if not table.feasible():
+        return
+    current_bin: List[int] = []
+    frames = [[bin_capacity, 0, 0]]   # remaining, next index, first index of the frame
+    while frames:
+        frame = frames[-1]
+        remaining, i, first = frame
+        end = bisect.bisect_right(items, remaining, i)
+        while i < end:
+            rest = remaining - items[i]
+            # only the first unused copy of a size: later copies repeat its lists
+            if (i == first or items[i] != items[i - 1]) and (rest == 0 or table.can_reach(i + 1, rest)):
+                break
+            i += 1
+        if i == end:
+            frames.pop()
+            if frames:
+                current_bin.pop()
+            continue
+        frame[1] = i + 1
+        current_bin.append(items[i])
+        if rest == 0:
+            n = 1
+            for size, taken in Counter(current_bin).items():
+                n *= math.comb(copies[size], taken)
+            for _ in range(n):
+                yield list(current_bin)
+            current_bin.pop()
+        else:
+            frames.append([rest, i + 1, i + 1])
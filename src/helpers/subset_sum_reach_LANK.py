@@ -0,0 +1,81 @@
+"""
+Suffix subset-sum reachability for the bin-packing searches.
+
+reach[i] is a Python big int whose bit s is set when some subset of
+items[i:] sums to exactly s (bits above bin_capacity are masked off).
+It is built back to front with one shift-or per item:
+
+    reach[n] = 1                          (the empty subset)
+    reach[i] = reach[i + 1] | (reach[i + 1] << items[i])
+
+i.e. O(n * C / 64) machine-word operations in total. A search node that has
+placed items[:i] and still needs `remaining` can be cut unless bit remaining
+of reach[i] is set, and bit C of reach[0] answers the yes/no question "does
+any subset fill the bin exactly" without any search.
+
+The table is built for the items in the order the search uses them.
+
+The table costs (n + 1) * (C + 1) bits, so it is only built while that stays
+within REACH_MAX_BITS. Past that (a few dozen items with a capacity in the
+hundreds of millions is already gigabytes), can_reach falls back to the
+suffix-sum test remaining <= sum(items[start:]), which never cuts a branch
+that could succeed, and the searches simply prune less.
+"""
+
+from typing import List
+
+# largest (n + 1) * (C + 1) for which the table is built (16 MiB of bits)
+REACH_MAX_BITS = 1 << 27
+
+
+def reach_table_fits(bin_capacity: int, n_items: int) -> bool:
+    return (n_items + 1) * (bin_capacity + 1) <= REACH_MAX_BITS
+
+
+class SubsetSumReach:
+
+    def __init__(self, bin_capacity: int, items: List[int]):
+        self.bin_capacity = bin_capacity
+        self.items = items
+        self.exact = reach_table_fits(bin_capacity, len(items))
+        if not self.exact:
+            self.reach = None
+            self.suffix = [0] * (len(items) + 1)
+            for i in range(len(items) - 1, -1, -1):
+                self.suffix[i] = self.suffix[i + 1] + items[i]
+            return
+        mask = (1 << (bin_capacity + 1)) - 1 if bin_capacity >= 0 else 0
+        self.reach = [0] * (len(items) + 1)
+        bits = 1 & mask
+        self.reach[len(items)] = bits
+        for i in range(len(items) - 1, -1, -1):
+            bits = (bits | (bits << items[i])) & mask
+            self.reach[i] = bits
+
+    def can_reach(self, start: int, remaining: int) -> bool:
+        """
+        Whether items[start:] has a subset summing to exactly remaining. Without
+        the table (see self.exact) only False is certain.
+        """
+        if not self.exact:
+            return 0 <= remaining <= self.suffix[start]
+        return remaining >= 0 and (self.reach[start] >> remaining) & 1 == 1
+
+    def feasible(self) -> bool:
+        return self.can_reach(0, self.bin_capacity)
+
+
+def subset_sum_feasible(bin_capacity: int, items: List[int]) -> bool:
+    """
+    Bit C of reach[0] alone: one rolling big int of C + 1 bits instead of the
+    whole table, O(n * C / 64) word operations.
+    """
+    if bin_capacity < 0:
+        return False
+    mask = (1 << (bin_capacity + 1)) - 1
+    bits = 1
+    for item in items:
+        bits = (bits | (bits << item)) & mask
+        if bits >> bin_capacity & 1:
+            return True
+    return bits >> bin_capacity & 1 == 1
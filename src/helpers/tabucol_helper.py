@@ -0,0 +1,158 @@
+"""
+Tabucol local search (Hertz-de Werra, with the Galinier-Hao tenure), used by
+GraphColoring.coloring_simple for graphs too large for the exact methods.
+
+The state is a complete assignment of colors 0..k-1, possibly with
+conflicts. gamma is an n x k NumPy matrix: gamma[v, c] is the number of
+neighbours of v colored c, so moving v from its color a to c changes the
+number of conflicting edges by
+
+    delta = gamma[v, c] - gamma[v, a]
+
+and the move itself updates gamma in O(degree): column a of v's neighbours
+goes down by one and column c up by one. The vertices with at least one
+conflict are kept in a set that only v and its neighbours can leave or join.
+
+Each iteration takes the best move of a conflicting vertex to another
+color, over all those vertices at once with one vectorized pass over their
+gamma rows (ties broken at random). A move back to a color a vertex has just
+left is tabu for L + 0.6 * conflicts iterations (L uniform in 0..9), unless
+it would beat the best conflict count seen so far (aspiration).
+
+If every move is tabu and none qualifies for aspiration, the move whose
+tabu status expires first is taken, so no iteration passes without a move.
+
+The start is greedy DSATUR, with vertices colored k or above moved to their
+least conflicting color below k. Local search never proves that no coloring
+exists: when the iteration budget runs out without a proper coloring the
+answer is unknown (None), not NO. k <= 2 is decided exactly before any
+search: one color works only without edges, and two colors work exactly
+when a traversal can 2-color the graph (it is bipartite).
+"""
+
+import random
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from src.helpers.dsatur_helper import greedy_dsatur_lists
+
+TABU_ITERATIONS = 100_000
+
+
+class Tabucol:
+
+    def __init__(self, n_vertices: int, edges: List[Tuple[int, int]], k: int,
+                 max_iterations: int = TABU_ITERATIONS, seed: int = 0):
+        self.n = n_vertices
+        self.k = k
+        self.max_iterations = max_iterations
+        self.rng = random.Random(seed)
+        neighbours = [set() for _ in range(n_vertices)]
+        for u, v in edges:
+            if u != v:
+                neighbours[u].add(v)
+                neighbours[v].add(u)
+        self.neighbours = [sorted(ns) for ns in neighbours]
+        self.arrays = [np.array(ns, dtype=np.int64) for ns in self.neighbours]
+        self.iterations = 0
+
+    def initial_coloring(self) -> np.ndarray:
+        colors = greedy_dsatur_lists(self.neighbours)
+        for v in range(self.n):
+            if colors[v] >= self.k:
+                clash = [0] * self.k
+                for u in self.neighbours[v]:
+                    if colors[u] < self.k:
+                        clash[colors[u]] += 1
+                colors[v] = min(range(self.k), key=clash.__getitem__)
+        return np.array(colors, dtype=np.int64)
+
+    def solve(self) -> Optional[List[int]]:
+        """A proper k-coloring, or None if none was found within the budget."""
+        n, k, neighbours, arrays, rng = self.n, self.k, self.neighbours, self.arrays, self.rng
+        if n == 0:
+            return []
+        colors = self.initial_coloring()
+        gamma = np.zeros((n, k), dtype=np.int64)
+        for v in range(n):
+            if len(arrays[v]):
+                np.add.at(gamma[v], colors[arrays[v]], 1)
+        conflicts = int(gamma[np.arange(n), colors].sum()) // 2
+        conflicting = {v for v in range(n) if gamma[v, colors[v]]}
+        if k < 2:
+            return colors.tolist() if conflicts == 0 else None    # no other color to move to
+        tabu_until = np.zeros((n, k), dtype=np.int64)
+        best = conflicts
+        iteration = 0
+        while conflicts and iteration < self.max_iterations:
+            iteration += 1
+            vertices = np.fromiter(conflicting, dtype=np.int64, count=len(conflicting))
+            rows = gamma[vertices]
+            current = colors[vertices]
+            delta = rows - rows[np.arange(len(vertices)), current][:, None]
+            allowed = (tabu_until[vertices] < iteration) | (conflicts + delta < best)
+            allowed[np.arange(len(vertices)), current] = False
+            if not allowed.any():
+                # every move is tabu: take the ones whose tenure ends first
+                expiry = tabu_until[vertices]
+                expiry[np.arange(len(vertices)), current] = np.iinfo(np.int64).max
+                allowed = expiry == expiry.min()
+            delta = np.where(allowed, delta, np.iinfo(np.int64).max)
+            choices = np.flatnonzero(delta == delta.min())
+            choice = int(choices[rng.randrange(len(choices))])
+            v, c = int(vertices[choice // k]), choice % k
+            old = int(colors[v])
+            conflicts += int(delta.flat[choice])
+            colors[v] = c
+            if neighbours[v]:
+                gamma[arrays[v], old] -= 1
+                gamma[arrays[v], c] += 1
+            tabu_until[v, old] = iteration + rng.randint(0, 9) + int(0.6 * conflicts)
+            for w in [v] + neighbours[v]:
+                if gamma[w, colors[w]]:
+                    conflicting.add(w)
+                else:
+                    conflicting.discard(w)
+            best = min(best, conflicts)
+        self.iterations = iteration
+        return colors.tolist() if conflicts == 0 else None
+
+
+def two_coloring(n_vertices: int, edges: List[Tuple[int, int]]) -> Optional[List[int]]:
+    """A proper 2-coloring by graph traversal, or None if the graph is not bipartite."""
+    neighbours = [[] for _ in range(n_vertices)]
+    for u, v in edges:
+        neighbours[u].append(v)
+        neighbours[v].append(u)
+    colors = [-1] * n_vertices
+    for start in range(n_vertices):
+        if colors[start] != -1:
+            continue
+        colors[start] = 0
+        stack = [start]
+        while stack:
+            v = stack.pop()
+            for u in neighbours[v]:
+                if colors[u] == -1:
+                    colors[u] = 1 - colors[v]
+                    stack.append(u)
+                elif colors[u] == colors[v]:
+                    return None
+    return colors
+
+
+def tabucol_coloring(n_vertices: int, edges: List[Tuple[int, int]], k: int,
+                     max_iterations: int = TABU_ITERATIONS) -> Tuple[Optional[bool], List[int]]:
+    """(True, coloring), (False, []) when k <= 2 or a self-loop decides it, or (None, []) for unknown."""
+    if n_vertices == 0:
+        return True, []
+    if k <= 0 or any(u == v for u, v in edges):
+        return False, []
+    if k == 1:
+        return (False, []) if edges else (True, [0] * n_vertices)
+    if k == 2:
+        colors = two_coloring(n_vertices, edges)
+        return (True, colors) if colors is not None else (False, [])
+    colors = Tabucol(n_vertices, edges, k, max_iterations).solve()
+    return (True, colors) if colors is not None else (None, [])
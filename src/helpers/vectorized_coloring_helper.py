@@ -0,0 +1,71 @@
+"""
+Brute-force k-coloring that tests blocks of candidate colorings with NumPy,
+used by GraphColoring.coloring_bruteforce.
+
+The k^n assignments are walked in the order of itertools.product(range(k),
+repeat=n), vertex n - 1 being the fastest digit. The last L vertices vary
+inside a block: the k^L rows of a base-k counter matrix built once, with L
+as large as BLOCK_CELLS allows. The first n - L vertices are one fixed tuple
+per block, stepped in the same order in Python. Colors are int8 cells
+whenever k allows. A block is then checked in one pass over the two int32
+endpoint arrays of the edge list,
+
+    conflict = (block[:, u] == block[:, v]).any(axis=1)
+
+and the first row without a conflict is the answer. A block whose fixed
+vertices already clash on an edge is skipped without building it.
+"""
+
+import itertools
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# upper bound on rows * max(n, m) cells materialised per block; small blocks
+# stay in cache and let more of them be skipped on their fixed vertices
+BLOCK_CELLS = 1 << 18
+
+
+def counter_matrix(k: int, digits: int, dtype=np.int32) -> np.ndarray:
+    """All k^digits rows of a base-k counter, last column fastest."""
+    rows = np.arange(k ** digits, dtype=np.int64)
+    matrix = np.empty((k ** digits, digits), dtype=dtype)
+    for j in range(digits - 1, -1, -1):
+        matrix[:, j] = rows % k
+        rows //= k
+    return matrix
+
+
+def bruteforce_coloring(n_vertices: int, edges: List[Tuple[int, int]], k: int) -> Optional[List[int]]:
+    """The first proper coloring in itertools.product order, or None."""
+    if n_vertices == 0:
+        return []
+    if k <= 0:
+        return None
+    u = np.array([a for a, _ in edges], dtype=np.int32)
+    v = np.array([b for _, b in edges], dtype=np.int32)
+    width = max(n_vertices, len(edges), 1)
+    low = 1
+    while low < n_vertices and k ** (low + 1) * width <= BLOCK_CELLS:
+        low += 1
+    high = n_vertices - low
+    dtype = np.int8 if k <= 127 else np.int32
+    block = np.empty((k ** low, n_vertices), dtype=dtype)
+    block[:, high:] = counter_matrix(k, low, dtype)
+    # edges between two fixed vertices decide a whole block at once
+    fixed = [(a, b) for a, b in edges if a < high and b < high]
+    for prefix in itertools.product(range(k), repeat=high):
+        if any(prefix[a] == prefix[b] for a, b in fixed):
+            continue
+        block[:, :high] = prefix
+        conflict = (block[:, u] == block[:, v]).any(axis=1)
+        valid = np.flatnonzero(~conflict)
+        if len(valid):
+            return block[valid[0]].tolist()
+    return None
+
+
+def vectorized_coloring(n_vertices: int, edges: List[Tuple[int, int]], k: int) -> Tuple[bool, List[int]]:
+    """(True, coloring) or (False, []) in the shape the results CSV expects."""
+    colors = bruteforce_coloring(n_vertices, edges, k)
+    return (True, colors) if colors is not None else (False, [])
@@ -40,8 +40,13 @@ instance_id,n_vars,n_clauses,method,satisfiable,time_seconds,solution
 4,4,10,S,0.00013304100139066577,BruteForce,"{1: True, 2: False, 3: False, 4: False}"
 """
 
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Optional
 from src.helpers.sat_solver_helper import SatSolverAbstractClass
+from src.helpers.cdcl_helper import CDCLSolver
+from src.helpers.bitparallel_sat_helper import bitparallel_search
+from src.helpers.dpll_helper import DPLLSolver
+from src.helpers.local_search_helper import LocalSearchSolver
+from src.helpers.model_count_helper import count_models
 import itertools
 
 
@@ -57,13 +62,47 @@ class SatSolver(SatSolverAbstractClass):
 
 
     def sat_backtracking(self, n_vars:int, clauses:List[List[int]]) -> Tuple[bool, Dict[int, bool]]:
-        pass
+        """
+        Iterative DPLL with unit propagation, pure-literal elimination and
+        Jeroslow-Wang branching (see src/helpers/dpll_helper.py).
+        """
+        solver = DPLLSolver(n_vars, clauses)
+        if solver.solve():
+            return True, solver.model()
+        return False, {}
 
     def sat_bruteforce(self, n_vars:int, clauses:List[List[int]]) -> Tuple[bool, Dict[int, bool]]:
-        pass
+        """
+        Tries all 2^n assignments, evaluating blocks of them per big-int
+        operation (see src/helpers/bitparallel_sat_helper.py).
+        """
+        return bitparallel_search(n_vars, clauses)
 
     def sat_bestcase(self, n_vars:int, clauses:List[List[int]]) -> Tuple[bool, Dict[int, bool]]:
-        pass
+        """
+        Conflict-driven clause learning (see src/helpers/cdcl_helper.py).
+        """
+        solver = CDCLSolver(n_vars, clauses)
+        if solver.solve():
+            return True, solver.model()
+        return False, {}
 
-    def sat_simple(self, n_vars:int, clauses:List[List[int]]) -> Tuple[bool, Dict[int, bool]]:
-        pass
\ No newline at end of file
+    def sat_simple(self, n_vars:int, clauses:List[List[int]]) -> Tuple[Optional[bool], Dict[int, bool]]:
+        """
+        probSAT / WalkSAT local search (see src/helpers/local_search_helper.py).
+        Incomplete: returns (None, {}) ("?" in the CSV) when the flip budget
+        runs out, since that does not prove the formula UNSAT.
+        """
+        solver = LocalSearchSolver(n_vars, clauses, **self.local_search_options)
+        ok = solver.solve()
+        if ok:
+            return True, solver.model()
+        return ok, {}
+
+    def sat_model_count(self, n_vars:int, clauses:List[List[int]]) -> int:
+        """
+        Exact number of satisfying assignments over variables 1..n_vars:
+        unit propagation, component decomposition and a literal-bounded
+        component cache (see src/helpers/model_count_helper.py).
+        """
+        return count_models(n_vars, clauses, self.model_count_cache_literals)